@@ -0,0 +1,256 @@
+"""Micro-benchmarks for the scheduler hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.hot_paths --output baseline.json
+    python -m benchmarks.hot_paths --compare baseline.json
+
+Every benchmark runs inside a seeded Simulation, so sleeps, timestamps and
+CPU readings come from the virtual clock instead of the host and the
+numbers only reflect the code under test.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from load_balancers.horizontal_balancer import HorizontalLoadBalancer
+from load_balancers.vertical_balancer import VerticalLoadBalancer
+from models.edge_device import EdgeDevice
+from models.task import Task
+from models.task_queue import TaskQueue
+from monitoring.system_monitor import SystemMonitor
+from utils.helpers import create_alexnet_model
+from utils.simulation import Simulation
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a factory returning (operation, setup) for a named benchmark."""
+    def register(factory):
+        BENCHMARKS.append((name, factory))
+        return factory
+    return register
+
+
+def _make_tasks(count, sensitive_ratio=0.2):
+    return [Task(f"task_{i}", None, random.uniform(0.5, 10), random.random() < sensitive_ratio)
+            for i in range(count)]
+
+
+def _make_root(num_devices):
+    root = EdgeDevice("root", 1.4, 4, is_root=True)
+    root.model = create_alexnet_model()
+    for i in range(num_devices - 1):
+        root.connect_to_device(EdgeDevice(f"edge{i}", random.choice([1.0, 1.2, 2.4]), random.choice([2, 4])))
+    return root
+
+
+def _cycle(items):
+    state = {"index": 0}
+
+    def next_item():
+        item = items[state["index"] % len(items)]
+        state["index"] += 1
+        return item
+    return next_item
+
+
+for _mode in ("cpu", "deadline", "count", "weighted", "predictive"):
+    @benchmark(f"vertical.make_decision[{_mode}]")
+    def _(mode=_mode):
+        balancer = VerticalLoadBalancer(_make_root(1), None)
+        next_task = _cycle(_make_tasks(1000))
+        return lambda: balancer.make_decision(next_task(), mode)
+
+
+@benchmark("vertical.make_decisions[weighted, batch=1000]")
+def _():
+    balancer = VerticalLoadBalancer(_make_root(1), None)
+    tasks = _make_tasks(1000)
+    return lambda: balancer.make_decisions(tasks, "weighted")
+
+
+for _devices in (4, 16, 64):
+    @benchmark(f"horizontal.calculate_distribution[devices={_devices}]")
+    def _(devices=_devices):
+        return HorizontalLoadBalancer(_make_root(devices)).calculate_distribution
+
+    @benchmark(f"horizontal.calculate_distribution_uncached[devices={_devices}]")
+    def _(devices=_devices):
+        balancer = HorizontalLoadBalancer(_make_root(devices))
+
+        def operation():
+            balancer.invalidate_plans()
+            return balancer.calculate_distribution()
+        return operation
+
+    @benchmark(f"horizontal.distribute_layer[devices={_devices}]")
+    def _(devices=_devices):
+        root = _make_root(devices)
+        balancer = HorizontalLoadBalancer(root)
+        layer = root.model.layers[5]
+        return lambda: balancer.distribute_layer(layer, root.model)
+
+
+@benchmark("monitor.record_cpu_usage")
+def _():
+    monitor = SystemMonitor()
+    return lambda: monitor.record_cpu_usage("root", 42.0, 0.0, "before_task")
+
+
+@benchmark("monitor.record_execution")
+def _():
+    monitor = SystemMonitor()
+    return lambda: monitor.record_execution("task_1", 0.3, "edge", False, "weighted", 1.0)
+
+
+for _history in (1000, 100000):
+    @benchmark(f"monitor.get_statistics[history={_history}]")
+    def _(history=_history):
+        monitor = SystemMonitor()
+        for i in range(history):
+            monitor.record_cpu_usage("root", random.uniform(0, 100), i, random.choice(["before_task", "after_task"]))
+            monitor.record_execution(f"task_{i}", random.uniform(0.1, 0.6), random.choice(["edge", "cloud"]),
+                                     random.random() < 0.1, "weighted", random.uniform(0, 5))
+        return monitor.get_statistics
+
+
+for _policy in ("fifo", "edf", "least_slack"):
+    @benchmark(f"queue.push_pop[{_policy}, size=10000]")
+    def _(policy=_policy):
+        queue = TaskQueue(policy=policy, execution_estimate=lambda task: 0.3)
+        tasks = _make_tasks(10000)
+        for task in tasks:
+            queue.push(task)
+        next_task = _cycle(tasks)
+
+        def operation():
+            queue.push(next_task())
+            return queue.pop(0.0)
+        return operation
+
+
+def measure(operation, min_time=0.2, allocation_samples=200):
+    """
+    Returns:
+        dict: ops/sec plus transient (peak) and retained allocations per op
+    """
+    # Warm up and calibrate the batch size
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4:
+            break
+        iterations *= 2
+
+    runs = []
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            operation()
+        runs.append(time.perf_counter() - start)
+    best = min(runs)
+
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(allocation_samples):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        operation()
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    blocks_before = sys.getallocatedblocks()
+    for _ in range(allocation_samples):
+        operation()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": iterations / best if best else float("inf"),
+        "iterations": iterations,
+        "peak_bytes_per_op": peaks / allocation_samples,
+        "retained_blocks_per_op": retained_blocks / allocation_samples
+    }
+
+
+def run(selected=None, seed=0, min_time=0.2):
+    results = {}
+    for name, factory in BENCHMARKS:
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        # Virtual clock and deterministic CPU readings for every benchmark
+        with Simulation(seed=seed, cpu_range=(30, 30)):
+            operation = factory()
+            results[name] = measure(operation, min_time=min_time)
+        stats = results[name]
+        print(f"{name:<60} {stats['ops_per_sec']:>14,.0f} ops/s "
+              f"{stats['peak_bytes_per_op']:>10,.0f} B peak/op "
+              f"{stats['retained_blocks_per_op']:>8.2f} blocks/op")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Returns:
+        list: Names of benchmarks slower than baseline by more than tolerance
+    """
+    regressions = []
+    for name, stats in results.items():
+        reference = baseline.get("benchmarks", {}).get(name)
+        if reference is None:
+            continue
+        ratio = stats["ops_per_sec"] / reference["ops_per_sec"]
+        marker = ""
+        if ratio < 1 - tolerance:
+            regressions.append(name)
+            marker = "  <-- REGRESSION"
+        print(f"{name:<60} {ratio:>6.2f}x baseline{marker}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler hot-path micro-benchmarks")
+    parser.add_argument("--filter", type=str, nargs="+", default=None,
+                        help="Only run benchmarks whose name contains one of these strings")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write results as a JSON baseline to this file")
+    parser.add_argument("--compare", type=str, default=None,
+                        help="Compare against a baseline JSON file; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed fractional ops/sec drop before flagging a regression")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Approximate seconds spent timing each benchmark")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    results = run(args.filter, args.seed, args.min_time)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.time(),
+                "benchmarks": results
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,30 @@ VERTICAL_BALANCER = {
     "task_count_threshold": 25,  # Number of edge tasks before cloud offloading
     
     # New weighted model configuration
-    "decision_mode": "weighted", # Options: "cpu", "deadline", "count", "weighted" 
+    "decision_mode": "weighted", # Options: "cpu", "deadline", "count", "weighted", "predictive", "split" 
     "weights": {
         "cpu": 0.4,              # Weight for CPU utilization (40%)
         "deadline": 0.3,         # Weight for task deadline (30%)
         "computation": 0.2,      # Weight for computational needs (20%)
         "task_count": 0.1        # Weight for recent edge execution count (10%)
     },
-    "cloud_threshold": 60        # Score threshold for cloud offloading decision (0-100)
+    "cloud_threshold": 60,       # Score threshold for cloud offloading decision (0-100)
+    "respect_rate_limit": True,  # Redirect to edge while the gateway would rate limit
+    
+    # Online cost model for the "predictive" decision mode
+    "predictor": {
+        "alpha": 0.2,            # EWMA weight of each observed outcome
+        "edge_prior": 0.3,       # Edge latency assumed before any observation (seconds)
+        "cloud_prior": 0.45,     # Cloud round trip assumed before any observation (seconds)
+        "failure_prior": 0.05,   # Cloud failure rate assumed before any observation
+        "min_std": 0.01          # Latency standard deviation floor (seconds)
+    }
+}
+
+# Horizontal load balancer settings
+HORIZONTAL_BALANCER = {
+    "plan_cache_size": 128,      # Cached distribution plans (LRU eviction)
+    "load_delta": 5              # CPU % change that invalidates a device's cached plans
 }
 
 # Cloud connection settings
@@ -58,6 +74,95 @@ TASK_GENERATION = {
     "sensitive_data_ratio": 0.2  # Ratio of tasks with sensitive data
 }
 
+# Task queue settings
+TASK_QUEUE = {
+    "policy": "fifo",            # Options: "fifo", "edf", "least_slack"
+    "edge_estimate": 0.3,        # Expected edge execution time in seconds (least_slack)
+    "cloud_estimate": 0.45       # Expected cloud execution time in seconds (least_slack)
+}
+
+# Root device result cache settings
+RESULT_CACHE = {
+    "enabled": False,            # Answer repeated inputs without edge or cloud work
+    "max_entries": 1024,         # Cached results kept (LRU eviction)
+    "ttl": 60.0                  # Seconds a cached result stays valid
+}
+
+# Admission control settings (shed or reroute tasks predicted to be late)
+ADMISSION = {
+    "enabled": False,            # Check predicted finish time before executing
+    "shed_threshold": 0.8,       # Miss probability at which a target counts as late
+    "alpha": 0.2,                # EWMA weight of each observed service time
+    "edge_prior": 0.3,           # Edge service time assumed before observations (seconds)
+    "cloud_prior": 0.45          # Cloud service time assumed before observations (seconds)
+}
+
+# Hedged cloud requests (slow responses race the edge only in process_queue_async)
+HEDGING = {
+    "enabled": False,            # Hedge slow cloud requests and retry or re-route failed ones
+    "percentile": 95,            # Cloud latency percentile used as the hedging budget
+    "min_samples": 20,           # Round trips observed before the percentile is trusted
+    "default_budget": 0.6,       # Budget in seconds until then
+    "edge_estimate": 0.3,        # Edge time reserved for a hedged or fallback copy (seconds)
+    "max_retries": 2,            # Cloud retries after errors before falling back to the edge
+    "backoff_base": 0.05,        # Delay before the first retry, doubled per retry (seconds)
+    "backoff_max": 0.4           # Upper bound on a retry delay (seconds)
+}
+
+# Whole-task placement across edge devices (process_queue_async only)
+EDGE_SCHEDULER = {
+    "enabled": True,             # Run edge tasks on every edge device, not just the root
+    "policy": "least_completion",  # Options: "least_completion", "power_of_two"
+    "work_stealing": True,       # Idle devices take queued tasks from busy ones
+    "base_time": 0.3,            # Task execution time on a reference-speed core (seconds)
+    "reference_speed": 1.4       # Clock speed base_time was measured at (GHz)
+}
+
+# Edge device health tracking (straggler derating and failed-device exclusion)
+HEALTH = {
+    "enabled": False,            # Track device latency and heartbeats
+    "alpha": 0.2,                # EWMA weight of each observed/expected time ratio
+    "heartbeat_interval": 0.5,   # Seconds between heartbeat polls of a device
+    "heartbeat_timeout": 2.0,    # Silence in seconds after which a device counts as failed
+    "failure_threshold": 3,      # Consecutive failed executions that mark a device failed
+    "speculation_factor": 2.0    # Duplicate a shard running this many times its expected time (0 = off)
+}
+
+# Pipeline-parallel execution over distribute_layers stages (process_queue_async only)
+PIPELINE = {
+    "enabled": False,            # Stream edge tasks through per-device layer stages
+    "params_per_ghz_second": 5.4e7,  # Parameters processed per GHz of power per second
+    "queue_size": 2,             # Capacity of each inter-stage queue
+    "rebalance_interval": 50     # Completed tasks between stage rebalances (0 = never)
+}
+
+# Communication-aware model partitioning (HorizontalLoadBalancer.optimal_partition)
+PARTITIONER = {
+    "macs_per_ghz_second": 4e8,  # Multiply-accumulates per GHz of power per second
+    "bytes_per_element": 4,      # Activation element size (float32)
+    "default_link": {"bandwidth": 12.5e6, "latency": 0.002},  # bytes/s, seconds
+    "links": {                   # Per-device link to the root device
+        "edge1": {"bandwidth": 12.5e6, "latency": 0.002},   # 100 Mbit/s Ethernet
+        "edge2": {"bandwidth": 125e6, "latency": 0.001},    # 1 Gbit/s Ethernet
+        "edge3": {"bandwidth": 6.75e6, "latency": 0.005}    # 54 Mbit/s Wi-Fi
+    }
+}
+
+# Concurrent dispatcher settings (process_queue_async)
+DISPATCHER = {
+    "max_cloud_inflight": 8      # Concurrent cloud requests; edge slots = root cores
+}
+
+# Server gateway settings
+GATEWAY = {
+    "rate_limit": 10.0,          # Sustained cloud requests per second (token refill rate)
+    "rate_burst": 5,             # Cloud requests allowed back to back (bucket capacity)
+    "batching": False,           # Coalesce concurrent cloud requests (async dispatcher only)
+    "max_batch_size": 8,         # Flush a batch once this many tasks are waiting
+    "max_batch_wait": 0.05,      # Longest a task waits for batch companions in seconds
+    "uplink_bandwidth": 2.5e6    # Edge-to-cloud upload rate in bytes/s (20 Mbit/s)
+}
+
 # Around line 43-50 in config.py
 EXPERIMENTS = {
     "num_tasks": 1000,           # Default number of tasks per experiment
@@ -65,7 +170,9 @@ EXPERIMENTS = {
         "cpu",
         "deadline",
         "count",
-        "weighted"               # Add the new weighted condition here
+        "weighted",              # Add the new weighted condition here
+        "predictive",            # Online cost model of edge/cloud latency
+        "split"                  # Run leading layers at the edge, the rest in the cloud
     ]
 }
 
@@ -90,7 +197,18 @@ MODELS = {
 
 # System monitoring settings
 MONITORING = {
+    "cpu_source": "sampler",     # "sampler": host (or simulated) CPU; "model": per-device load from assigned work
+    "load_half_life": 0.25,      # Seconds for a device's modeled load to close half the gap to demand
     "log_cpu_interval": 0.1,     # Interval in seconds for CPU logging
+    "cpu_sampling_period": 0.1,  # Background CPU sampler period in seconds
+    "cpu_sampling_window": 10,   # Samples kept for windowed smoothing
+    "cpu_smoothing": "ewma",     # Options: "ewma", "mean", "none"
+    "cpu_ewma_alpha": 0.3,       # EWMA smoothing factor
     "save_results": True,        # Whether to save results to file
     "results_file": "results.json"  # File to save results
-}
\ No newline at end of file
+}
+
+# Span tracing (enabled with --trace; costs one flag check per span site when off)
+TRACING = {
+    "max_events_per_thread": 2000000  # Spans kept per thread; later ones are counted as dropped
+}
@@ -0,0 +1,4 @@
+from .sharded_executor import ShardedLinearExecutor
+from .pipeline_executor import PipelineExecutor, partition_layers
+
+__all__ = ['ShardedLinearExecutor', 'PipelineExecutor', 'partition_layers']
@@ -0,0 +1,238 @@
+import asyncio
+from monitoring import tracing
+from utils.helpers import get_current_time
+
+
+class PipelineExecutor:
+    """Streams tasks through a model split into per-device layer-range stages.
+
+    Each device in the plan from HorizontalLoadBalancer.distribute_layers runs
+    one stage coroutine, connected to the next stage by a bounded queue, so
+    successive tasks occupy different devices at the same time and steady
+    state throughput is set by the slowest stage. Stage time is simulated as
+    the stage's parameter count over the device's computational power.
+
+    Measured stage times feed a per-device speed estimate, and rebalance()
+    re-partitions the layers into contiguous ranges that minimize the
+    slowest stage.
+    """
+
+    def __init__(self, model, devices, stage_plan, params_per_ghz_second=5.4e7,
+                 queue_size=2, rebalance_interval=50, alpha=0.2):
+        """
+        Args:
+            model: MLModel to execute
+            devices (list): EdgeDevices in pipeline order
+            stage_plan (dict): Device ID -> contiguous list of layer indices
+            params_per_ghz_second (float): Parameters processed per GHz of
+                computational power per second
+            queue_size (int): Capacity of each inter-stage queue
+            rebalance_interval (int): Completed tasks between automatic
+                rebalances (0 disables them, including the initial one)
+            alpha (float): EWMA weight of each stage time measurement
+        """
+        self.model = model
+        self.devices = list(devices)
+        self.stage_plan = {device.device_id: list(stage_plan.get(device.device_id, []))
+                           for device in self.devices}
+        self.params_per_ghz_second = params_per_ghz_second
+        self.queue_size = queue_size
+        self.rebalance_interval = rebalance_interval
+        self.alpha = alpha
+        # Measured seconds per parameter for each device
+        self.seconds_per_param = {}
+        self.stage_busy = {device.device_id: 0.0 for device in self.devices}
+        self.completed = 0
+        self.rebalances = 0
+        self._queues = None
+        self._workers = []
+
+    def _stage_parameters(self, layer_indices):
+        return sum(self.model.layers[index].parameters for index in layer_indices)
+
+    def stage_time(self, device, layer_indices):
+        """Simulated time for one task to pass through a device's layers."""
+        if not layer_indices:
+            return 0.0
+        power = max(device.get_computational_power(), 1e-3)
+        return self._stage_parameters(layer_indices) / (power * self.params_per_ghz_second)
+
+    def _start(self):
+        if self.rebalance_interval and not self.rebalances:
+            # Cost the initial plan from device power before any measurement
+            self.rebalance()
+        self._queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.devices]
+        self._workers = [
+            asyncio.ensure_future(self._stage(position, device))
+            for position, device in enumerate(self.devices)
+        ]
+
+    async def run_task(self, task):
+        """
+        Push a task through every stage.
+
+        Returns:
+            dict: Result with the devices that ran layers and the time from
+            entering the first stage to leaving the last
+        """
+        if self._queues is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[0].put((task, future, None, get_current_time()))
+        return await future
+
+    async def _stage(self, position, device):
+        inbox = self._queues[position]
+        outbox = self._queues[position + 1] if position + 1 < len(self._queues) else None
+        while True:
+            item = await inbox.get()
+            task, future, plan, entered = item
+            try:
+                if plan is None:
+                    # A task takes the current plan as it enters the first stage
+                    # and keeps it, so a rebalance never splits one task's layers
+                    # across two plans
+                    plan = self.stage_plan
+                    item = (task, future, plan, entered)
+                layers = plan.get(device.device_id, [])
+                if layers:
+                    start = get_current_time()
+                    with device.load.busy():
+                        await asyncio.sleep(self.stage_time(device, layers))
+                    elapsed = get_current_time() - start
+                    if tracing.enabled:
+                        # Benchmarks stream placeholder tasks (None) through the pipeline
+                        tracing.record_span("pipeline_stage", "edge", start, start + elapsed,
+                                            f"{device.device_id} stage", task=getattr(task, "task_id", None),
+                                            layers=len(layers))
+                    self.stage_busy[device.device_id] += elapsed
+                    self._observe(device.device_id, layers, elapsed)
+
+                if outbox is not None:
+                    await outbox.put(item)
+                else:
+                    self._complete(task, future, plan, entered)
+            except Exception as error:
+                # The task leaves the pipeline with the error; the stage keeps
+                # serving the tasks behind it
+                if not future.done():
+                    future.set_exception(error)
+
+    def _observe(self, device_id, layers, elapsed):
+        parameters = self._stage_parameters(layers)
+        if not parameters:
+            return
+        sample = elapsed / parameters
+        previous = self.seconds_per_param.get(device_id)
+        self.seconds_per_param[device_id] = (
+            sample if previous is None else previous + self.alpha * (sample - previous)
+        )
+
+    def _complete(self, task, future, plan, entered):
+        self.completed += 1
+        if not future.done():
+            future.set_result({
+                "result": {
+                    "status": "completed",
+                    "devices": [device_id for device_id, layers in plan.items() if layers]
+                },
+                "execution_time": get_current_time() - entered
+            })
+        if self.rebalance_interval and self.completed % self.rebalance_interval == 0:
+            self.rebalance()
+
+    def rebalance(self):
+        """
+        Re-partition layers from measured stage speeds.
+
+        Contiguous layer ranges are assigned to devices in pipeline order
+        with a min-max dynamic program, so the slowest stage is as fast as
+        any contiguous split allows. Devices that have not run a stage yet
+        are costed from their computational power.
+
+        Returns:
+            dict: The new stage plan
+        """
+        rates = {}
+        for device in self.devices:
+            measured = self.seconds_per_param.get(device.device_id)
+            if measured is None:
+                power = max(device.get_computational_power(), 1e-3)
+                measured = 1 / (power * self.params_per_ghz_second)
+            rates[device.device_id] = measured
+
+        parameters = [layer.parameters for layer in self.model.layers]
+        self.stage_plan = partition_layers(parameters, [rates[device.device_id] for device in self.devices],
+                                           [device.device_id for device in self.devices])
+        self.rebalances += 1
+        return self.stage_plan
+
+    def bottleneck(self):
+        """
+        Returns:
+            tuple: (device ID, predicted stage time) of the slowest stage
+        """
+        times = {device.device_id: self.stage_time(device, self.stage_plan[device.device_id])
+                 for device in self.devices}
+        device_id = max(times, key=times.get)
+        return device_id, times[device_id]
+
+    def get_statistics(self):
+        return {
+            "stage_plan": {device_id: layers for device_id, layers in self.stage_plan.items()},
+            "stage_busy": dict(self.stage_busy),
+            "completed": self.completed,
+            "rebalances": self.rebalances
+        }
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queues = None
+
+    def __repr__(self):
+        return (f"PipelineExecutor(model={self.model.name}, stages={len(self.devices)}, "
+                f"completed={self.completed})")
+
+
+def partition_layers(parameters, seconds_per_param, device_ids):
+    """
+    Split layers into contiguous per-device ranges minimizing the slowest stage.
+
+    Args:
+        parameters (list): Parameter count of each layer, in model order
+        seconds_per_param (list): Cost rate of each device, in pipeline order
+        device_ids (list): Device IDs matching seconds_per_param
+
+    Returns:
+        dict: Device ID -> list of layer indices (possibly empty)
+    """
+    n = len(parameters)
+    m = len(device_ids)
+    prefix = [0]
+    for count in parameters:
+        prefix.append(prefix[-1] + count)
+
+    inf = float("inf")
+    # best[k][i]: slowest stage when the first k devices take layers [0, i)
+    best = [[inf] * (n + 1) for _ in range(m + 1)]
+    split = [[0] * (n + 1) for _ in range(m + 1)]
+    best[0][0] = 0.0
+    for k in range(1, m + 1):
+        rate = seconds_per_param[k - 1]
+        for i in range(n + 1):
+            for j in range(i + 1):
+                cost = max(best[k - 1][j], (prefix[i] - prefix[j]) * rate)
+                if cost < best[k][i]:
+                    best[k][i] = cost
+                    split[k][i] = j
+
+    plan = {}
+    end = n
+    for k in range(m, 0, -1):
+        start = split[k][end]
+        plan[device_ids[k - 1]] = list(range(start, end))
+        end = start
+    return {device_id: plan[device_id] for device_id in device_ids}
@@ -0,0 +1,330 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+# Shared-memory blocks attached by the current worker process, keyed by name
+_attached = {}
+
+
+def _attach(shm_name, shape):
+    entry = _attached.get(shm_name)
+    if entry is None:
+        # Workers share the parent's resource tracker, so the parent's
+        # unlink in close() is the only cleanup needed
+        shm = SharedMemory(name=shm_name)
+        entry = (shm, np.ndarray(shape, dtype=np.float32, buffer=shm.buf))
+        _attached[shm_name] = entry
+    return entry[1]
+
+
+def _run_shard(shm_name, shape, row_start, row_end, x, slowdown=1.0, online=True):
+    """
+    Worker entry point: compute output rows [row_start, row_end) of W @ x + b.
+
+    slowdown and online carry the simulated state of the device the worker
+    stands in for: a slowed device takes slowdown times as long, an offline
+    one fails.
+    """
+    if not online:
+        raise ConnectionError("Edge device is offline")
+    start = time.perf_counter()
+    weights = _attach(shm_name, shape)[row_start:row_end]
+    output = weights[:, :-1] @ x + weights[:, -1]
+    if slowdown > 1:
+        time.sleep((time.perf_counter() - start) * (slowdown - 1))
+    return output, time.perf_counter() - start
+
+
+class ShardedLinearExecutor:
+    """Runs a model's linear layers as row-sharded matrix-vector products.
+
+    Weights live in shared memory with one row per output feature
+    (in_features weights followed by the bias), so a parameter range from
+    HorizontalLoadBalancer.distribute_layer maps directly onto a row range.
+    Each process-pool worker stands in for one edge device.
+
+    A shard still running speculation_factor times longer than the finished
+    shards' median time per row predicts is a straggler. It is duplicated on
+    the fastest device that has finished its own shard, and whichever copy
+    finishes first is used. A failed shard is re-run the same way.
+    """
+
+    def __init__(self, model, max_workers=None, seed=0, speculation_factor=2.0):
+        """
+        Args:
+            model: MLModel whose linear layers define in/out features
+            max_workers (int): Worker processes (defaults to CPU count)
+            seed (int): Seed for the generated weights and inputs
+            speculation_factor (float): Multiple of the expected shard time
+                after which a shard is duplicated (0 disables speculation)
+        """
+        self.model = model
+        self.speculation_factor = speculation_factor
+        self.rng = np.random.default_rng(seed)
+        self.layers = {}
+        self._blocks = []
+        for index, layer in enumerate(model.layers):
+            if layer.layer_type != "linear" or not layer.in_features:
+                continue
+            shape = (layer.out_features, layer.in_features + 1)
+            shm = SharedMemory(create=True, size=int(np.prod(shape)) * 4)
+            weights = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            weights[:] = self.rng.standard_normal(shape, dtype=np.float32) / np.sqrt(layer.in_features)
+            self._blocks.append(shm)
+            self.layers[index] = (shm.name, shape, weights)
+        self.max_workers = max_workers
+        self._pool = ProcessPoolExecutor(max_workers=max_workers)
+
+    def random_input(self):
+        first = min(self.layers)
+        return self.rng.standard_normal(self.layers[first][1][1] - 1, dtype=np.float32)
+
+    @staticmethod
+    def _row_ranges(layer, device_map):
+        """Convert parameter ranges to contiguous output-row ranges."""
+        row_params = layer.in_features + 1
+        last_device = list(device_map)[-1]
+        ranges = []
+        previous_end = 0
+        for device_id, (start, end) in device_map.items():
+            row_end = min(layer.out_features, int(round(end / row_params)))
+            if device_id == last_device:
+                row_end = layer.out_features
+            if row_end > previous_end:
+                ranges.append((device_id, previous_end, row_end))
+                previous_end = row_end
+        return ranges
+
+    def run_layer(self, layer_index, x, device_map, devices=None, health_tracker=None):
+        """
+        Execute one linear layer sharded across workers and gather the result.
+
+        Args:
+            layer_index (int): Index of the layer in the model
+            x (ndarray): Input activation vector
+            device_map (dict): Device ID -> (param_start, param_end)
+            devices (dict): Device ID -> EdgeDevice whose load model counts
+                its shard as running while the layer executes (optional)
+            health_tracker (DeviceHealthTracker): Receives each device's
+                shard time against the layer's median and its failures (optional)
+
+        Returns:
+            tuple: (output vector, stats dict)
+        """
+        layer = self.model.layers[layer_index]
+        shm_name, shape, _ = self.layers[layer_index]
+        devices = devices or {}
+        ranges = self._row_ranges(layer, device_map)
+        launched = {}    # future -> (range index, device ID, submit time)
+        finished = {}    # range index -> (device ID, partial output, compute seconds)
+        needs_backup = set()
+        speculated = set()
+        failed = set()
+        backup_wins = 0
+
+        def launch(index, device_id):
+            _, row_start, row_end = ranges[index]
+            device = devices.get(device_id)
+            if device is not None:
+                running.enter_context(device.load.busy())
+            future = self._pool.submit(
+                _run_shard, shm_name, shape, row_start, row_end, x,
+                device.slowdown if device is not None else 1.0,
+                device.online if device is not None else True
+            )
+            launched[future] = (index, device_id, time.perf_counter())
+
+        start = time.perf_counter()
+        with ExitStack() as running:
+            for index, (device_id, _, _) in enumerate(ranges):
+                launch(index, device_id)
+
+            while len(finished) < len(ranges):
+                for index in sorted(needs_backup):
+                    backup = self._backup_device(ranges, finished, launched, failed)
+                    if backup is None:
+                        break
+                    needs_backup.discard(index)
+                    speculated.add(index)
+                    launch(index, backup)
+                if not launched:
+                    raise RuntimeError(f"No device left to run layer {layer_index}")
+
+                done, _ = wait(launched, timeout=self._straggler_timeout(ranges, finished, launched, speculated),
+                               return_when=FIRST_COMPLETED)
+                if not done:
+                    # Every overdue shard without a copy gets one
+                    per_row = self._median_row_time(ranges, finished)
+                    now = time.perf_counter()
+                    for index, device_id, submitted in launched.values():
+                        if index in finished or index in speculated:
+                            continue
+                        rows = ranges[index][2] - ranges[index][1]
+                        if now - submitted >= self.speculation_factor * per_row * rows:
+                            needs_backup.add(index)
+                    continue
+
+                for future in done:
+                    index, device_id, submitted = launched.pop(future)
+                    try:
+                        partial, seconds = future.result()
+                    except Exception:
+                        failed.add(device_id)
+                        if health_tracker is not None:
+                            health_tracker.record_failure(device_id)
+                        if index not in finished and not any(entry[0] == index for entry in launched.values()):
+                            needs_backup.add(index)
+                        continue
+                    if index in finished:
+                        continue
+                    finished[index] = (device_id, partial, seconds)
+                    if device_id != ranges[index][0]:
+                        backup_wins += 1
+
+            # Copies that lost the race finish in the background and are ignored
+            for future, (index, device_id, submitted) in launched.items():
+                future.cancel()
+                if health_tracker is not None and device_id not in failed:
+                    # The straggler's elapsed time is a lower bound on its shard time
+                    per_row = self._median_row_time(ranges, finished)
+                    rows = ranges[index][2] - ranges[index][1]
+                    health_tracker.record(device_id, time.perf_counter() - submitted, per_row * rows)
+
+        if health_tracker is not None:
+            per_row = self._median_row_time(ranges, finished)
+            for index, (device_id, _, seconds) in finished.items():
+                rows = ranges[index][2] - ranges[index][1]
+                health_tracker.record(device_id, seconds, per_row * rows)
+
+        gather_start = time.perf_counter()
+        output = np.concatenate([finished[index][1] for index in range(len(ranges))])
+        end = time.perf_counter()
+
+        compute_times = {}
+        for device_id, _, seconds in finished.values():
+            compute_times[device_id] = compute_times.get(device_id, 0.0) + seconds
+        wall_time = end - start
+        return output, {
+            "wall_time": wall_time,
+            "shard_compute": compute_times,
+            "concat_time": end - gather_start,
+            # Everything the slowest shard's compute does not explain: IPC,
+            # scheduling, pickling the partial outputs and concatenation
+            "gather_overhead": wall_time - max(compute_times.values()),
+            "speculated": len(speculated),
+            "backup_wins": backup_wins,
+            "failed_shards": len(failed)
+        }
+
+    @staticmethod
+    def _median_row_time(ranges, finished):
+        times = sorted(seconds / (ranges[index][2] - ranges[index][1])
+                       for index, (_, _, seconds) in finished.items())
+        return times[len(times) // 2] if times else None
+
+    def _straggler_timeout(self, ranges, finished, launched, speculated):
+        """Seconds until the next outstanding shard becomes a straggler, or None."""
+        # Wait for half the shards so one fast shard does not set the bar
+        if not self.speculation_factor or 2 * len(finished) < len(ranges):
+            return None
+        per_row = self._median_row_time(ranges, finished)
+        now = time.perf_counter()
+        deadlines = [
+            submitted + self.speculation_factor * per_row * (ranges[index][2] - ranges[index][1])
+            for index, _, submitted in launched.values()
+            if index not in finished and index not in speculated
+        ]
+        return max(0.0, min(deadlines) - now) if deadlines else None
+
+    @staticmethod
+    def _backup_device(ranges, finished, launched, failed):
+        """The fastest device that finished its shard and is running nothing else."""
+        busy = {device_id for _, device_id, _ in launched.values()}
+        candidates = [
+            (seconds / (ranges[index][2] - ranges[index][1]), device_id)
+            for index, (device_id, _, seconds) in finished.items()
+            if device_id not in busy and device_id not in failed
+        ]
+        return min(candidates)[1] if candidates else None
+
+    def run_layer_serial(self, layer_index, x):
+        _, _, weights = self.layers[layer_index]
+        return weights[:, :-1] @ x + weights[:, -1]
+
+    def run(self, horizontal_balancer, x=None):
+        """
+        Run every linear layer in order, sharded by the horizontal balancer.
+
+        Returns:
+            tuple: (final output, list of per-layer stats)
+        """
+        if x is None:
+            x = self.random_input()
+        stats = []
+        indices = sorted(self.layers)
+        devices = {device.device_id: device for device in horizontal_balancer.get_connected_devices()}
+        for position, index in enumerate(indices):
+            device_map = horizontal_balancer.distribute_layer(self.model.layers[index], self.model)
+            x, layer_stats = self.run_layer(index, x, device_map, devices, horizontal_balancer.health_tracker)
+            layer_stats["layer_index"] = index
+            stats.append(layer_stats)
+            if position < len(indices) - 1:
+                x = np.maximum(x, 0)
+        return x, stats
+
+    def measure(self, horizontal_balancer, repeats=5):
+        """
+        Compare sharded against single-process execution for each layer.
+
+        Returns:
+            dict: Layer index -> timing summary (best of ``repeats``)
+        """
+        x = self.random_input()
+        report = {}
+        for index in sorted(self.layers):
+            layer = self.model.layers[index]
+            device_map = horizontal_balancer.distribute_layer(layer, self.model)
+
+            serial_times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                expected = self.run_layer_serial(index, x)
+                serial_times.append(time.perf_counter() - start)
+
+            sharded_runs = [self.run_layer(index, x, device_map) for _ in range(repeats)]
+            output, best = min(sharded_runs, key=lambda run: run[1]["wall_time"])
+
+            serial = min(serial_times)
+            report[index] = {
+                "parameters": layer.parameters,
+                "shards": len(best["shard_compute"]),
+                "serial_time": serial,
+                "sharded_time": best["wall_time"],
+                "speedup": serial / best["wall_time"] if best["wall_time"] else 0,
+                "gather_overhead": best["gather_overhead"],
+                "max_abs_error": float(np.max(np.abs(output - expected)))
+            }
+            x = np.maximum(expected, 0)
+        return report
+
+    def close(self):
+        self._pool.shutdown()
+        # Drop array views before closing the buffers they point into
+        self.layers = {}
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return f"ShardedLinearExecutor(model={self.model.name}, layers={len(self.layers)})"
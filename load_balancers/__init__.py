@@ -1,7 +1,20 @@
 from .vertical_balancer import VerticalLoadBalancer
 from .horizontal_balancer import HorizontalLoadBalancer
+from .latency_predictor import LatencyPredictor, RunningEstimate
+from .admission_controller import AdmissionController
+from .edge_scheduler import EdgeTaskScheduler
+from .model_partitioner import ModelPartitioner
+from .split_planner import SplitPointPlanner
+from .hedging_policy import HedgingPolicy
 
 __all__ = [
     'VerticalLoadBalancer',
-    'HorizontalLoadBalancer'
+    'HorizontalLoadBalancer',
+    'LatencyPredictor',
+    'RunningEstimate',
+    'AdmissionController',
+    'EdgeTaskScheduler',
+    'ModelPartitioner',
+    'SplitPointPlanner',
+    'HedgingPolicy'
 ]
@@ -0,0 +1,125 @@
+import math
+from load_balancers.latency_predictor import RunningEstimate
+from utils.helpers import get_current_time
+
+
+class AdmissionController:
+    """Sheds or reroutes tasks that are predicted to finish after their deadline.
+
+    Predicted finish time for a target is the expected wait behind the tasks
+    already in flight there plus the target's service time, both taken from
+    running estimates of observed service times. A task whose chosen target
+    is predicted to be late is moved to the other target if that one is
+    predicted to make it, and shed otherwise, so capacity goes to tasks that
+    can still finish in time.
+    """
+
+    def __init__(self, predictor=None, edge_capacity=4, cloud_capacity=8, alpha=0.2,
+                 edge_prior=0.3, cloud_prior=0.45, shed_threshold=0.8, min_std=0.01):
+        """
+        Args:
+            predictor (LatencyPredictor): Source of the cloud failure rate (optional)
+            edge_capacity (int): Tasks the edge executes at once
+            cloud_capacity (int): Cloud requests in flight at once
+            alpha (float): EWMA weight of each observed service time
+            edge_prior (float): Edge service time assumed before observations (seconds)
+            cloud_prior (float): Cloud service time assumed before observations (seconds)
+            shed_threshold (float): Miss probability at which a target counts as late
+            min_std (float): Service time standard deviation floor (seconds)
+        """
+        self.predictor = predictor
+        self.capacity = {"edge": edge_capacity, "cloud": cloud_capacity}
+        self.service_time = {
+            "edge": RunningEstimate(alpha, edge_prior),
+            "cloud": RunningEstimate(alpha, cloud_prior)
+        }
+        self.in_flight = {"edge": 0, "cloud": 0}
+        self.shed_threshold = shed_threshold
+        self.min_std = min_std
+
+    def set_capacity(self, edge=None, cloud=None):
+        if edge is not None:
+            self.capacity["edge"] = edge
+        if cloud is not None:
+            self.capacity["cloud"] = cloud
+
+    def predicted_finish(self, target, current_time=None):
+        """
+        Returns:
+            tuple: (expected finish timestamp, standard deviation in seconds)
+        """
+        if current_time is None:
+            current_time = get_current_time()
+        estimate = self.service_time[target]
+        capacity = max(1, self.capacity[target])
+        # Tasks ahead of this one in the target's slot queue, served capacity at a time
+        waiting = max(0, self.in_flight[target] + 1 - capacity)
+        rounds = waiting / capacity
+        std = max(estimate.std, self.min_std) * math.sqrt(1 + rounds)
+        return current_time + (1 + rounds) * estimate.mean, std
+
+    def miss_probability(self, task, target, current_time=None):
+        if task.deadline is None:
+            return 0.0
+        if current_time is None:
+            current_time = get_current_time()
+        finish, std = self.predicted_finish(target, current_time)
+        z = (task.creation_time + task.deadline - finish) / std
+        late = 0.5 * math.erfc(z / math.sqrt(2))
+        failure = 0.0
+        if target == "cloud" and self.predictor is not None:
+            failure = self.predictor.cloud_failure.mean
+        return failure + (1 - failure) * late
+
+    def admit(self, task, decision, current_time=None):
+        """
+        Check a vertical balancing decision against the predicted finish time.
+
+        Args:
+            task: The task about to be executed
+            decision (str): Target chosen by the vertical balancer ("edge" or "cloud")
+            current_time (float): Timestamp of the check
+
+        Returns:
+            tuple: (target, reason). target is the decision, the other target
+            when the task is downgraded, or None when it is shed; reason is
+            None when the decision stands.
+        """
+        # Targets without a service model (e.g. "split") are not checked
+        if task.deadline is None or decision not in self.capacity:
+            return decision, None
+        if current_time is None:
+            current_time = get_current_time()
+
+        chosen = self.miss_probability(task, decision, current_time)
+        if chosen < self.shed_threshold:
+            return decision, None
+
+        # Sensitive data never leaves the edge
+        alternative = "cloud" if decision == "edge" else "edge"
+        if not task.is_sensitive:
+            other = self.miss_probability(task, alternative, current_time)
+            if other < self.shed_threshold and other < chosen:
+                return alternative, f"{decision}_backlog"
+
+        return None, "sensitive_edge_late" if task.is_sensitive else "predicted_late"
+
+    def start(self, target):
+        if target in self.in_flight:
+            self.in_flight[target] += 1
+
+    def finish(self, target, service_time=None):
+        if target not in self.in_flight:
+            return
+        self.in_flight[target] = max(0, self.in_flight[target] - 1)
+        if service_time is not None:
+            self.service_time[target].update(service_time)
+
+    def reset(self):
+        self.in_flight = {target: 0 for target in self.in_flight}
+        for estimate in self.service_time.values():
+            estimate.reset()
+
+    def __repr__(self):
+        return (f"AdmissionController(in_flight={self.in_flight}, "
+                f"shed_threshold={self.shed_threshold})")
@@ -0,0 +1,258 @@
+import asyncio
+import random
+from collections import deque
+from monitoring import tracing
+from utils.helpers import get_current_time
+
+
+class _DeviceQueue:
+    """Per-device run queue and worker bookkeeping."""
+
+    def __init__(self, device, processing_time, health_tracker=None):
+        self.device = device
+        self.processing_time = processing_time
+        self.health_tracker = health_tracker
+        self.queue = deque()  # (task, future) pairs
+        self.busy = 0
+        self.idle = 0
+        self.completed = 0
+        self.failed = False
+        self.consecutive_failures = 0
+        self.failed_at = None
+
+    def expected_completion(self, extra=1):
+        """Seconds until ``extra`` more tasks would finish on this device."""
+        device = self.device
+        # Per-core speed left after current load, relative to an idle core
+        headroom = device.get_computational_power() / (device.cpu_speed * device.num_cores)
+        service = self.processing_time / max(headroom, 0.05)
+        if self.health_tracker is not None:
+            # A device that has been running slower than nominal keeps doing so
+            service *= max(1.0, self.health_tracker.latency_ratio(device.device_id))
+        return (len(self.queue) + self.busy + extra) / device.num_cores * service
+
+
+class EdgeTaskScheduler:
+    """Places whole tasks on edge devices, each with its own queue and workers.
+
+    Every device runs one worker coroutine per core. A task is placed on the
+    device with the least expected completion time (or the better of two
+    random devices), and a worker with nothing queued steals from the device
+    whose tail task would finish later there than on the thief.
+
+    A task whose execution fails moves to another device. A device is
+    retired once it has failed failure_threshold times in a row, and its
+    queue moves too. It takes work again when it answers a heartbeat
+    recovery_time after retiring. With a health tracker, every run is
+    reported against the device's nominal task time, and the tracker's
+    failure threshold and heartbeat recovery rule decide instead.
+    """
+
+    def __init__(self, devices, policy="least_completion", work_stealing=True,
+                 base_time=0.3, reference_speed=1.4, seed=None, health_tracker=None,
+                 failure_threshold=3, recovery_time=2.0):
+        """
+        Args:
+            devices (list): EdgeDevices that can run tasks
+            policy (str): "least_completion" or "power_of_two"
+            work_stealing (bool): Let idle devices take queued tasks from busy ones
+            base_time (float): Task execution time on a reference-speed core (seconds)
+            reference_speed (float): Clock speed base_time was measured at (GHz)
+            seed (int): Seed for power-of-two sampling
+            health_tracker (DeviceHealthTracker): Receives run times and failures (optional)
+            failure_threshold (int): Consecutive failures that retire a device without a tracker
+            recovery_time (float): Seconds a retired device sits out without a tracker
+        """
+        if policy not in ("least_completion", "power_of_two"):
+            raise ValueError(f"Unknown placement policy: {policy}")
+        self.policy = policy
+        self.work_stealing = work_stealing
+        self.random = random.Random(seed)
+        self.health_tracker = health_tracker
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.queues = [
+            _DeviceQueue(device, base_time * reference_speed / device.cpu_speed, health_tracker)
+            for device in devices
+        ]
+        self.steals = 0
+        self.reroutes = 0
+        self.retries = 0
+        self.recoveries = 0
+        self._ready = None
+        self._workers = []
+
+    def _start(self):
+        self._ready = asyncio.Condition()
+        for state in self.queues:
+            for core in range(state.device.num_cores):
+                self._workers.append(asyncio.ensure_future(self._worker(state, core)))
+
+    def _is_failing(self, state):
+        if self.health_tracker is not None:
+            return self.health_tracker.is_failed(state.device.device_id)
+        return state.consecutive_failures >= self.failure_threshold
+        
+    def _revive(self):
+        """Return retired devices that have recovered to service."""
+        now = get_current_time()
+        for state in self.queues:
+            if not state.failed:
+                continue
+            if self.health_tracker is not None:
+                self.health_tracker.poll([state.device], now)
+                recovered = not self.health_tracker.is_failed(state.device.device_id, now)
+            else:
+                recovered = now - state.failed_at >= self.recovery_time and state.device.heartbeat()
+            if recovered:
+                state.failed = False
+                state.failed_at = None
+                state.consecutive_failures = 0
+                self.recoveries += 1
+
+    def _place(self, exclude=None):
+        self._revive()
+        healthy = [state for state in self.queues if not state.failed]
+        if exclude is not None and len(healthy) > 1:
+            # Retry a failed task somewhere else while there is somewhere else
+            healthy = [state for state in healthy if state is not exclude]
+        if not healthy:
+            return None
+        if self.policy == "power_of_two" and len(healthy) > 2:
+            candidates = self.random.sample(healthy, 2)
+        else:
+            candidates = healthy
+        return min(candidates, key=lambda state: state.expected_completion())
+
+    async def run(self, task):
+        """
+        Execute a task on whichever device the placement policy picks.
+
+        Returns:
+            dict: The device's execution result
+        """
+        if self._ready is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        state = self._place()
+        if state is None:
+            raise RuntimeError("No healthy edge device to run the task")
+        state.queue.append((task, future))
+        state.device.load.enqueue()
+        async with self._ready:
+            self._ready.notify_all()
+        return await future
+
+    def _steal(self, thief):
+        best, best_gain = None, 0
+        for victim in self.queues:
+            # A device with an idle worker will run its own queue shortly
+            if victim is thief or not victim.queue or victim.idle:
+                continue
+            gain = victim.expected_completion(extra=0) - thief.expected_completion()
+            if gain > best_gain:
+                best, best_gain = victim, gain
+        if best is None:
+            return None
+        self.steals += 1
+        best.device.load.dequeue()
+        return best.queue.pop()
+
+    def _next_item(self, state):
+        if state.failed:
+            return None
+        if state.queue:
+            state.device.load.dequeue()
+            return state.queue.popleft()
+        if self.work_stealing:
+            return self._steal(state)
+        return None
+
+    async def _worker(self, state, core=0):
+        # A worker runs one task at a time, so each core is a track
+        track = f"{state.device.device_id} core {core}"
+        # Workers of a retired device wait until it is revived
+        while True:
+            async with self._ready:
+                item = self._next_item(state)
+                while item is None:
+                    state.idle += 1
+                    try:
+                        await self._ready.wait()
+                    finally:
+                        state.idle -= 1
+                    item = self._next_item(state)
+
+            task, future = item
+            # A hedged copy whose race was decided while it waited
+            if future.done():
+                continue
+            state.busy += 1
+            try:
+                with tracing.track(track):
+                    result = await state.device.execute_task_async(
+                        task, processing_time=state.processing_time
+                    )
+            except Exception as error:
+                await self._device_failed(state, task, future, error)
+            else:
+                if self.health_tracker is not None:
+                    self.health_tracker.record(state.device.device_id, result["execution_time"],
+                                               state.processing_time)
+                if not future.done():
+                    future.set_result(result)
+                state.completed += 1
+                state.consecutive_failures = 0
+            finally:
+                state.busy -= 1
+
+    async def _device_failed(self, state, task, future, error):
+        """Move a failed task elsewhere; retire the device if it keeps failing."""
+        state.consecutive_failures += 1
+        if self.health_tracker is not None:
+            self.health_tracker.record_failure(state.device.device_id)
+        orphans = [(task, future)]
+        if self._is_failing(state):
+            state.failed = True
+            state.failed_at = get_current_time()
+            orphans += list(state.queue)
+            state.device.load.dequeue(len(state.queue))
+            state.queue.clear()
+        else:
+            self.retries += 1
+        for item in orphans:
+            target = self._place(exclude=state)
+            if target is None:
+                if not item[1].done():
+                    item[1].set_exception(error)
+                continue
+            target.queue.append(item)
+            target.device.load.enqueue()
+            self.reroutes += 1
+        async with self._ready:
+            self._ready.notify_all()
+
+    def capacity(self):
+        return sum(state.device.num_cores for state in self.queues)
+
+    def get_statistics(self):
+        return {
+            "policy": self.policy,
+            "steals": self.steals,
+            "reroutes": self.reroutes,
+            "retries": self.retries,
+            "recoveries": self.recoveries,
+            "failed_devices": [state.device.device_id for state in self.queues if state.failed],
+            "completed": {state.device.device_id: state.completed for state in self.queues}
+        }
+
+    async def close(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._ready = None
+
+    def __repr__(self):
+        return (f"EdgeTaskScheduler(devices={len(self.queues)}, policy={self.policy}, "
+                f"work_stealing={self.work_stealing})")
@@ -0,0 +1,95 @@
+from monitoring.histogram import LatencyHistogram
+from utils.helpers import get_current_time
+
+
+class HedgingPolicy:
+    """When to stop waiting on a cloud request and what to do after an error.
+
+    The hedging budget is the observed cloud round trip at ``percentile``,
+    cut short when waiting that long would leave too little of the task's
+    deadline for the edge to run it. Once the budget runs out the task is
+    issued to the edge as well and the first result wins. A failed request
+    is retried after exponential backoff while the retry can still finish
+    in time, and falls back to the edge otherwise.
+
+    Round trips are observed here rather than read from SystemMonitor,
+    because a request cancelled in favour of the edge copy still has to
+    count. It is recorded at the time it was cancelled, a lower bound that
+    keeps the percentile from drifting down as hedging hides slow responses.
+    """
+
+    def __init__(self, percentile=95, min_samples=20, default_budget=0.6, edge_estimate=0.3,
+                 max_retries=2, backoff_base=0.05, backoff_max=0.4):
+        """
+        Args:
+            percentile (float): Cloud latency percentile used as the budget
+            min_samples (int): Observations needed before trusting the percentile
+            default_budget (float): Budget in seconds until then
+            edge_estimate (float): Time the edge needs for a hedged or fallback copy (seconds)
+            max_retries (int): Cloud retries after errors before falling back to the edge
+            backoff_base (float): Delay before the first retry in seconds, doubled per retry
+            backoff_max (float): Upper bound on a retry delay in seconds
+        """
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_budget = default_budget
+        self.edge_estimate = edge_estimate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.latency = LatencyHistogram()
+
+    def observe(self, latency):
+        """Record a cloud round trip (or the elapsed time of a cancelled one)."""
+        self.latency.record(latency)
+
+    def expected_latency(self):
+        if self.latency.count < self.min_samples:
+            return self.default_budget
+        return self.latency.percentile(self.percentile)
+
+    def budget(self, task, current_time=None):
+        """
+        Seconds to wait for the cloud before hedging to the edge.
+
+        Returns:
+            float: The latency percentile, shortened so the edge copy can
+            still meet the deadline when it is able to
+        """
+        budget = self.expected_latency()
+        if current_time is None:
+            current_time = get_current_time()
+        remaining = task.get_remaining_time(current_time)
+        if remaining is not None:
+            latest_useful = remaining - self.edge_estimate
+            # Past that point the edge cannot make it either, so keep waiting
+            if latest_useful > 0:
+                budget = min(budget, latest_useful)
+        return budget
+
+    def retry_delay(self, task, attempt, error, current_time=None):
+        """
+        Backoff before retrying a failed cloud request.
+
+        Args:
+            task: The task whose request failed
+            attempt (int): Retries already made
+            error (str): The gateway's error message
+
+        Returns:
+            float: Seconds to wait before retrying, or None to fall back to the edge
+        """
+        # Another request would be refused again while the bucket is empty
+        if attempt >= self.max_retries or error == "Rate limit exceeded":
+            return None
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        if current_time is None:
+            current_time = get_current_time()
+        remaining = task.get_remaining_time(current_time)
+        if remaining is not None and delay + self.expected_latency() > remaining:
+            return None
+        return delay
+
+    def __repr__(self):
+        return (f"HedgingPolicy(p{self.percentile:g}={self.expected_latency():.3f}s, "
+                f"max_retries={self.max_retries})")
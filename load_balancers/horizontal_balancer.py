@@ -1,12 +1,104 @@
+import copy
+from collections import OrderedDict
+
+
+def apportion(total, weights):
+    """
+    Split an integer total into integer shares proportional to weights.
+    
+    Uses largest-remainder apportionment: every share is the floor of its
+    exact quota, and the units left over go to the largest fractional parts,
+    so the shares always sum to total and none is off by more than one.
+    
+    Args:
+        total (int): Amount to split
+        weights (list): Non-negative weights (equal shares if they sum to 0)
+        
+    Returns:
+        list: Integer shares in weight order
+    """
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights = [1] * len(weights)
+        weight_sum = len(weights)
+    quotas = [total * weight / weight_sum for weight in weights]
+    shares = [int(quota) for quota in quotas]
+    leftover = total - sum(shares)
+    by_remainder = sorted(range(len(weights)), key=lambda i: quotas[i] - shares[i], reverse=True)
+    for i in by_remainder[:leftover]:
+        shares[i] += 1
+    return shares
+
 
 class HorizontalLoadBalancer:
     
-    def __init__(self, root_device):
+    def __init__(self, root_device, plan_cache_size=128, load_delta=5):
+        """
+        Args:
+            root_device: The root edge device
+            plan_cache_size (int): Maximum number of cached distribution plans
+            load_delta (float): CPU percentage a device's load must move before
+                cached plans involving it stop being reused
+        """
         self.root_device = root_device
+        self.plan_cache_size = plan_cache_size
+        self.load_delta = load_delta
+        self._plan_cache = OrderedDict()
+        # ModelPartitioner behind optimal_partition (created on first use)
+        self.partitioner = None
+        # DeviceHealthTracker excluding failed devices and derating slow ones
+        self.health_tracker = None
+        self.cache_hits = 0
+        self.cache_misses = 0
         
     def get_connected_devices(self):
        
-        return [self.root_device] + self.root_device.connected_devices
+        devices = [self.root_device] + self.root_device.connected_devices
+        tracker = self.health_tracker
+        if tracker is None:
+            return devices
+        tracker.poll(devices)
+        # The root coordinates everything, so it is never excluded
+        return [device for device in devices
+                if device is self.root_device or not tracker.is_failed(device.device_id)]
+        
+    def _plan_key(self, kind, devices, model=None, layer_index=None):
+        # Update CPU usage for all devices and bucket it by load_delta
+        for device in devices:
+            device.update_cpu_usage()
+        loads = tuple(int(device.current_cpu_usage // self.load_delta) for device in devices)
+        if self.health_tracker is not None:
+            loads += tuple(round(self.health_tracker.health_factor(device.device_id), 1) for device in devices)
+        model_key = (model.name, model.model_id) if model is not None else None
+        return (kind, model_key, layer_index, self.root_device.topology_version,
+                tuple(device.device_id for device in devices), loads)
+        
+    def _cached_plan(self, key, compute, copy_plan=dict):
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            self._plan_cache.move_to_end(key)
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+            plan = compute()
+            self._plan_cache[key] = plan
+            if len(self._plan_cache) > self.plan_cache_size:
+                self._plan_cache.popitem(last=False)
+        # Callers get their own copy, deep enough that mutating it cannot
+        # corrupt the cached plan (a shallow copy suffices for scalar values)
+        return copy_plan(plan)
+        
+    def invalidate_plans(self):
+        self._plan_cache.clear()
+        
+    def get_cache_statistics(self):
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "size": len(self._plan_cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": (self.cache_hits / lookups) * 100 if lookups else 0
+        }
         
     def calculate_distribution(self):
         """
@@ -16,13 +108,15 @@ class HorizontalLoadBalancer:
             dict: Mapping of device IDs to power ratios
         """
         devices = self.get_connected_devices()
+        key = self._plan_key("distribution", devices)
+        return self._cached_plan(key, lambda: self._compute_distribution(devices))
         
-        # Update CPU usage for all devices
-        for device in devices:
-            device.update_cpu_usage()
-        
-        # Calculate total power
+    def _compute_distribution(self, devices):
+        # Calculate total power, derated for devices lagging behind their peers
         powers = {device.device_id: device.get_computational_power() for device in devices}
+        if self.health_tracker is not None:
+            powers = {device_id: power * self.health_tracker.health_factor(device_id)
+                      for device_id, power in powers.items()}
         total_power = sum(powers.values())
         
         if total_power == 0:
@@ -49,26 +143,23 @@ class HorizontalLoadBalancer:
         if not layer.is_divisible:
             return {self.root_device.device_id: (0, layer.parameters)}
             
-        distribution = self.calculate_distribution()
         devices = self.get_connected_devices()
+        layer_index = next((i for i, candidate in enumerate(model.layers) if candidate is layer), None)
+        key = self._plan_key("layer", devices, model, layer_index)
+        return self._cached_plan(key, lambda: self._compute_layer_plan(layer, devices))
+        
+    def _compute_layer_plan(self, layer, devices):
+        distribution = self._compute_distribution(devices)
         device_map = {}
         
+        # Apportion so every parameter is assigned exactly once
+        shares = apportion(layer.parameters, [distribution[device.device_id] for device in devices])
         start_idx = 0
-        for device in devices:
-            param_count = int(layer.parameters * distribution[device.device_id])
-            # Ensure at least 1 parameter per device
-            param_count = max(1, param_count)
-            end_idx = start_idx + param_count
-            
-            # Ensure we don't exceed layer parameters
-            end_idx = min(end_idx, layer.parameters)
-            
-            device_map[device.device_id] = (start_idx, end_idx)
-            start_idx = end_idx
-            
-            # If we've covered all parameters, stop
-            if end_idx >= layer.parameters:
-                break
+        for device, param_count in zip(devices, shares):
+            if param_count == 0:
+                continue
+            device_map[device.device_id] = (start_idx, start_idx + param_count)
+            start_idx += param_count
                 
         return device_map
         
@@ -82,34 +173,48 @@ class HorizontalLoadBalancer:
         Returns:
             dict: Mapping of device IDs to layer indices
         """
-        distribution = self.calculate_distribution()
         devices = self.get_connected_devices()
+        key = self._plan_key("layers", devices, model)
+        return self._cached_plan(key, lambda: self._compute_layers_plan(model, devices),
+                                 lambda plan: {device_id: list(layers) for device_id, layers in plan.items()})
+        
+    def _compute_layers_plan(self, model, devices):
+        distribution = self._compute_distribution(devices)
         device_to_layers = {device.device_id: [] for device in devices}
         
-        # Assign layers proportionally to computational power
-        total_layers = len(model.layers)
+        # Assign layer counts proportionally to computational power
+        counts = apportion(len(model.layers), [distribution[device.device_id] for device in devices])
         assigned = 0
-        
-        for device in devices:
-            # Calculate layer count based on power distribution
-            layer_count = int(total_layers * distribution[device.device_id])
-            # Ensure at least 1 layer per device if possible
-            layer_count = max(1, layer_count)
-            
-            # Last device gets remaining layers
-            if device == devices[-1]:
-                layer_count = total_layers - assigned
-                
-            # Assign layer indices
-            device_to_layers[device.device_id] = list(range(assigned, min(assigned + layer_count, total_layers)))
+        for device, layer_count in zip(devices, counts):
+            device_to_layers[device.device_id] = list(range(assigned, assigned + layer_count))
             assigned += layer_count
-            
-            # If we've assigned all layers, stop
-            if assigned >= total_layers:
-                break
                 
         return device_to_layers
+        
+    def optimal_partition(self, model):
+        """
+        Communication-aware, makespan-minimizing placement of a model.
+        
+        Unlike distribute_layers and distribute_layer, which split by power
+        alone, the plan accounts for per-layer MACs, activation transfers
+        over each device's link and the division efficiency of split layers.
+        The plan is for analysis only: the sharded and pipelined executors
+        still run distribute_layer and distribute_layers plans, since the
+        pipeline optimizes throughput rather than one inference's makespan.
+        
+        Args:
+            model: The model to place
+            
+        Returns:
+            dict: ModelPartitioner.partition result (steps, assignment, makespan)
+        """
+        if self.partitioner is None:
+            from load_balancers.model_partitioner import ModelPartitioner
+            self.partitioner = ModelPartitioner()
+        devices = self.get_connected_devices()
+        key = self._plan_key("partition", devices, model)
+        return self._cached_plan(key, lambda: self.partitioner.partition(model, devices), copy.deepcopy)
     
     def __repr__(self):
         devices = len(self.get_connected_devices())
-        return f"HorizontalLoadBalancer(connected_devices={devices})"
\ No newline at end of file
+        return f"HorizontalLoadBalancer(connected_devices={devices})"
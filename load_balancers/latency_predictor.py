@@ -0,0 +1,134 @@
+import math
+
+
+class RunningEstimate:
+    """Exponentially weighted mean and variance of a stream of observations."""
+
+    def __init__(self, alpha=0.2, prior_mean=0.0, prior_variance=0.0):
+        """
+        Args:
+            alpha (float): Weight of each new observation (0-1)
+            prior_mean (float): Estimate used before any observation arrives
+            prior_variance (float): Variance used before any observation arrives
+        """
+        self.alpha = alpha
+        self.prior_mean = prior_mean
+        self.prior_variance = prior_variance
+        self.reset()
+
+    def reset(self):
+        """Forget every observation and return to the prior."""
+        self.mean = self.prior_mean
+        self.variance = self.prior_variance
+        self.count = 0
+
+    def update(self, value):
+        if self.count == 0:
+            # First observation replaces the prior mean outright
+            self.mean = value
+        else:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.count += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def __repr__(self):
+        return f"RunningEstimate(mean={self.mean:.4f}, std={self.std:.4f}, count={self.count})"
+
+
+class LatencyPredictor:
+    """Online cost model for the edge and cloud execution paths.
+
+    Tracks the latency of each path from decision to completion and the
+    cloud failure rate, and turns them into a probability of missing a
+    deadline under a normal approximation of the latency distribution.
+    """
+
+    def __init__(self, alpha=0.2, edge_prior=0.3, cloud_prior=0.45, failure_prior=0.05,
+                 min_std=0.01):
+        """
+        Args:
+            alpha (float): EWMA weight of each new observation
+            edge_prior (float): Edge latency assumed before observations (seconds)
+            cloud_prior (float): Cloud round-trip time assumed before observations (seconds)
+            failure_prior (float): Cloud failure rate assumed before observations (0-1)
+            min_std (float): Standard deviation floor, so a run of identical
+                samples does not make the prediction a hard step
+        """
+        self.min_std = min_std
+        self.latency = {
+            "edge": RunningEstimate(alpha, edge_prior),
+            "cloud": RunningEstimate(alpha, cloud_prior)
+        }
+        self.cloud_failure = RunningEstimate(alpha, failure_prior)
+
+    def observe(self, target, latency, failed=False):
+        """
+        Args:
+            target (str): "edge" or "cloud"
+            latency (float): Seconds from decision to completion
+            failed (bool): Whether the path returned an error
+        """
+        if target == "cloud":
+            self.cloud_failure.update(1.0 if failed else 0.0)
+        # A failed call's latency says nothing about a successful one
+        if not failed and target in self.latency:
+            self.latency[target].update(latency)
+
+    def expected_latency(self, target):
+        return self.latency[target].mean
+
+    def miss_probability(self, target, remaining):
+        """
+        Args:
+            target (str): "edge" or "cloud"
+            remaining (float): Seconds left until the deadline (None = no deadline)
+
+        Returns:
+            float: Predicted probability that the task misses its deadline
+        """
+        failure = self.cloud_failure.mean if target == "cloud" else 0.0
+        if remaining is None:
+            return failure
+        estimate = self.latency[target]
+        z = (remaining - estimate.mean) / max(estimate.std, self.min_std)
+        late = 0.5 * math.erfc(z / math.sqrt(2))
+        # Failed calls miss their deadline regardless of timing
+        return failure + (1 - failure) * late
+
+    def choose(self, remaining, tolerance=1e-6):
+        """
+        Pick the target with the lower predicted miss probability, breaking
+        near-ties by expected latency.
+
+        Returns:
+            str: "edge" or "cloud"
+        """
+        edge = self.miss_probability("edge", remaining)
+        cloud = self.miss_probability("cloud", remaining)
+        if abs(edge - cloud) <= tolerance:
+            return "cloud" if self.expected_latency("cloud") < self.expected_latency("edge") else "edge"
+        return "cloud" if cloud < edge else "edge"
+
+    def reset(self):
+        for estimate in self.latency.values():
+            estimate.reset()
+        self.cloud_failure.reset()
+
+    def get_statistics(self):
+        return {
+            "edge_latency": {"mean": self.latency["edge"].mean, "std": self.latency["edge"].std,
+                             "samples": self.latency["edge"].count},
+            "cloud_latency": {"mean": self.latency["cloud"].mean, "std": self.latency["cloud"].std,
+                              "samples": self.latency["cloud"].count},
+            "cloud_failure_rate": self.cloud_failure.mean
+        }
+
+    def __repr__(self):
+        return (f"LatencyPredictor(edge={self.latency['edge'].mean:.3f}s, "
+                f"cloud={self.latency['cloud'].mean:.3f}s, "
+                f"cloud_failure={self.cloud_failure.mean:.2%})")
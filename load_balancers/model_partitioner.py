@@ -0,0 +1,204 @@
+from load_balancers.horizontal_balancer import apportion
+
+
+class ModelPartitioner:
+    """Communication-aware placement of a model's layers on edge devices.
+
+    Devices reach each other through the root device over per-device links
+    with their own bandwidth and latency. A layer costs its MACs over the
+    device's compute rate, and moving an activation costs one latency plus
+    its bytes over the bandwidth for each link it crosses.
+
+    partition() minimizes the end-to-end time of one inference (makespan).
+    It runs a dynamic program over (layer, device holding the activation),
+    so consecutive layers on the same device form contiguous stages.
+    Divisible layers may instead be split by output rows across the k
+    fastest devices, in proportion to their rates. The input is scattered,
+    the partial outputs are gathered at the root, and compute is discounted
+    by Layer.get_division_efficiency.
+    """
+
+    def __init__(self, links=None, default_link=None, macs_per_ghz_second=4e8, bytes_per_element=4):
+        """
+        Args:
+            links (dict): Device ID -> {"bandwidth": bytes/s, "latency": s}
+                for the device's link to the root
+            default_link (dict): Link used for devices missing from ``links``
+            macs_per_ghz_second (float): MACs per GHz of computational power per second
+            bytes_per_element (int): Bytes per activation element (4 = float32)
+        """
+        self.links = links or {}
+        self.default_link = default_link or {"bandwidth": 12.5e6, "latency": 0.002}
+        self.macs_per_ghz_second = macs_per_ghz_second
+        self.bytes_per_element = bytes_per_element
+
+    def rate(self, device):
+        """MACs per second the device sustains at its current load."""
+        return max(device.get_computational_power(), 1e-3) * self.macs_per_ghz_second
+
+    def _hop(self, device_id, elements):
+        link = self.links.get(device_id, self.default_link)
+        return link["latency"] + elements * self.bytes_per_element / link["bandwidth"]
+
+    def transfer_time(self, source_id, target_id, elements, root_id):
+        """Time to move ``elements`` activation values between two devices via the root."""
+        if source_id == target_id or not elements:
+            return 0.0
+        time = 0.0
+        if source_id != root_id:
+            time += self._hop(source_id, elements)
+        if target_id != root_id:
+            time += self._hop(target_id, elements)
+        return time
+
+    def split_time(self, layer, input_elements, holder_id, shares, rates, root_id):
+        """
+        Time for a row-split layer: scatter the input, compute the shares in
+        parallel, gather the partial outputs at the root.
+
+        Args:
+            layer: Divisible layer with out_features rows
+            input_elements (int): Size of the layer's input activation
+            holder_id: Device holding the input
+            shares (dict): Device ID -> output rows
+            rates (dict): Device ID -> MACs per second
+            root_id: ID of the root device
+        """
+        macs_per_row = layer.macs / layer.out_features
+        efficiency = layer.get_division_efficiency() or 1.0
+        active = {device_id: rows for device_id, rows in shares.items() if rows}
+        # Links to different devices carry their transfers in parallel
+        scatter = max(self.transfer_time(holder_id, device_id, input_elements, root_id)
+                      for device_id in active)
+        compute = max(rows * macs_per_row / rates[device_id] for device_id, rows in active.items())
+        gather = max(self.transfer_time(device_id, root_id, rows, root_id)
+                     for device_id, rows in active.items())
+        return scatter + compute / efficiency + gather
+
+    def partition(self, model, devices):
+        """
+        Compute a makespan-minimizing placement for one inference.
+
+        Args:
+            model: MLModel with per-layer macs and output_size
+            devices (list): Candidate EdgeDevices; the first is the root,
+                which holds the input and receives the output
+
+        Returns:
+            dict: "steps" (contiguous stages and row splits in model order),
+            "assignment" (per-layer device ID or row-range dict) and the
+            predicted "makespan"
+        """
+        root_id = devices[0].device_id
+        device_ids = [device.device_id for device in devices]
+        rates = {device.device_id: self.rate(device) for device in devices}
+        by_rate = sorted(device_ids, key=rates.get, reverse=True)
+
+        # best[d]: fastest way to have the current activation on device d
+        best = {device_id: (0.0 if device_id == root_id else float("inf")) for device_id in device_ids}
+        history = []
+        input_elements = model.input_size or 0
+        for layer in model.layers:
+            step = {}
+            new_best = {device_id: float("inf") for device_id in device_ids}
+            for target in device_ids:
+                compute = layer.macs / rates[target]
+                for source in device_ids:
+                    cost = best[source] + self.transfer_time(source, target, input_elements, root_id) + compute
+                    if cost < new_best[target]:
+                        new_best[target] = cost
+                        step[target] = (source, target)
+
+            if layer.is_divisible and layer.out_features and len(devices) > 1:
+                for k in range(2, len(devices) + 1):
+                    chosen = by_rate[:k]
+                    rows = apportion(layer.out_features, [rates[device_id] for device_id in chosen])
+                    shares = dict(zip(chosen, rows))
+                    for source in device_ids:
+                        cost = best[source] + self.split_time(layer, input_elements, source, shares, rates, root_id)
+                        if cost < new_best[root_id]:
+                            new_best[root_id] = cost
+                            step[root_id] = (source, shares)
+
+            history.append(step)
+            best = new_best
+            input_elements = layer.output_size or 0
+
+        # The result has to end up back on the root
+        final = min(device_ids, key=lambda device_id: best[device_id]
+                    + self.transfer_time(device_id, root_id, input_elements, root_id))
+        makespan = best[final] + self.transfer_time(final, root_id, input_elements, root_id)
+
+        assignment = [None] * len(model.layers)
+        holder = final
+        for index in range(len(model.layers) - 1, -1, -1):
+            source, placement = history[index][holder]
+            assignment[index] = placement if isinstance(placement, dict) else holder
+            holder = source
+
+        return {"steps": self.steps(assignment), "assignment": assignment, "makespan": makespan}
+
+    def evaluate(self, model, devices, assignment):
+        """
+        Predicted makespan of an arbitrary per-layer assignment.
+
+        Args:
+            assignment (list): Per layer, a device ID or a dict of device ID
+                -> output rows for a row split
+
+        Returns:
+            float: Seconds from input on the root to output on the root
+        """
+        root_id = devices[0].device_id
+        rates = {device.device_id: self.rate(device) for device in devices}
+        holder = root_id
+        elapsed = 0.0
+        input_elements = model.input_size or 0
+        for layer, placement in zip(model.layers, assignment):
+            if isinstance(placement, dict):
+                elapsed += self.split_time(layer, input_elements, holder, placement, rates, root_id)
+                holder = root_id
+            else:
+                elapsed += self.transfer_time(holder, placement, input_elements, root_id)
+                elapsed += layer.macs / rates[placement]
+                holder = placement
+            input_elements = layer.output_size or 0
+        return elapsed + self.transfer_time(holder, root_id, input_elements, root_id)
+
+    @staticmethod
+    def steps(assignment):
+        """Group a per-layer assignment into contiguous stages and row splits."""
+        steps = []
+        for index, placement in enumerate(assignment):
+            if isinstance(placement, dict):
+                steps.append({"layers": [index], "split": placement})
+            elif steps and steps[-1].get("device") == placement:
+                steps[-1]["layers"].append(index)
+            else:
+                steps.append({"layers": [index], "device": placement})
+        return steps
+
+    def __repr__(self):
+        return (f"ModelPartitioner(links={len(self.links)}, "
+                f"macs_per_ghz_second={self.macs_per_ghz_second:g})")
+
+
+def proportional_assignment(horizontal_balancer, model):
+    """
+    The balancer's existing plan as a per-layer assignment: whole layers from
+    distribute_layers, with divisible layers split by distribute_layer's
+    power-proportional parameter ranges converted to output rows.
+    """
+    layer_map = horizontal_balancer.distribute_layers(model)
+    assignment = [None] * len(model.layers)
+    for device_id, indices in layer_map.items():
+        for index in indices:
+            assignment[index] = device_id
+    for index, layer in enumerate(model.layers):
+        if not (layer.is_divisible and layer.out_features):
+            continue
+        row_params = layer.parameters / layer.out_features
+        ranges = horizontal_balancer.distribute_layer(layer, model)
+        rows = [round(end / row_params) - round(start / row_params) for start, end in ranges.values()]
+        assignment[index] = dict(zip(ranges, rows))
+    return assignment
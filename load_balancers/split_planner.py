@@ -0,0 +1,81 @@
+class SplitPointPlanner:
+    """Chooses where to cut a model between the root device and the cloud.
+
+    For every layer boundary k the root runs layers [0, k), uploads the
+    activation leaving layer k - 1 (the raw input when k is 0) and the cloud
+    runs the rest. The estimate for a cut is the edge compute time at the
+    root's current load, plus one-way latency and upload time for the
+    activation, plus the cloud's share of its compute time and the return
+    latency. Cutting after the last layer means running entirely at the
+    edge, and cutting before the first means a plain cloud offload, which
+    ServerGateway.send_to_cloud charges the same raw-input upload.
+    """
+
+    def __init__(self, macs_per_ghz_second=4e8, bytes_per_element=4):
+        """
+        Args:
+            macs_per_ghz_second (float): MACs per GHz of computational power per second
+            bytes_per_element (int): Bytes per activation element (4 = float32)
+        """
+        self.macs_per_ghz_second = macs_per_ghz_second
+        self.bytes_per_element = bytes_per_element
+
+    def estimate(self, model, device, uplink_bandwidth, network_latency, cloud_processing_time):
+        """
+        Estimate every cut of the model.
+
+        Args:
+            model: MLModel with per-layer macs and output_size
+            device: EdgeDevice running the leading layers
+            uplink_bandwidth (float): Bytes per second from the edge to the cloud
+            network_latency (float): Expected one-way latency to the cloud (seconds)
+            cloud_processing_time (float): Cloud compute time for the whole model (seconds)
+
+        Returns:
+            list: One dict per boundary 0..len(layers) with the split index,
+            "edge", "transfer", "cloud" and "total" seconds, the
+            "activation_bytes" uploaded and the "cloud_fraction" of MACs
+            left to the cloud
+        """
+        layers = model.layers
+        total_macs = sum(layer.macs for layer in layers) or 1
+        rate = max(device.get_computational_power(), 1e-3) * self.macs_per_ghz_second
+
+        estimates = []
+        edge_macs = 0
+        activation = model.input_size or 0
+        for split in range(len(layers) + 1):
+            if split:
+                edge_macs += layers[split - 1].macs
+                activation = layers[split - 1].output_size or 0
+            edge = edge_macs / rate
+            if split == len(layers):
+                # Nothing leaves the device
+                activation_bytes, transfer, cloud, fraction = 0, 0.0, 0.0, 0.0
+            else:
+                activation_bytes = activation * self.bytes_per_element
+                transfer = network_latency + activation_bytes / uplink_bandwidth
+                fraction = (total_macs - edge_macs) / total_macs
+                cloud = cloud_processing_time * fraction + network_latency
+            estimates.append({
+                "split": split,
+                "edge": edge,
+                "transfer": transfer,
+                "cloud": cloud,
+                "total": edge + transfer + cloud,
+                "activation_bytes": activation_bytes,
+                "cloud_fraction": fraction
+            })
+        return estimates
+
+    def plan(self, model, device, uplink_bandwidth, network_latency, cloud_processing_time):
+        """
+        Returns:
+            dict: The latency-minimizing entry of estimate(); the earliest
+            cut wins ties, keeping less work on the edge
+        """
+        estimates = self.estimate(model, device, uplink_bandwidth, network_latency, cloud_processing_time)
+        return min(estimates, key=lambda entry: entry["total"])
+
+    def __repr__(self):
+        return f"SplitPointPlanner(macs_per_ghz_second={self.macs_per_ghz_second:g})"
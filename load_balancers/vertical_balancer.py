@@ -1,8 +1,19 @@
+from operator import attrgetter
+import numpy as np
+from load_balancers.latency_predictor import LatencyPredictor
+from load_balancers.split_planner import SplitPointPlanner
+from utils.helpers import get_current_time
+
+
+_DECISION_LABELS = np.array(["edge", "cloud", "skip", "split"], dtype=object)
+
+
 class VerticalLoadBalancer:
     """Decides whether to process tasks at edge or cloud."""
     
     def __init__(self, root_device, server_gateway, cpu_threshold=33, deadline_threshold=7, 
-                 task_count_threshold=25, decision_mode="weighted", weights=None, cloud_threshold=60):
+                 task_count_threshold=25, decision_mode="weighted", weights=None, cloud_threshold=60,
+                 respect_rate_limit=True, predictor=None, split_planner=None):
         """
         Initialize vertical load balancer.
         
@@ -12,9 +23,14 @@ class VerticalLoadBalancer:
             cpu_threshold (int): CPU utilization threshold percentage
             deadline_threshold (int): Task deadline threshold in seconds
             task_count_threshold (int): Number of edge tasks before cloud offloading
-            decision_mode (str): Decision method ("cpu", "deadline", "count", or "weighted")
+            decision_mode (str): Decision method ("cpu", "deadline", "count", "weighted",
+                "predictive" or "split")
             weights (dict): Weights for different factors in weighted decision model
             cloud_threshold (int): Score threshold for cloud offloading (0-100)
+            respect_rate_limit (bool): Keep tasks at the edge while the gateway
+                would rate limit a cloud request
+            predictor (LatencyPredictor): Online cost model for "predictive" mode
+            split_planner (SplitPointPlanner): Cut-point cost model for "split" mode
         """
         self.root_device = root_device
         self.server_gateway = server_gateway
@@ -29,12 +45,19 @@ class VerticalLoadBalancer:
             "task_count": 0.1
         }
         self.cloud_threshold = cloud_threshold
+        self.respect_rate_limit = respect_rate_limit
+        self.rate_limited_redirects = 0
+        self.predictor = predictor or LatencyPredictor()
+        self.split_planner = split_planner or SplitPointPlanner()
+        self.last_split_plan = None
         self.edge_task_counter = 0
         self.total_decisions = {
             "edge": 0,
             "cloud": 0,
-            "skip": 0
+            "skip": 0,
+            "split": 0
         }
+        self.decision_metrics = self._empty_decision_metrics()
     
     def make_decision(self, task, balancing_condition=None):
         """
@@ -45,10 +68,12 @@ class VerticalLoadBalancer:
             balancing_condition: Legacy parameter to specify decision method
             
         Returns:
-            str: Decision ("edge", "cloud", or "skip")
+            str: Decision ("edge", "cloud", "split" or "skip"); a "split"
+            task carries its plan in task.split_plan
         """
         # Use specified balancing_condition if provided, otherwise use configured decision_mode
         decision_method = balancing_condition or self.decision_mode
+        counter = self.edge_task_counter
         
         # Always process sensitive data at edge
         if task.is_sensitive:
@@ -66,6 +91,12 @@ class VerticalLoadBalancer:
         # Apply selected decision method
         if decision_method == "weighted":
             decision = self._make_weighted_decision(task, current_time)
+        elif decision_method == "predictive":
+            decision = self.predictor.choose(task.get_remaining_time(current_time))
+        elif decision_method == "split":
+            decision = self._make_split_decision()
+            if decision == "split":
+                task.split_plan = self.last_split_plan
         elif decision_method == "cpu":
             self.root_device.update_cpu_usage()
             if self.root_device.current_cpu_usage > self.cpu_threshold:
@@ -88,9 +119,249 @@ class VerticalLoadBalancer:
             # Default to edge processing
             decision = "edge"
         
+        if decision in ("cloud", "split") and self._cloud_rate_limited():
+            decision = "edge"
+            self.rate_limited_redirects += 1
+            if decision_method in ("weighted", "count"):
+                # The method reset the counter for a cloud offload; count an edge run
+                self.edge_task_counter = counter + 1
+        
         self.total_decisions[decision] += 1
         return decision
     
+    def _make_split_decision(self):
+        """
+        Pick the latency-minimizing cut of the loaded model for the root's
+        current load and the gateway's uplink.
+        
+        Returns:
+            str: "cloud" for a cut before the first layer, "edge" for a cut
+            after the last, otherwise "split" (plan in last_split_plan)
+        """
+        model = self.root_device.model
+        if model is None or not model.layers or self.server_gateway is None:
+            return "edge"
+            
+        self.root_device.update_cpu_usage()
+        cloud = self.server_gateway.cloud_service
+        self.last_split_plan = self.split_planner.plan(
+            model,
+            self.root_device,
+            self.server_gateway.uplink_bandwidth,
+            sum(cloud.latency_range) / 2,
+            cloud.processing_time
+        )
+        split = self.last_split_plan["split"]
+        if split == 0:
+            return "cloud"
+        if split == len(model.layers):
+            return "edge"
+        return "split"
+    
+    def _cloud_rate_limited(self):
+        # Non-blocking query; tokens are only taken when the request is sent
+        return (self.respect_rate_limit and self.server_gateway is not None
+                and self.server_gateway.would_exceed_rate_limit())
+    
+    def reset(self):
+        """Clear decision counters and learned latencies so consecutive experiments start fresh."""
+        self.predictor.reset()
+        self.edge_task_counter = 0
+        self.rate_limited_redirects = 0
+        self.last_split_plan = None
+        self.total_decisions = {key: 0 for key in self.total_decisions}
+        self.decision_metrics = self._empty_decision_metrics()
+    
+    def record_skip(self, count=1):
+        """Count tasks dropped before reaching make_decision (e.g. expired in the queue)."""
+        self.total_decisions["skip"] += count
+    
+    def record_override(self, decision, replacement):
+        """Move a counted decision to another target (e.g. after admission control)."""
+        self.total_decisions[decision] -= 1
+        self.total_decisions[replacement] += 1
+    
+    def record_rate_limited(self, decision):
+        """Count a cloud-bound decision the gateway rate limited on send as an edge redirect."""
+        self.rate_limited_redirects += 1
+        self.record_override(decision, "edge")
+    
+    def make_decisions(self, tasks, balancing_condition=None):
+        """
+        Decide a burst of tasks at once.
+        
+        Scores are computed over NumPy arrays with the same arithmetic as
+        make_decision, against a single CPU reading and timestamp, so the
+        result equals calling make_decision on each task in order while the
+        load stays unchanged. Only the edge_task_counter recurrence is
+        resolved sequentially, as an integer scan.
+        
+        Args:
+            tasks (list): Tasks in arrival order
+            balancing_condition: Decision method override
+            
+        Returns:
+            list: Decisions ("edge", "cloud", "split" or "skip") in task order
+        """
+        n = len(tasks)
+        # None deadlines become NaN
+        decisions = self.make_decisions_from_arrays(
+            np.fromiter(map(attrgetter("deadline"), tasks), dtype=np.float64, count=n),
+            np.fromiter(map(attrgetter("is_sensitive"), tasks), dtype=bool, count=n),
+            np.fromiter(map(attrgetter("creation_time"), tasks), dtype=np.float64, count=n),
+            balancing_condition
+        )
+        if "split" in decisions:
+            for task, decision in zip(tasks, decisions):
+                if decision == "split":
+                    task.split_plan = self.last_split_plan
+        return decisions
+    
+    def make_decisions_from_arrays(self, deadlines, sensitive, creation_times, balancing_condition=None):
+        """
+        Batch decision over task columns, for callers that already hold them
+        as arrays (reading three attributes per Task dominates make_decisions).
+        
+        Args:
+            deadlines (ndarray): Relative deadlines in seconds, NaN for none
+            sensitive (ndarray): Sensitivity flags
+            creation_times (ndarray): Task creation timestamps
+            balancing_condition: Decision method override
+            
+        Returns:
+            list: Decisions ("edge", "cloud", "split" or "skip") in task order
+        """
+        decision_method = balancing_condition or self.decision_mode
+        n = len(deadlines)
+        if n == 0:
+            return []
+            
+        current_time = get_current_time()
+        
+        # Sensitive tasks stay at the edge; others skip if already late
+        has_deadline = ~np.isnan(deadlines)
+        missed = has_deadline & (current_time > creation_times + np.where(has_deadline, deadlines, 0))
+        skip = ~sensitive & missed
+        eligible = ~sensitive & ~missed
+        to_cloud = np.zeros(n, dtype=bool)
+        to_split = np.zeros(n, dtype=bool)
+        
+        # A redirected offload runs at the edge, so while the gateway would
+        # rate limit, nothing resets the counter (as in make_decision)
+        reset = decision_method not in ("weighted", "count") or not self._cloud_rate_limited()
+        
+        if decision_method == "weighted":
+            to_cloud[eligible] = self._weighted_decisions(deadlines[eligible], reset)
+        elif decision_method == "predictive":
+            remaining = (creation_times + deadlines - current_time)[eligible]
+            to_cloud[eligible] = [
+                self.predictor.choose(None if np.isnan(r) else r) == "cloud"
+                for r in remaining.tolist()
+            ]
+        elif decision_method == "split":
+            # One plan serves the whole burst: it depends only on load and the link
+            if eligible.any():
+                target = self._make_split_decision()
+                to_cloud[eligible] = target == "cloud"
+                to_split[eligible] = target == "split"
+        elif decision_method == "cpu":
+            self.root_device.update_cpu_usage()
+            to_cloud[eligible] = self.root_device.current_cpu_usage > self.cpu_threshold
+        elif decision_method == "deadline":
+            # A deadline of 0 is falsy in the scalar path and stays at the edge
+            eligible_deadlines = np.nan_to_num(deadlines[eligible], nan=0.0)
+            to_cloud[eligible] = (eligible_deadlines != 0) & (eligible_deadlines > self.deadline_threshold)
+        elif decision_method == "count":
+            to_cloud[eligible] = self._count_decisions(int(eligible.sum()), reset)
+        
+        # Same answer make_decision gets for each task: no tokens are taken
+        if (to_cloud.any() or to_split.any()) and self._cloud_rate_limited():
+            self.rate_limited_redirects += int(to_cloud.sum()) + int(to_split.sum())
+            to_cloud[:] = False
+            to_split[:] = False
+        
+        codes = to_cloud.astype(np.int8) + 2 * skip.astype(np.int8) + 3 * to_split.astype(np.int8)
+        decisions = _DECISION_LABELS[codes].tolist()
+        self.total_decisions["skip"] += int(skip.sum())
+        self.total_decisions["cloud"] += int(to_cloud.sum())
+        self.total_decisions["split"] += int(to_split.sum())
+        self.total_decisions["edge"] += n - int(skip.sum()) - int(to_cloud.sum()) - int(to_split.sum())
+        return decisions
+    
+    def _count_decisions(self, m, reset=True):
+        # The scalar rule fires whenever counter + 1 reaches the threshold,
+        # i.e. at every position where (counter + j) is a multiple of it
+        threshold = max(1, self.task_count_threshold)
+        if not reset:
+            positions = self.edge_task_counter + np.arange(1, m + 1)
+            self.edge_task_counter += m
+            return positions >= threshold
+        counter = min(self.edge_task_counter, threshold - 1)
+        positions = counter + np.arange(1, m + 1)
+        to_cloud = positions % threshold == 0
+        self.edge_task_counter = int((counter + m) % threshold)
+        return to_cloud
+    
+    def _weighted_decisions(self, deadlines, reset=True):
+        m = deadlines.shape[0]
+        if m == 0:
+            return np.zeros(0, dtype=bool)
+            
+        self.root_device.update_cpu_usage()
+        cpu_score = min(100, self.root_device.current_cpu_usage * 1.5)
+        
+        # Accumulate in the scalar path's order so float results match exactly
+        base = np.full(m, cpu_score * self.weights["cpu"], dtype=np.float64)
+        has_deadline = ~np.isnan(deadlines) & (deadlines != 0)
+        deadline_score = np.maximum(0, np.minimum(100, 100 * (1 - (deadlines - 0.5) / 9.5)))
+        base = np.where(has_deadline, base + deadline_score * self.weights["deadline"], base)
+        if self.root_device.model:
+            comp_score = min(100, len(self.root_device.model.layers) * 5)
+            base = base + comp_score * self.weights["computation"]
+        
+        # Counter contributions saturate once the counter reaches the threshold
+        threshold = self.task_count_threshold
+        saturation = max(1, int(np.ceil(threshold))) if threshold > 0 else 1
+        counters = np.arange(saturation + 1, dtype=np.float64)
+        count_scores = np.minimum(100, (counters / threshold) * 100) * self.weights["task_count"]
+        
+        # Smallest counter value that sends each task to the cloud. The score
+        # is monotone in the counter, so search on the margin and then correct
+        # the estimate against the exact score comparison.
+        needed = np.searchsorted(count_scores, self.cloud_threshold - base)
+        while True:
+            lower = needed > 0
+            lower[lower] = base[lower] + count_scores[needed[lower] - 1] >= self.cloud_threshold
+            if not lower.any():
+                break
+            needed[lower] -= 1
+        while True:
+            higher = needed <= saturation
+            higher[higher] = base[higher] + count_scores[needed[higher]] < self.cloud_threshold
+            if not higher.any():
+                break
+            needed[higher] += 1
+        
+        if not reset:
+            # The counter before task i is simply counter + i
+            counters = self.edge_task_counter + np.arange(m)
+            self.edge_task_counter += m
+            return (needed <= saturation) & (needed <= counters)
+        
+        # Only tasks that can reach the cloud affect the counter's resets;
+        # the counter before task i is i - last_cloud - 1
+        candidates = np.flatnonzero(needed <= saturation)
+        last_cloud = -self.edge_task_counter - 1
+        cloud_indices = []
+        for i, required in zip(candidates.tolist(), needed[candidates].tolist()):
+            if i - last_cloud - 1 >= required:
+                cloud_indices.append(i)
+                last_cloud = i
+        self.edge_task_counter = m - last_cloud - 1
+        to_cloud = np.zeros(m, dtype=bool)
+        to_cloud[cloud_indices] = True
+        return to_cloud
+    
     def _make_weighted_decision(self, task, current_time):
         """
         Make a decision based on weighted factors.
@@ -140,6 +411,55 @@ class VerticalLoadBalancer:
         
         return decision
         
+    @staticmethod
+    def _empty_decision_metrics():
+        return {
+            'edge': {'count': 0, 'missed_deadlines': 0, 'failures': 0, 'avg_execution': 0},
+            'cloud': {'count': 0, 'missed_deadlines': 0, 'failures': 0, 'avg_execution': 0},
+            'split': {'count': 0, 'missed_deadlines': 0, 'failures': 0, 'avg_execution': 0}
+        }
+    
+    def record_decision_quality(self, task, decision, execution_time, deadline_missed, failed=False):
+        """
+        Record the outcome of a decision and feed it to the latency predictor.
+        
+        Args:
+            task: The completed task
+            decision (str): Where the task ran ("edge", "cloud" or "split")
+            execution_time (float): Seconds from decision to completion
+            deadline_missed (bool): Whether the task finished late
+            failed (bool): Whether the target returned an error
+        """
+        metrics = self.decision_metrics.get(decision)
+        if metrics is None:
+            return
+        metrics['count'] += 1
+        
+        # Update running average of execution time
+        metrics['avg_execution'] = ((metrics['avg_execution'] * (metrics['count'] - 1)) + 
+                                    execution_time) / metrics['count']
+        
+        if deadline_missed:
+            metrics['missed_deadlines'] += 1
+        if failed:
+            metrics['failures'] += 1
+            
+        self.predictor.observe(decision, execution_time, failed)
+    
+    def get_decision_quality_metrics(self):
+        """Get metrics about decision quality."""
+        if not any(data['count'] for data in self.decision_metrics.values()):
+            return {'no_metrics_available': True}
+        
+        metrics = {location: dict(data) for location, data in self.decision_metrics.items()}
+        for location, data in metrics.items():
+            if data['count'] > 0:
+                data['deadline_miss_rate'] = (data['missed_deadlines'] / data['count']) * 100
+            else:
+                data['deadline_miss_rate'] = 0
+        
+        return metrics
+        
     def get_statistics(self):
         total = sum(self.total_decisions.values())
         if total == 0:
@@ -158,34 +478,3 @@ class VerticalLoadBalancer:
                 f"cpu_threshold={self.cpu_threshold}, "
                 f"deadline_threshold={self.deadline_threshold}, "
                 f"task_count_threshold={self.task_count_threshold})")
-def record_decision_quality(self, task, decision, execution_time, deadline_missed):
-    """Record metrics about decision quality."""
-    if not hasattr(self, 'decision_metrics'):
-        self.decision_metrics = {
-            'edge': {'count': 0, 'missed_deadlines': 0, 'avg_execution': 0},
-            'cloud': {'count': 0, 'missed_deadlines': 0, 'avg_execution': 0}
-        }
-    
-    metrics = self.decision_metrics[decision]
-    metrics['count'] += 1
-    
-    # Update running average of execution time
-    metrics['avg_execution'] = ((metrics['avg_execution'] * (metrics['count'] - 1)) + 
-                                execution_time) / metrics['count']
-    
-    if deadline_missed:
-        metrics['missed_deadlines'] += 1
-
-def get_decision_quality_metrics(self):
-    """Get metrics about decision quality."""
-    if not hasattr(self, 'decision_metrics'):
-        return {'no_metrics_available': True}
-    
-    metrics = self.decision_metrics.copy()
-    for location, data in metrics.items():
-        if data['count'] > 0:
-            data['deadline_miss_rate'] = (data['missed_deadlines'] / data['count']) * 100
-        else:
-            data['deadline_miss_rate'] = 0
-    
-    return metrics
\ No newline at end of file
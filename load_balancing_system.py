@@ -1,15 +1,19 @@
 
-import time
+import asyncio
 import random
 from models.edge_device import EdgeDevice
 from models.cloud_service import CloudService
 from models.server_gateway import ServerGateway
 from models.ml_model import MLModel, Layer
 from models.task import Task
+from models.task_queue import TaskQueue
+from models.result_cache import ResultCache
 from load_balancers.vertical_balancer import VerticalLoadBalancer
 from load_balancers.horizontal_balancer import HorizontalLoadBalancer
 from monitoring.system_monitor import SystemMonitor
-from utils.helpers import get_current_time, generate_random_image_data
+from monitoring import tracing
+from utils.helpers import get_current_time, sleep, run_coroutine, generate_random_image_data
+import config
 
 class LoadBalancingSystem:
     """Main system that orchestrates the entire load balancing process."""
@@ -22,7 +26,16 @@ class LoadBalancingSystem:
         self.vertical_balancer = VerticalLoadBalancer(self.root_device, self.server_gateway)
         self.horizontal_balancer = HorizontalLoadBalancer(self.root_device)
         self.system_monitor = SystemMonitor()
-        self.task_queue = []
+        self.task_queue = TaskQueue(execution_estimate=self.estimate_execution_time)
+        self.tasks_created = 0
+        self.shard_executor = None
+        self.pipeline_executor = None
+        self.result_cache = None
+        self.admission_controller = None
+        self.hedging = None
+        self.edge_scheduling = None  # EdgeTaskScheduler settings when enabled
+        self.edge_scheduler = None
+        self.edge_scheduler_stats = None
         
     def add_edge_device(self, device_id, cpu_speed, num_cores):
        
@@ -35,9 +48,168 @@ class LoadBalancingSystem:
        
         self.root_device.model = model
         
-    def create_task(self, input_data=None, deadline=None, is_sensitive=False):
+    def configure_load_model(self, cpu_source="sampler", half_life=0.25):
+        """
+        Choose where every device's CPU utilization comes from.
+        
+        Args:
+            cpu_source (str): "model" tracks the work assigned to each device;
+                "sampler" reads the host CPU for all of them
+            half_life (float): Decay half-life of the per-device load model (seconds)
+        """
+        from monitoring.load_model import DeviceLoadModel
+        
+        if cpu_source not in ("model", "sampler"):
+            raise ValueError(f"Unknown CPU source: {cpu_source}")
+        for device in self.horizontal_balancer.get_connected_devices():
+            device.cpu_source = cpu_source
+            # Rebuilt so the model matches the device's configured core count
+            device.load = DeviceLoadModel(device.num_cores, half_life)
+        self.horizontal_balancer.invalidate_plans()
+    
+    def enable_sharded_execution(self, max_workers=None, speculation_factor=None):
+        """Run the loaded model's linear layers for real across worker processes."""
+        from execution.sharded_executor import ShardedLinearExecutor
+        
+        self.disable_sharded_execution()
+        if speculation_factor is None:
+            speculation_factor = config.HEALTH["speculation_factor"]
+        if max_workers is None:
+            max_workers = len(self.horizontal_balancer.get_connected_devices())
+        self.shard_executor = ShardedLinearExecutor(self.root_device.model, max_workers=max_workers,
+                                                    speculation_factor=speculation_factor)
+        return self.shard_executor
+        
+    def disable_sharded_execution(self):
+        if self.shard_executor is not None:
+            self.shard_executor.close()
+            self.shard_executor = None
+    
+    def enable_gateway_batching(self, max_batch_size=8, max_batch_wait=0.05):
+        """Swap in a gateway that coalesces concurrent cloud requests into batches."""
+        from models.batching_gateway import BatchingServerGateway
+        
+        gateway = BatchingServerGateway(self.cloud_service, max_batch_size, max_batch_wait,
+                                        self.server_gateway.rate_limiter.rate,
+                                        self.server_gateway.rate_limiter.burst)
+        self._replace_gateway(gateway)
+        return gateway
+        
+    def disable_gateway_batching(self):
+        self._replace_gateway(ServerGateway(self.cloud_service))
+        
+    def _replace_gateway(self, gateway):
+        # Tokens already spent still count against the new gateway
+        gateway.rate_limiter = self.server_gateway.rate_limiter
+        gateway.uplink_bandwidth = self.server_gateway.uplink_bandwidth
+        gateway.bytes_per_element = self.server_gateway.bytes_per_element
+        for device in self.server_gateway.connected_edge_devices:
+            gateway.register_edge_device(device)
+        self.server_gateway = gateway
+        self.vertical_balancer.server_gateway = gateway
+    
+    def enable_pipeline_execution(self, **settings):
+        """Stream concurrent edge tasks through the loaded model's per-device layer stages."""
+        from execution.pipeline_executor import PipelineExecutor
+        
+        model = self.root_device.model
+        self.pipeline_executor = PipelineExecutor(
+            model,
+            self.horizontal_balancer.get_connected_devices(),
+            self.horizontal_balancer.distribute_layers(model),
+            **settings
+        )
+        return self.pipeline_executor
+        
+    def disable_pipeline_execution(self):
+        self.pipeline_executor = None
+        
+    def enable_edge_scheduling(self, **settings):
+        """Place concurrent edge tasks across all edge devices instead of the root alone."""
+        self.edge_scheduling = settings
+        
+    def disable_edge_scheduling(self):
+        self.edge_scheduling = None
+        
+    def enable_health_tracking(self, **settings):
+        """Track device latency and liveness; exclude failed devices and derate slow ones."""
+        from monitoring.health_tracker import DeviceHealthTracker
+        
+        self.horizontal_balancer.health_tracker = DeviceHealthTracker(**settings)
+        self.horizontal_balancer.invalidate_plans()
+        return self.horizontal_balancer.health_tracker
+        
+    def disable_health_tracking(self):
+        self.horizontal_balancer.health_tracker = None
+        self.horizontal_balancer.invalidate_plans()
+        
+    def enable_admission_control(self, **settings):
+        """Shed or reroute tasks predicted to miss their deadline before they run."""
+        from load_balancers.admission_controller import AdmissionController
+        
+        settings.setdefault("edge_capacity", self.root_device.num_cores)
+        self.admission_controller = AdmissionController(self.vertical_balancer.predictor, **settings)
+        return self.admission_controller
+        
+    def disable_admission_control(self):
+        self.admission_controller = None
+        
+    def enable_hedging(self, **settings):
+        """Hedge slow cloud requests to the edge and retry or re-route failed ones."""
+        from load_balancers.hedging_policy import HedgingPolicy
+        
+        self.hedging = HedgingPolicy(**settings)
+        return self.hedging
+        
+    def disable_hedging(self):
+        self.hedging = None
+        
+    def enable_result_cache(self, max_entries=1024, ttl=60.0):
+        """Answer repeated (input, model) pairs from a cache on the root device."""
+        self.result_cache = ResultCache(max_entries, ttl)
+        return self.result_cache
+        
+    def disable_result_cache(self):
+        self.result_cache = None
+        
+    def _cache_key(self, task):
+        model_name = task.model_name
+        if model_name is None and self.root_device.model:
+            model_name = self.root_device.model.name
+        return ResultCache.make_key(task.input_data, model_name)
+        
+    def _serve_from_cache(self, task):
+        """Complete the task from the result cache; returns None on a miss."""
+        if self.result_cache is None:
+            return None
+            
+        start_time = get_current_time()
+        result = self.result_cache.get(self._cache_key(task))
+        self.system_monitor.record_cache_lookup(result is not None)
+        if result is None:
+            return None
+            
+        # No decision, CPU sample or device time: only the bookkeeping
+        end_time = get_current_time()
+        task.update_execution_results(result, end_time - start_time, "cache")
+        self.system_monitor.record_execution(
+            task.task_id,
+            end_time - start_time,
+            "cache",
+            task.has_missed_deadline(end_time),
+            slack=task.get_remaining_time(end_time)
+        )
+        return result
+    
+    def estimate_execution_time(self, task):
+        # Sensitive tasks can only run at the edge; others will likely be offloaded
+        if task.is_sensitive:
+            return config.TASK_QUEUE["edge_estimate"]
+        return config.TASK_QUEUE["cloud_estimate"]
+        
+    def create_task(self, input_data=None, deadline=None, is_sensitive=False, model_name=None):
        
-        task_id = f"task_{len(self.task_queue) + 1}"
+        self.tasks_created += 1
         
         # Generate random data if none provided
         if input_data is None:
@@ -47,12 +219,15 @@ class LoadBalancingSystem:
         if deadline is None:
             deadline = random.uniform(0.5, 10)
             
-        task = Task(task_id, input_data, deadline, is_sensitive)
+        return self._enqueue_task(input_data, deadline, is_sensitive, model_name)
+        
+    def _enqueue_task(self, input_data, deadline, is_sensitive, model_name, creation_time=None):
+        """Create a task as given (deadline None means none) and queue it."""
+        task = Task(f"task_{self.tasks_created}", input_data, deadline, is_sensitive, model_name, creation_time)
         self.task_queue.append(task)
         return task
         
-    def process_task(self, task, balancing_condition="cpu"):
-       
+    def _begin_task(self, task, balancing_condition):
         # Record CPU before task
         self.root_device.update_cpu_usage()
         self.system_monitor.record_cpu_usage(
@@ -63,7 +238,45 @@ class LoadBalancingSystem:
         )
         
         # Make vertical load balancing decision
-        decision = self.vertical_balancer.make_decision(task, balancing_condition)
+        with tracing.span("decision", "balancer", condition=balancing_condition) as decision_span:
+            decision = self.vertical_balancer.make_decision(task, balancing_condition)
+            decision_span.set(decision=decision)
+        if decision == "skip":
+            return decision
+        return self._admit(task, decision)
+        
+    def _admit(self, task, decision):
+        """Apply admission control; a shed task comes back as "skip"."""
+        controller = self.admission_controller
+        if controller is None:
+            return decision
+            
+        target, reason = controller.admit(task, decision, get_current_time())
+        if target is None:
+            self.system_monitor.record_admission("shed", reason)
+            self.vertical_balancer.record_override(decision, "skip")
+            task.update_execution_results(None, None, "shed")
+            return "skip"
+        if target != decision:
+            self.system_monitor.record_admission("downgraded", reason)
+            self.vertical_balancer.record_override(decision, target)
+        controller.start(target)
+        return target
+        
+    def process_task(self, task, balancing_condition="cpu"):
+        
+        with tracing.track(task.task_id), tracing.span("task", "task") as task_span:
+            result = self._process_task(task, balancing_condition)
+            task_span.set(source=task.source)
+        return result
+        
+    def _process_task(self, task, balancing_condition):
+       
+        cached = self._serve_from_cache(task)
+        if cached is not None:
+            return cached
+            
+        decision = self._begin_task(task, balancing_condition)
         
         # Skip task if it's already missed deadline
         if decision == "skip":
@@ -72,25 +285,254 @@ class LoadBalancingSystem:
         start_time = get_current_time()
         
         if decision == "edge":
-            # If edge processing, decide on horizontal distribution
-            if self.root_device.model:
-                # Find computationally intensive layers that can be divided
-                divisible_layers = [
-                    (i, layer) for i, layer in enumerate(self.root_device.model.layers)
-                    if layer.is_divisible and layer.is_computationally_intensive()
-                ]
-                
-                # For now, simulate edge processing
-                # In a full implementation, we would distribute layers across devices
-                time.sleep(0.2)  # Simulate edge processing time
-            
-            result = self.root_device.execute_task(task)
+            result = self._execute_edge(task)
             source = "edge"
+        elif decision == "split":
+            # Leading layers on the root, the rest in the cloud
+            plan = task.split_plan
+            self.root_device.execute_task(task, range(plan["split"]), processing_time=plan["edge"])
+            result = self.server_gateway.send_split_to_cloud(task, self.root_device, plan)
+            source = "split"
+        elif self.hedging is not None:
+            result, source = self._retry_cloud(task)
         else:  # decision == "cloud"
             # Offload to cloud via server gateway
             result = self.server_gateway.send_to_cloud(task, self.root_device)
             source = "cloud"
             
+        if self._rate_limited(result):
+            decision = self._reroute_to_edge(decision)
+            result = self._execute_edge(task)
+            source = "edge"
+            
+        self._finish_task(task, result, source, start_time, balancing_condition, target=decision)
+        return result
+        
+    def _execute_edge(self, task):
+        with tracing.span("edge_execution", "edge"):
+            return self._run_on_edge(task)
+        
+    def _run_on_edge(self, task):
+        # If edge processing, decide on horizontal distribution
+        if self.root_device.model:
+            if self.shard_executor is not None:
+                # Shard the divisible layers across workers standing in for devices
+                self.shard_executor.run(self.horizontal_balancer)
+            else:
+                with self.root_device.load.busy():
+                    sleep(0.2)  # Simulate edge processing time
+        
+        return self.root_device.execute_task(task)
+        
+    def _retry_cloud(self, task):
+        """
+        Send a task to the cloud, retrying errors with backoff and falling
+        back to the edge when retries run out. A blocking call cannot be
+        raced, so slow responses are only hedged on the async path.
+        
+        Returns:
+            tuple: (result, source)
+        """
+        attempt = 0
+        while True:
+            sent = get_current_time()
+            result = self.server_gateway.send_to_cloud(task, self.root_device)
+            if "error" not in result:
+                self.hedging.observe(get_current_time() - sent)
+                return result, "cloud"
+            delay = self.hedging.retry_delay(task, attempt, result["error"])
+            if delay is None:
+                self.system_monitor.record_hedge("fallback")
+                return self._execute_edge(task), "edge"
+            self.system_monitor.record_hedge("retried")
+            attempt += 1
+            with tracing.span("retry_backoff", "gateway", attempt=attempt):
+                sleep(delay)
+        
+    async def process_task_async(self, task, balancing_condition, edge_slots, cloud_slots, root_slots=None):
+        
+        with tracing.track(task.task_id), tracing.span("task", "task") as task_span:
+            result = await self._process_task_async(task, balancing_condition, edge_slots, cloud_slots,
+                                                    root_slots or edge_slots)
+            task_span.set(source=task.source)
+        return result
+        
+    async def _process_task_async(self, task, balancing_condition, edge_slots, cloud_slots, root_slots):
+        
+        cached = self._serve_from_cache(task)
+        if cached is not None:
+            return cached
+            
+        decision = self._begin_task(task, balancing_condition)
+        
+        if decision == "skip":
+            return None
+            
+        decided_at = get_current_time()
+        if decision == "edge":
+            result, start_time = await self._execute_edge_async(task, edge_slots)
+            source = "edge"
+        elif decision == "split":
+            plan = task.split_plan
+            start_time = get_current_time()
+            # The activation starts on the root, so its layers run there
+            async with root_slots:
+                if tracing.enabled:
+                    tracing.record_span("edge_wait", "edge", start_time, get_current_time())
+                await self.root_device.execute_task_async(task, range(plan["split"]), plan["edge"])
+            waiting = get_current_time() if tracing.enabled else None
+            async with cloud_slots:
+                if waiting is not None:
+                    tracing.record_span("gateway_wait", "gateway", waiting, get_current_time())
+                result = await self.server_gateway.send_split_to_cloud_async(task, self.root_device, plan)
+            source = "split"
+        elif self.hedging is not None:
+            result, source, start_time = await self._hedged_cloud_async(task, edge_slots, cloud_slots)
+        else:
+            async with cloud_slots:
+                start_time = get_current_time()
+                if tracing.enabled:
+                    tracing.record_span("gateway_wait", "gateway", decided_at, start_time)
+                result = await self.server_gateway.send_to_cloud_async(task, self.root_device)
+            source = "cloud"
+            
+        if self._rate_limited(result):
+            decision = self._reroute_to_edge(decision)
+            result, start_time = await self._execute_edge_async(task, edge_slots)
+            source = "edge"
+            
+        self._finish_task(task, result, source, start_time, balancing_condition, decided_at, decision)
+        return result
+        
+    async def _execute_edge_async(self, task, edge_slots):
+        """
+        Returns:
+            tuple: (result, time the task started running on a device)
+        """
+        with tracing.span("edge_execution", "edge"):
+            return await self._run_on_edge_async(task, edge_slots)
+        
+    async def _run_on_edge_async(self, task, edge_slots):
+        if self.pipeline_executor is not None:
+            result = await self.pipeline_executor.run_task(task)
+            return result, get_current_time() - result["execution_time"]
+        if self.edge_scheduler is not None:
+            result = await self.edge_scheduler.run(task)
+            # Time on the device, excluding the wait in its queue
+            return result, get_current_time() - result["execution_time"]
+        waiting = get_current_time() if tracing.enabled else None
+        async with edge_slots:
+            start_time = get_current_time()
+            if waiting is not None:
+                tracing.record_span("edge_wait", "edge", waiting, start_time)
+            if self.root_device.model:
+                with self.root_device.load.busy():
+                    await asyncio.sleep(0.2)  # Simulate edge processing time
+            result = await self.root_device.execute_task_async(task)
+        return result, start_time
+        
+    async def _hedged_cloud_async(self, task, edge_slots, cloud_slots):
+        """
+        Send a task to the cloud under the hedging policy.
+        
+        A response slower than the budget races an edge copy and the first
+        good result wins; the loser is cancelled. Errors are retried with
+        backoff while there is time, then the task falls back to the edge.
+        A cloud slot is held only while a request is in flight, never
+        during backoff or edge work.
+        
+        Returns:
+            tuple: (result, source, time the first request was sent)
+        """
+        attempt = 0
+        start_time = None
+        while True:
+            issued = get_current_time()
+            sent = []
+            cloud = asyncio.ensure_future(self._cloud_attempt_async(task, cloud_slots, sent))
+            done, _ = await asyncio.wait({cloud}, timeout=self.hedging.budget(task, issued))
+            if start_time is None:
+                start_time = sent[0] if sent else get_current_time()
+            if not done:
+                result, source = await self._race_edge(task, cloud, sent, edge_slots)
+                return result, source, start_time
+                
+            result = cloud.result()
+            if "error" not in result:
+                self.hedging.observe(get_current_time() - sent[0])
+                return result, "cloud", start_time
+            delay = self.hedging.retry_delay(task, attempt, result["error"])
+            if delay is None:
+                self.system_monitor.record_hedge("fallback")
+                result, _ = await self._execute_edge_async(task, edge_slots)
+                return result, "edge", start_time
+            self.system_monitor.record_hedge("retried")
+            attempt += 1
+            with tracing.span("retry_backoff", "gateway", attempt=attempt):
+                await asyncio.sleep(delay)
+                
+    async def _cloud_attempt_async(self, task, cloud_slots, sent):
+        """One cloud request; appends its send time to ``sent`` once it has a slot."""
+        waiting = get_current_time() if tracing.enabled else None
+        async with cloud_slots:
+            sent.append(get_current_time())
+            if waiting is not None:
+                tracing.record_span("gateway_wait", "gateway", waiting, sent[0])
+            return await self.server_gateway.send_to_cloud_async(task, self.root_device)
+            
+    async def _race_edge(self, task, cloud, sent, edge_slots):
+        self.system_monitor.record_hedge("hedged")
+        # The copy overlaps the cloud request, so it gets a track of its own
+        with tracing.track(f"{task.task_id} hedge"):
+            edge = asyncio.ensure_future(self._execute_edge_async(task, edge_slots))
+        done, _ = await asyncio.wait({cloud, edge}, return_when=asyncio.FIRST_COMPLETED)
+        
+        if cloud in done and "error" not in cloud.result():
+            edge.cancel()
+            self.hedging.observe(get_current_time() - sent[0])
+            self.system_monitor.record_hedge("cloud_won")
+            return cloud.result(), "cloud"
+        if cloud not in done:
+            cloud.cancel()
+            # Censored: the round trip took at least this long (a request
+            # still waiting for a slot says nothing about the cloud)
+            if sent:
+                self.hedging.observe(get_current_time() - sent[0])
+        result, _ = await edge
+        self.system_monitor.record_hedge("edge_won")
+        return result, "edge"
+        
+    @staticmethod
+    def _rate_limited(result):
+        return result is not None and result.get("error") == "Rate limit exceeded"
+        
+    def _reroute_to_edge(self, decision):
+        """
+        Move a task the gateway turned away for rate limiting to the edge.
+        
+        The balancer only checks the limit when it decides, and tokens can run
+        out before the request is sent, so the task runs at the edge instead
+        of failing.
+        
+        Returns:
+            str: The new target, "edge"
+        """
+        self.vertical_balancer.record_rate_limited(decision)
+        if self.admission_controller is not None:
+            self.admission_controller.finish(decision)
+            self.admission_controller.start("edge")
+        return "edge"
+        
+    def _finish_task(self, task, result, source, start_time, balancing_condition=None, decided_at=None,
+                     target=None):
+        """
+        Record a finished task.
+        
+        Args:
+            source (str): Where the result came from
+            target (str): Where admission control counted the task in flight
+                (defaults to source; differs when a cloud task fell back to the edge)
+        """
         end_time = get_current_time()
         execution_time = end_time - start_time
         
@@ -107,30 +549,239 @@ class LoadBalancingSystem:
         )
         
         # Record execution metrics
+        failed = result is None or "error" in result
         deadline_missed = task.has_missed_deadline(end_time)
         self.system_monitor.record_execution(
             task.task_id,
             execution_time,
             source,
-            deadline_missed
+            deadline_missed,
+            decision_mode=balancing_condition or self.vertical_balancer.decision_mode,
+            slack=task.get_remaining_time(end_time),
+            failed=failed
         )
         
-        return result
+        target = target or source
+        if self.admission_controller is not None:
+            # A fallback's time says nothing about the target's service time
+            self.admission_controller.finish(target, execution_time if target == source else None)
+        
+        # Latency seen by the decision includes any wait for an execution slot
+        latency = end_time - (decided_at if decided_at is not None else start_time)
+        self.vertical_balancer.record_decision_quality(task, target, latency, deadline_missed, failed)
         
-    def process_queue(self, balancing_condition="cpu"):
+        # Only successful results are worth answering repeats with
+        if self.result_cache is not None and not failed:
+            self.result_cache.put(self._cache_key(task), result)
+        
+    def process_queue(self, balancing_condition="cpu", queue_policy=None):
        
+        if queue_policy is not None:
+            self.task_queue.set_policy(queue_policy)
+            
         results = []
         while self.task_queue:
-            task = self.task_queue.pop(0)
+            expired = []
+            task = self.task_queue.pop(get_current_time(), expired)
+            
+            # Tasks that expired while queued are skipped without a decision
+            if expired:
+                self.vertical_balancer.record_skip(len(expired))
+                results.extend([None] * len(expired))
+            if task is None:
+                break
+                
+            if tracing.enabled:
+                tracing.record_span("queue_wait", "queue", task.creation_time, get_current_time(), task.task_id)
             result = self.process_task(task, balancing_condition)
             results.append(result)
         return results
         
-    def run_experiment(self, num_tasks=100, balancing_condition="cpu"):
+    async def process_queue_async(self, balancing_condition="cpu", queue_policy=None, max_cloud_inflight=None):
+        """
+        Drain the queue concurrently so cloud round trips overlap with edge work.
+        
+        Args:
+            balancing_condition (str): Vertical balancing method
+            queue_policy (str): Optional queue ordering policy override
+            max_cloud_inflight (int): Concurrent cloud requests allowed
+            
+        Returns:
+            list: Results in dispatch order (None for skipped tasks)
+        """
+        if queue_policy is not None:
+            self.task_queue.set_policy(queue_policy)
+        if max_cloud_inflight is None:
+            max_cloud_inflight = config.DISPATCHER["max_cloud_inflight"]
+            
+        # One edge slot per root core (or per core of every edge device when
+        # the edge scheduler places tasks), N in-flight cloud round trips; a
+        # batching gateway carries up to max_batch_size tasks per round trip
+        edge_tasks = self.root_device.num_cores
+        if self.pipeline_executor is not None:
+            # Every stage can hold one task in service plus a full inbox
+            edge_tasks = len(self.pipeline_executor.devices) * (1 + self.pipeline_executor.queue_size)
+        elif self.edge_scheduling is not None:
+            from load_balancers.edge_scheduler import EdgeTaskScheduler
+            
+            self.edge_scheduler = EdgeTaskScheduler(
+                self.horizontal_balancer.get_connected_devices(),
+                health_tracker=self.horizontal_balancer.health_tracker,
+                **self.edge_scheduling
+            )
+            edge_tasks = self.edge_scheduler.capacity()
+        cloud_tasks = max_cloud_inflight * getattr(self.server_gateway, "max_batch_size", 1)
+        edge_slots = asyncio.Semaphore(edge_tasks)
+        cloud_slots = asyncio.Semaphore(cloud_tasks)
+        # Split layers run on the root alone, whatever the edge slots span
+        root_slots = edge_slots
+        if edge_tasks != self.root_device.num_cores:
+            root_slots = asyncio.Semaphore(self.root_device.num_cores)
+        if self.admission_controller is not None:
+            self.admission_controller.set_capacity(edge_tasks, cloud_tasks)
+        
+        # Bound tasks in flight so each decision sees current load
+        dispatch_slots = asyncio.Semaphore(edge_tasks + cloud_tasks)
+        
+        def release_dispatch_slot(_):
+            dispatch_slots.release()
+        
+        pending = []
+        while self.task_queue:
+            await dispatch_slots.acquire()
+            
+            expired = []
+            task = self.task_queue.pop(get_current_time(), expired)
+            if expired:
+                self.vertical_balancer.record_skip(len(expired))
+                pending.extend([None] * len(expired))
+            if task is None:
+                dispatch_slots.release()
+                break
+                
+            if tracing.enabled:
+                tracing.record_span("queue_wait", "queue", task.creation_time, get_current_time(), task.task_id)
+            future = asyncio.ensure_future(
+                self.process_task_async(task, balancing_condition, edge_slots, cloud_slots, root_slots)
+            )
+            future.add_done_callback(release_dispatch_slot)
+            pending.append(future)
+            
+        try:
+            return [(await item) if item is not None else None for item in pending]
+        finally:
+            if self.pipeline_executor is not None:
+                await self.pipeline_executor.close()
+            if self.edge_scheduler is not None:
+                self.edge_scheduler_stats = self.edge_scheduler.get_statistics()
+                await self.edge_scheduler.close()
+                self.edge_scheduler = None
+        
+    def replay_trace(self, records, balancing_condition="cpu", models=None):
+        """
+        Feed recorded requests into the system at their arrival times.
+        
+        Records are consumed lazily and only the current backlog is held in
+        memory. While the next request has not arrived yet, queued tasks are
+        processed; a task's deadline counts from its recorded arrival.
+        
+        Args:
+            records: Iterable of records as produced by utils.trace.read_trace
+            balancing_condition (str): Vertical balancing method
+            models (dict): Model name -> MLModel for per-request models
+            
+        Yields:
+            dict: Outcome of each task, in completion order
+        """
+        # Trace records name models in any case
+        models = {name.lower(): model for name, model in (models or {}).items()}
+        trace_start = get_current_time()
+        
+        for record in records:
+            arrival = trace_start + record["arrival"]
+            
+            # Work through the backlog until the next request is due
+            while self.task_queue and get_current_time() < arrival:
+                yield from self._replay_next(balancing_condition, models)
+            
+            now = get_current_time()
+            if now < arrival:
+                sleep(arrival - now)
+                
+            if record["input_size"]:
+                input_data = generate_random_image_data(size=record["input_size"])
+            else:
+                input_data = generate_random_image_data()
+            deadline = record["deadline"]
+            # Built at its arrival and with no deadline when the record has
+            # none, before the queue computes its ordering key
+            self.tasks_created += 1
+            self._enqueue_task(
+                input_data,
+                float(deadline) if deadline is not None else None,
+                record["is_sensitive"],
+                record["model"],
+                creation_time=arrival
+            )
+            
+        while self.task_queue:
+            yield from self._replay_next(balancing_condition, models)
+            
+    def _replay_next(self, balancing_condition, models):
+        expired = []
+        task = self.task_queue.pop(get_current_time(), expired)
+        for expired_task in expired:
+            self.vertical_balancer.record_skip()
+            yield self._task_outcome(expired_task, "expired", None)
+        if task is None:
+            return
+            
+        start_time = get_current_time()
+        if tracing.enabled:
+            tracing.record_span("queue_wait", "queue", task.creation_time, start_time, task.task_id)
+        
+        # A task naming another model runs with it; the loaded model is
+        # restored so tasks naming none keep using it
+        model = models.get(task.model_name.lower()) if task.model_name else None
+        loaded = self.root_device.model
+        if model is not None:
+            self.root_device.model = model
+        try:
+            result = self.process_task(task, balancing_condition)
+        finally:
+            self.root_device.model = loaded
+        
+        if result is None:
+            status = "shed" if task.source == "shed" else "skipped"
+        elif "error" in result:
+            status = "failed"
+        else:
+            status = "completed"
+        yield self._task_outcome(task, status, start_time)
+        
+    def _task_outcome(self, task, status, start_time):
+        finish_time = get_current_time()
+        return {
+            "task_id": task.task_id,
+            "status": status,
+            "source": task.source,
+            "arrival": task.creation_time,
+            "start": start_time,
+            "finish": finish_time,
+            "queue_wait": start_time - task.creation_time if start_time is not None else None,
+            "execution_time": task.execution_time,
+            "deadline_missed": task.has_missed_deadline(finish_time)
+        }
+        
+    def run_experiment(self, num_tasks=100, balancing_condition="cpu", concurrent=False):
        
         # Clear previous data
-        self.task_queue = []
+        self.task_queue.clear()
         self.system_monitor = SystemMonitor()
+        self.vertical_balancer.reset()
+        self.edge_scheduler_stats = None
+        if self.admission_controller is not None:
+            self.admission_controller.reset()
         
         # Generate random tasks
         for i in range(num_tasks):
@@ -143,13 +794,20 @@ class LoadBalancingSystem:
             self.create_task(deadline=deadline, is_sensitive=is_sensitive)
             
         # Process all tasks
-        self.process_queue(balancing_condition)
+        if concurrent:
+            run_coroutine(self.process_queue_async(balancing_condition))
+        else:
+            self.process_queue(balancing_condition)
         
         # Return experiment results
         return {
             'balancing_condition': balancing_condition,
             'num_tasks': num_tasks,
             'vertical_balancer_stats': self.vertical_balancer.get_statistics(),
+            'rate_limited_redirects': self.vertical_balancer.rate_limited_redirects,
+            'decision_quality': self.vertical_balancer.get_decision_quality_metrics(),
+            'latency_predictor': self.vertical_balancer.predictor.get_statistics(),
+            'edge_scheduler': self.edge_scheduler_stats,
             'system_stats': self.system_monitor.get_statistics()
         }
     
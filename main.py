@@ -1,9 +1,21 @@
 
 import argparse
+import asyncio
+import os
+import random
 import time
 import json
+from concurrent.futures import ProcessPoolExecutor
 from load_balancing_system import LoadBalancingSystem
-from utils.helpers import save_results, create_alexnet_model, create_vgg11_model
+from monitoring.system_monitor import SystemMonitor
+from monitoring.tracing import Tracer, enable_tracing, disable_tracing
+from utils.helpers import save_results, create_alexnet_model, create_vgg11_model, get_current_time, run_coroutine
+from utils.simulation import Simulation
+from utils.trace import read_trace
+from utils.rate_limiter import TokenBucket
+from load_balancers.latency_predictor import LatencyPredictor
+from load_balancers.model_partitioner import ModelPartitioner
+from load_balancers.split_planner import SplitPointPlanner
 import config
 
 def setup_system():
@@ -26,6 +38,22 @@ def setup_system():
         "task_count": 0.1
     })
     system.vertical_balancer.cloud_threshold = config.VERTICAL_BALANCER.get("cloud_threshold", 60)
+    system.vertical_balancer.respect_rate_limit = config.VERTICAL_BALANCER.get("respect_rate_limit", True)
+    system.vertical_balancer.predictor = LatencyPredictor(**config.VERTICAL_BALANCER["predictor"])
+    system.vertical_balancer.split_planner = SplitPointPlanner(
+        macs_per_ghz_second=config.PARTITIONER["macs_per_ghz_second"],
+        bytes_per_element=config.PARTITIONER["bytes_per_element"]
+    )
+    
+    # Configure horizontal load balancer plan cache
+    system.horizontal_balancer.plan_cache_size = config.HORIZONTAL_BALANCER["plan_cache_size"]
+    system.horizontal_balancer.load_delta = config.HORIZONTAL_BALANCER["load_delta"]
+    system.horizontal_balancer.partitioner = ModelPartitioner(
+        links=config.PARTITIONER["links"],
+        default_link=config.PARTITIONER["default_link"],
+        macs_per_ghz_second=config.PARTITIONER["macs_per_ghz_second"],
+        bytes_per_element=config.PARTITIONER["bytes_per_element"]
+    )
     
     # Add edge devices from config
     for device_config in config.EDGE_DEVICES:
@@ -35,6 +63,12 @@ def setup_system():
             device_config["num_cores"]
         )
     
+    # Per-device utilization from assigned work, or the host CPU sampler
+    system.configure_load_model(
+        config.MONITORING["cpu_source"],
+        config.MONITORING["load_half_life"]
+    )
+    
     # Configure cloud service
     system.cloud_service.latency_range = (
         config.CLOUD["min_latency"],
@@ -42,6 +76,71 @@ def setup_system():
     )
     system.cloud_service.success_rate = config.CLOUD["success_rate"]
     
+    # Token-bucket limit on cloud requests
+    system.server_gateway.rate_limiter = TokenBucket(
+        config.GATEWAY["rate_limit"],
+        config.GATEWAY["rate_burst"]
+    )
+    system.server_gateway.uplink_bandwidth = config.GATEWAY["uplink_bandwidth"]
+    system.server_gateway.bytes_per_element = config.PARTITIONER["bytes_per_element"]
+    
+    # Batch concurrent cloud requests through the gateway
+    if config.GATEWAY["batching"]:
+        system.enable_gateway_batching(
+            config.GATEWAY["max_batch_size"],
+            config.GATEWAY["max_batch_wait"]
+        )
+    
+    # Cache results for repeated inputs on the root device
+    if config.RESULT_CACHE["enabled"]:
+        system.enable_result_cache(
+            config.RESULT_CACHE["max_entries"],
+            config.RESULT_CACHE["ttl"]
+        )
+    
+    # Shed or reroute tasks predicted to miss their deadline
+    if config.ADMISSION["enabled"]:
+        system.enable_admission_control(
+            cloud_capacity=config.DISPATCHER["max_cloud_inflight"],
+            shed_threshold=config.ADMISSION["shed_threshold"],
+            alpha=config.ADMISSION["alpha"],
+            edge_prior=config.ADMISSION["edge_prior"],
+            cloud_prior=config.ADMISSION["cloud_prior"]
+        )
+    
+    # Race slow cloud requests against the edge; retry or re-route failed ones
+    if config.HEDGING["enabled"]:
+        system.enable_hedging(
+            percentile=config.HEDGING["percentile"],
+            min_samples=config.HEDGING["min_samples"],
+            default_budget=config.HEDGING["default_budget"],
+            edge_estimate=config.HEDGING["edge_estimate"],
+            max_retries=config.HEDGING["max_retries"],
+            backoff_base=config.HEDGING["backoff_base"],
+            backoff_max=config.HEDGING["backoff_max"]
+        )
+    
+    # Exclude failed edge devices and derate stragglers
+    if config.HEALTH["enabled"]:
+        system.enable_health_tracking(
+            alpha=config.HEALTH["alpha"],
+            heartbeat_interval=config.HEALTH["heartbeat_interval"],
+            heartbeat_timeout=config.HEALTH["heartbeat_timeout"],
+            failure_threshold=config.HEALTH["failure_threshold"]
+        )
+    
+    # Spread concurrent edge tasks over every edge device
+    if config.EDGE_SCHEDULER["enabled"]:
+        system.enable_edge_scheduling(
+            policy=config.EDGE_SCHEDULER["policy"],
+            work_stealing=config.EDGE_SCHEDULER["work_stealing"],
+            base_time=config.EDGE_SCHEDULER["base_time"],
+            reference_speed=config.EDGE_SCHEDULER["reference_speed"]
+        )
+    
+    # Configure task queue ordering
+    system.task_queue.set_policy(config.TASK_QUEUE["policy"])
+    
     # Configure vertical load balancer
     system.vertical_balancer.cpu_threshold = config.VERTICAL_BALANCER["cpu_threshold"]
     system.vertical_balancer.deadline_threshold = config.VERTICAL_BALANCER["deadline_threshold"]
@@ -49,34 +148,52 @@ def setup_system():
     
     return system
 
-def run_experiments(model_name="alexnet"):
+def configure_pipeline(system):
+    """Enable pipelined edge execution for the loaded model if configured."""
+    if config.PIPELINE["enabled"]:
+        system.enable_pipeline_execution(
+            params_per_ghz_second=config.PIPELINE["params_per_ghz_second"],
+            queue_size=config.PIPELINE["queue_size"],
+            rebalance_interval=config.PIPELINE["rebalance_interval"]
+        )
+
+def create_model(model_name):
+    if model_name.lower() == "alexnet":
+        return create_alexnet_model()
+    elif model_name.lower() == "vgg11":
+        return create_vgg11_model()
+    raise ValueError(f"Unknown model: {model_name}")
+
+def run_experiments(model_name="alexnet", simulate=False, seed=None, concurrent=False):
+
+    # Run on a virtual clock so simulated latencies cost no wall time
+    if simulate:
+        with Simulation(seed=seed):
+            return run_experiments(model_name, simulate=False, concurrent=concurrent)
 
     # Set up system
     system = setup_system()
     
     # Load model based on name
-    if model_name.lower() == "alexnet":
-        model = create_alexnet_model()
-    elif model_name.lower() == "vgg11":
-        model = create_vgg11_model()
-    else:
-        raise ValueError(f"Unknown model: {model_name}")
-        
-    system.load_model(model)
+    system.load_model(create_model(model_name))
+    configure_pipeline(system)
     
     # Run experiments with different conditions
     results = {}
     for condition in config.EXPERIMENTS["conditions"]:
         print(f"Running experiment with {model_name} using {condition} condition...")
         start_time = time.time()
+        simulated_start = get_current_time()
         
         experiment_result = system.run_experiment(
             num_tasks=config.EXPERIMENTS["num_tasks"],
-            balancing_condition=condition
+            balancing_condition=condition,
+            concurrent=concurrent
         )
         
         end_time = time.time()
         experiment_result["duration"] = end_time - start_time
+        experiment_result["system_duration"] = get_current_time() - simulated_start
         
         results[condition] = experiment_result
         
@@ -99,6 +216,238 @@ def run_experiments(model_name="alexnet"):
     
     return combined_results
 
+def _run_grid_point(model_name, condition, seed, num_tasks, simulate):
+    """Run one experiment on an isolated system; executed in a worker process."""
+    def run():
+        random.seed(seed)
+        system = setup_system()
+        system.load_model(create_model(model_name))
+        configure_pipeline(system)
+        result = system.run_experiment(num_tasks=num_tasks, balancing_condition=condition)
+        return result, system.system_monitor
+        
+    start_time = time.time()
+    if simulate:
+        with Simulation(seed=seed):
+            result, monitor = run()
+    else:
+        result, monitor = run()
+    result.update({"model": model_name, "seed": seed, "duration": time.time() - start_time})
+    return result, monitor
+
+def run_experiments_parallel(models=("alexnet",), conditions=None, seeds=(0,), num_tasks=None,
+                             simulate=True, max_workers=None):
+    """
+    Fan the (model, condition, seed) grid out over a process pool.
+    
+    Every grid point builds its own system, so no decision counters or
+    monitor state leak between runs, and a simulated run is reproducible
+    from its seed. Per-run statistics are merged per (model, condition).
+    
+    Returns:
+        dict: Results document with individual runs and merged summaries
+    """
+    conditions = conditions or config.EXPERIMENTS["conditions"]
+    num_tasks = num_tasks or config.EXPERIMENTS["num_tasks"]
+    grid = [(model_name, condition, seed) for model_name in models
+            for condition in conditions for seed in seeds]
+    
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(_run_grid_point, model_name, condition, seed, num_tasks, simulate)
+            for model_name, condition, seed in grid
+        ]
+        outcomes = [future.result() for future in futures]
+        
+    runs = []
+    merged = {}
+    for result, monitor in outcomes:
+        runs.append(result)
+        key = (result["model"], result["balancing_condition"])
+        entry = merged.setdefault(key, {"monitor": SystemMonitor(), "decisions": {}, "seeds": []})
+        entry["monitor"].merge(monitor)
+        entry["seeds"].append(result["seed"])
+        for decision, stats in result["vertical_balancer_stats"].items():
+            count = stats["count"] if isinstance(stats, dict) else stats
+            entry["decisions"][decision] = entry["decisions"].get(decision, 0) + count
+            
+    summary = {}
+    for (model_name, condition), entry in merged.items():
+        summary.setdefault(model_name, {})[condition] = {
+            "seeds": entry["seeds"],
+            "decisions": entry["decisions"],
+            "system_stats": entry["monitor"].get_statistics()
+        }
+        
+    combined_results = {
+        "timestamp": time.time(),
+        "duration": time.time() - start_time,
+        "num_tasks": num_tasks,
+        "simulated": simulate,
+        "runs": runs,
+        "summary": summary
+    }
+    
+    if config.MONITORING["save_results"]:
+        save_results(combined_results, config.MONITORING["results_file"])
+        
+    return combined_results
+
+def run_replay(trace_path, model_name="alexnet", condition="weighted", output_path=None):
+    """
+    Replay a JSONL request trace and report per-task outcomes.
+    
+    Outcomes are streamed to output_path (JSONL) as tasks finish, so memory
+    stays constant in the trace length.
+    """
+    system = setup_system()
+    models = {"alexnet": create_alexnet_model(), "vgg11": create_vgg11_model()}
+    system.load_model(models[model_name.lower()])
+    
+    summary = {"total": 0, "missed_deadlines": 0}
+    output = open(output_path, 'w') if output_path else None
+    try:
+        for outcome in system.replay_trace(read_trace(trace_path), condition, models):
+            summary["total"] += 1
+            summary[outcome["status"]] = summary.get(outcome["status"], 0) + 1
+            if outcome["deadline_missed"]:
+                summary["missed_deadlines"] += 1
+            if output:
+                output.write(json.dumps(outcome) + "\n")
+    finally:
+        if output:
+            output.close()
+            
+    summary["system_stats"] = system.system_monitor.get_statistics()
+    
+    print(f"Replayed {summary['total']} requests from {trace_path} using {condition} condition")
+    for status in ("completed", "failed", "skipped", "expired"):
+        print(f"  - {status.capitalize()}: {summary.get(status, 0)}")
+    print(f"  - Missed deadlines: {summary['missed_deadlines']}")
+    return summary
+
+def benchmark_sharding(model_name="alexnet", repeats=5):
+    """Measure real sharded vs single-process execution of the linear layers."""
+    from execution.sharded_executor import ShardedLinearExecutor
+    
+    system = setup_system()
+    model = create_alexnet_model() if model_name.lower() == "alexnet" else create_vgg11_model()
+    system.load_model(model)
+    workers = len(system.horizontal_balancer.get_connected_devices())
+    
+    with ShardedLinearExecutor(model, max_workers=workers) as executor:
+        report = executor.measure(system.horizontal_balancer, repeats=repeats)
+        
+    print(f"Sharded execution of {model.name} linear layers across {workers} workers:")
+    for index, stats in report.items():
+        print(f"  Layer {index} ({stats['parameters']} params, {stats['shards']} shards): "
+              f"serial {stats['serial_time'] * 1000:.2f}ms, sharded {stats['sharded_time'] * 1000:.2f}ms, "
+              f"speedup {stats['speedup']:.2f}x, gather overhead {stats['gather_overhead'] * 1000:.2f}ms")
+    return report
+
+def benchmark_stragglers(model_name="alexnet", slowdown=8.0, runs=8):
+    """Measure sharded layers with one slowed edge device, with and without speculation."""
+    from execution.sharded_executor import ShardedLinearExecutor
+    
+    system = setup_system()
+    model = create_model(model_name)
+    system.load_model(model)
+    balancer = system.horizontal_balancer
+    devices = balancer.get_connected_devices()
+    straggler = max(devices, key=lambda device: device.get_computational_power())
+    straggler.slowdown = slowdown
+    
+    print(f"Sharded {model.name} with {straggler.device_id} slowed {slowdown:g}x, {runs} runs:")
+    report = {}
+    for label, factor in (("no speculation", 0), ("speculation", config.HEALTH["speculation_factor"])):
+        system.enable_health_tracking(
+            alpha=config.HEALTH["alpha"],
+            heartbeat_interval=config.HEALTH["heartbeat_interval"],
+            heartbeat_timeout=config.HEALTH["heartbeat_timeout"],
+            failure_threshold=config.HEALTH["failure_threshold"]
+        )
+        with ShardedLinearExecutor(model, max_workers=len(devices), speculation_factor=factor) as executor:
+            wall_times = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                executor.run(balancer)
+                wall_times.append(time.perf_counter() - start)
+        health = balancer.health_tracker.health_factor(straggler.device_id)
+        report[label] = {"first": wall_times[0], "last": wall_times[-1], "straggler_health": health}
+        print(f"  {label}: first run {wall_times[0] * 1000:.1f}ms, last run {wall_times[-1] * 1000:.1f}ms "
+              f"(straggler health {health:.2f})")
+    return report
+
+def benchmark_pipeline(model_name="alexnet", num_tasks=200):
+    """Compare whole-task, pipelined and rebalanced pipelined edge throughput."""
+    from execution.pipeline_executor import PipelineExecutor
+    
+    async def stream(executor, count):
+        start = get_current_time()
+        await asyncio.gather(*(executor.run_task(None) for _ in range(count)))
+        await executor.close()
+        return count / (get_current_time() - start)
+    
+    with Simulation(seed=0, cpu_range=(30, 30)):
+        system = setup_system()
+        model = create_model(model_name)
+        system.load_model(model)
+        devices = system.horizontal_balancer.get_connected_devices()
+        for device in devices:
+            device.update_cpu_usage()
+        executor = PipelineExecutor(
+            model, devices, system.horizontal_balancer.distribute_layers(model),
+            params_per_ghz_second=config.PIPELINE["params_per_ghz_second"],
+            queue_size=config.PIPELINE["queue_size"],
+            rebalance_interval=0
+        )
+        
+        def describe(label, throughput):
+            stage_times = {device.device_id: executor.stage_time(device, executor.stage_plan[device.device_id])
+                           for device in devices}
+            print(f"  {label}: {throughput:.2f} tasks/s "
+                  f"(stage sum {sum(stage_times.values()):.3f}s, slowest stage {max(stage_times.values()):.3f}s)")
+            for device_id, layers in executor.stage_plan.items():
+                print(f"    {device_id}: layers {layers} ({stage_times[device_id]:.3f}s)")
+        
+        # One task at a time holds every device for the sum of the stages
+        whole_task = 1 / sum(executor.stage_time(device, executor.stage_plan[device.device_id])
+                             for device in devices)
+        print(f"Pipelined execution of {model.name} over {len(devices)} devices, {num_tasks} tasks:")
+        print(f"  whole-task: {whole_task:.2f} tasks/s")
+        describe("pipelined", run_coroutine(stream(executor, num_tasks)))
+        executor.rebalance()
+        describe("rebalanced", run_coroutine(stream(executor, num_tasks)))
+    return executor.get_statistics()
+
+def benchmark_partition(model_names=("alexnet", "vgg11")):
+    """Compare the proportional split with the communication-aware partition."""
+    from load_balancers.model_partitioner import proportional_assignment
+    
+    results = {}
+    with Simulation(seed=0, cpu_range=(30, 30)):
+        system = setup_system()
+        balancer = system.horizontal_balancer
+        devices = balancer.get_connected_devices()
+        for device in devices:
+            device.update_cpu_usage()
+        for model_name in model_names:
+            model = create_model(model_name)
+            system.load_model(model)
+            proportional = balancer.partitioner.evaluate(model, devices, proportional_assignment(balancer, model))
+            plan = balancer.optimal_partition(model)
+            results[model.name] = {"proportional": proportional, "optimal": plan["makespan"]}
+            print(f"Partitioning {model.name} over {len(devices)} devices:")
+            print(f"  proportional split: {proportional * 1000:.1f}ms")
+            print(f"  optimal partition: {plan['makespan'] * 1000:.1f}ms "
+                  f"({proportional / plan['makespan']:.2f}x faster)")
+            for step in plan["steps"]:
+                placement = step.get("device") or ", ".join(
+                    f"{device_id}: {rows} rows" for device_id, rows in step["split"].items() if rows)
+                print(f"    layers {step['layers']}: {placement}")
+    return results
+
 def main():
     """Main entry point for the system."""
     parser = argparse.ArgumentParser(description="Online Horizontal & Vertical Edge ML Load Balancing System")
@@ -106,10 +455,80 @@ def main():
                         help="ML model to use for experiments")
     parser.add_argument("--tasks", type=int, default=config.EXPERIMENTS["num_tasks"],
                         help="Number of tasks to generate")
-    parser.add_argument("--condition", type=str, choices=["cpu", "deadline", "count", "all"],
+    parser.add_argument("--condition", type=str, choices=["cpu", "deadline", "count", "weighted", "predictive", "split", "all"],
                         default="all", help="Load balancing condition to test")
+    parser.add_argument("--simulate", action="store_true",
+                        help="Run on a virtual clock instead of sleeping in real time")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Random seed for reproducible simulated runs")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Dispatch tasks concurrently with the asyncio dispatcher")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run the model/condition/seed grid on a process pool")
+    parser.add_argument("--models", type=str, nargs="+", default=None, choices=["alexnet", "vgg11"],
+                        help="Models to include in a parallel run (defaults to --model)")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0],
+                        help="Seeds to include in a parallel run")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for a parallel run")
+    parser.add_argument("--replay", type=str, default=None,
+                        help="Replay a JSONL request trace instead of generating tasks")
+    parser.add_argument("--replay-output", type=str, default=None,
+                        help="Write per-task replay outcomes to this JSONL file")
+    parser.add_argument("--benchmark-sharding", action="store_true",
+                        help="Measure real sharded execution of the model's linear layers and exit")
+    parser.add_argument("--benchmark-stragglers", action="store_true",
+                        help="Measure sharded execution with a slowed edge device and exit")
+    parser.add_argument("--benchmark-pipeline", action="store_true",
+                        help="Compare whole-task and pipelined edge throughput in simulation and exit")
+    parser.add_argument("--benchmark-partition", action="store_true",
+                        help="Compare the proportional and communication-aware model partitions and exit")
+    parser.add_argument("--trace", type=str, default=None,
+                        help="Write per-task spans to this file as Chrome trace-event JSON")
     
     args = parser.parse_args()
+    if args.trace and args.parallel:
+        parser.error("--trace records spans in this process only and cannot follow --parallel")
+    
+    if not args.trace:
+        run_command(args)
+        return
+        
+    tracer = enable_tracing(Tracer(config.TRACING["max_events_per_thread"]))
+    try:
+        run_command(args)
+    finally:
+        disable_tracing()
+        spans = tracer.export(args.trace)
+        print(f"\nTrace: {spans} spans written to {args.trace}"
+              + (f" ({tracer.dropped} dropped)" if tracer.dropped else ""))
+
+def run_command(args):
+    """Run the benchmark, replay or experiments selected on the command line."""
+    if args.benchmark_sharding:
+        benchmark_sharding(args.model)
+        return
+        
+    if args.benchmark_stragglers:
+        benchmark_stragglers(args.model)
+        return
+        
+    if args.benchmark_pipeline:
+        benchmark_pipeline(args.model)
+        return
+        
+    if args.benchmark_partition:
+        benchmark_partition()
+        return
+        
+    if args.replay:
+        condition = args.condition if args.condition != "all" else config.VERTICAL_BALANCER["decision_mode"]
+        if args.simulate:
+            with Simulation(seed=args.seed):
+                run_replay(args.replay, args.model, condition, args.replay_output)
+        else:
+            run_replay(args.replay, args.model, condition, args.replay_output)
+        return
     
     # Update config based on arguments
     config.EXPERIMENTS["num_tasks"] = args.tasks
@@ -117,8 +536,26 @@ def main():
     if args.condition != "all":
         config.EXPERIMENTS["conditions"] = [args.condition]
     
+    if args.parallel:
+        results = run_experiments_parallel(
+            models=args.models or [args.model],
+            conditions=config.EXPERIMENTS["conditions"],
+            seeds=args.seeds,
+            num_tasks=args.tasks,
+            simulate=args.simulate,
+            max_workers=args.workers
+        )
+        print("\nParallel Experiment Summary:")
+        for model_name, conditions in results["summary"].items():
+            for condition, summary in conditions.items():
+                performance = summary["system_stats"]["deadline_performance"]
+                print(f"  {model_name} / {condition} over seeds {summary['seeds']}: "
+                      f"{performance['total_tasks']} tasks, miss rate {performance['miss_rate']:.2f}%")
+        return
+    
     # Run experiments
-    results = run_experiments(args.model)
+    results = run_experiments(args.model, simulate=args.simulate, seed=args.seed,
+                              concurrent=args.concurrent)
     
     # Print summary
     print("\nExperiment Summary:")
@@ -135,11 +572,23 @@ def main():
             # Rest of your printing code remains the same
             print(f"  Cloud tasks: {result['vertical_balancer_stats']['cloud']['count']}")
             print(f"  Edge tasks: {result['vertical_balancer_stats']['edge']['count']}")
+            print(f"  Split tasks: {result['vertical_balancer_stats']['split']['count']}")
             print(f"  Skipped tasks: {result['vertical_balancer_stats']['skip']['count']}")
             print(f"  Missed deadlines: {result['system_stats']['deadline_performance']['missed_deadlines']}")
-            print(f"  Miss rate: {result['system_stats']['deadline_performance']['miss_rate']:.2f}%")
+            performance = result['system_stats']['deadline_performance']
+            shed = result['system_stats']['admission']['shed']
+            print(f"  Miss rate: {performance['miss_rate']:.2f}%")
+            if shed:
+                # Shed tasks never ran, so they are not in the miss rate above
+                missed = performance['missed_deadlines'] + shed
+                print(f"  Miss rate counting shed tasks as missed: "
+                      f"{missed / (performance['total_tasks'] + shed) * 100:.2f}%")
             print(f"  Avg execution time (edge): {result['system_stats']['execution_time']['edge']:.4f}s")
             print(f"  Avg execution time (cloud): {result['system_stats']['execution_time']['cloud']:.4f}s")
+            print(f"  Result cache hits: {result['system_stats']['result_cache']['hits']}")
+            print(f"  Shed by admission control: {result['system_stats']['admission']['shed']}")
+            print(f"  Failed tasks: {result['system_stats']['failures']['total']}")
+            print(f"  Hedged cloud requests: {result['system_stats']['hedging'].get('hedged', 0)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,14 +1,20 @@
 from .edge_device import EdgeDevice
 from .cloud_service import CloudService
 from .server_gateway import ServerGateway
+from .batching_gateway import BatchingServerGateway
 from .ml_model import MLModel, Layer
 from .task import Task
+from .task_queue import TaskQueue
+from .result_cache import ResultCache
 
 __all__ = [
     'EdgeDevice',
     'CloudService', 
     'ServerGateway',
+    'BatchingServerGateway',
     'MLModel',
     'Layer',
-    'Task'
+    'Task',
+    'TaskQueue',
+    'ResultCache'
 ]
\ No newline at end of file
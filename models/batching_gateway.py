@@ -0,0 +1,118 @@
+import asyncio
+from models.server_gateway import ServerGateway
+from utils.helpers import get_current_time
+
+
+class BatchingServerGateway(ServerGateway):
+    """Server gateway that coalesces concurrent cloud requests into batches.
+
+    Tasks sent through send_to_cloud_async wait in a pending batch that is
+    flushed as one cloud round trip when it reaches max_batch_size, when the
+    oldest task has waited max_batch_wait, or earlier if the tightest
+    deadline in the batch would otherwise be missed.
+    """
+
+    def __init__(self, cloud_service, max_batch_size=8, max_batch_wait=0.05,
+                 rate_limit=10.0, rate_burst=5):
+        """
+        Args:
+            cloud_service: The cloud service to forward batches to
+            max_batch_size (int): Flush as soon as this many tasks are pending
+            max_batch_wait (float): Longest time a task waits for companions
+            rate_limit (float): Sustained cloud round trips per second
+            rate_burst (float): Round trips allowed back to back
+        """
+        super().__init__(cloud_service, rate_limit, rate_burst)
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.batches_sent = 0
+        self.tasks_batched = 0
+        self._pending = []
+        self._flush_at = None
+        self._flush_handle = None
+
+    def expected_round_trip(self, batch_size=1):
+        # Worst-case latency both ways plus batch compute
+        cloud = self.cloud_service
+        return (2 * cloud.latency_range[1] + cloud.processing_time
+                + cloud.batch_item_time * (batch_size - 1))
+
+    def would_exceed_rate_limit(self):
+        # Joining a batch that is still open costs no extra round trip
+        if 0 < len(self._pending) < self.max_batch_size:
+            return False
+        return super().would_exceed_rate_limit()
+
+    def _flush_deadline(self, task, arrival):
+        flush_at = arrival + self.max_batch_wait
+        remaining = task.get_remaining_time(arrival)
+        if remaining is not None:
+            # Leave enough time for the round trip of a full batch
+            flush_at = min(flush_at, arrival + remaining - self.expected_round_trip(self.max_batch_size))
+        return flush_at
+
+    async def send_to_cloud_async(self, task, source_device):
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        now = get_current_time()
+        self._pending.append((task, future, self.input_upload_time(source_device)))
+
+        flush_at = self._flush_deadline(task, now)
+        if len(self._pending) >= self.max_batch_size or flush_at <= now:
+            self._flush()
+        elif self._flush_at is None or flush_at < self._flush_at:
+            # A tighter deadline pulls the whole batch's flush forward
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            self._flush_at = flush_at
+            self._flush_handle = loop.call_later(flush_at - now, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        self._flush_handle = None
+        self._flush_at = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._send_batch(batch))
+
+    async def _send_batch(self, batch):
+        tasks = [task for task, _, _ in batch]
+        futures = [future for _, future, _ in batch]
+        # One round trip, but every task's input still crosses the uplink
+        upload_time = sum(upload for _, _, upload in batch)
+
+        # Rate limiting applies per round trip, not per task
+        if not self.rate_limiter.try_acquire():
+            results = [{"error": "Rate limit exceeded"}] * len(tasks)
+        elif not self.cloud_service.check_availability():
+            results = [{"error": "Cloud service unavailable"}] * len(tasks)
+        else:
+            self.batches_sent += 1
+            self.tasks_batched += len(tasks)
+            try:
+                results = await self.cloud_service.execute_batch_async(tasks, upload_time)
+            except Exception:
+                # Nothing awaits this coroutine, so an exception escaping it
+                # would leave every waiter hanging; fail the batch instead
+                results = None
+            if results is None:
+                results = [{"error": "Failed to execute task in cloud"}] * len(tasks)
+
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(dict(result))
+
+    def get_batch_statistics(self):
+        return {
+            "batches_sent": self.batches_sent,
+            "tasks_batched": self.tasks_batched,
+            "average_batch_size": self.tasks_batched / self.batches_sent if self.batches_sent else 0
+        }
+
+    def __repr__(self):
+        return (f"BatchingServerGateway(connected_devices={len(self.connected_edge_devices)}, "
+                f"max_batch_size={self.max_batch_size}, max_batch_wait={self.max_batch_wait}s)")
@@ -1,6 +1,8 @@
 
-import time
+import asyncio
 import random
+from monitoring import tracing
+from utils.helpers import get_current_time, sleep
 
 class CloudService:
     
@@ -12,11 +14,14 @@ class CloudService:
         self.available = True
         self.latency_range = latency_range
         self.success_rate = 0.95  # 95% chance of successful connection
+        self.processing_time = 0.05  # Cloud compute time per request
+        self.batch_item_time = 0.005  # Marginal compute time per extra batched task
     
-    def execute_task(self, task):
+    def execute_task(self, task, upload_time=0.0):
         """
         Args:
             task: The task to execute
+            upload_time (float): Seconds to upload the task's input
             
         Returns:
             dict: Results and performance metrics or None if connection fails
@@ -24,19 +29,22 @@ class CloudService:
         if not self.check_availability():
             return None
             
-        start_time = time.time()
+        start_time = get_current_time()
         
         # Simulate network latency
         network_latency = random.uniform(*self.latency_range)
-        time.sleep(network_latency)
+        sleep(network_latency + upload_time)
         
         # Simulate cloud processing (faster than edge)
-        time.sleep(0.05)
+        sleep(self.processing_time)
         
         # Simulate return network latency
-        time.sleep(network_latency)
+        sleep(network_latency)
         
-        end_time = time.time()
+        if tracing.enabled:
+            self._trace_phases(start_time, network_latency, self.processing_time, upload_time)
+        
+        end_time = get_current_time()
         execution_time = end_time - start_time
         
         return {
@@ -45,6 +53,143 @@ class CloudService:
             "network_latency": network_latency * 2  # Round trip
         }
     
+    async def execute_task_async(self, task, upload_time=0.0):
+        """Non-blocking variant of execute_task for the asyncio dispatcher."""
+        if not self.check_availability():
+            return None
+            
+        start_time = get_current_time()
+        
+        network_latency = random.uniform(*self.latency_range)
+        try:
+            await asyncio.sleep(network_latency + upload_time)
+            await asyncio.sleep(self.processing_time)
+            await asyncio.sleep(network_latency)
+        finally:
+            # Also reached when a hedged request is cancelled
+            if tracing.enabled:
+                self._trace_phases(start_time, network_latency, self.processing_time, upload_time)
+        
+        execution_time = get_current_time() - start_time
+        
+        return {
+            "result": {"status": "completed", "source": "cloud"},
+            "execution_time": execution_time,
+            "network_latency": network_latency * 2  # Round trip
+        }
+    
+    def execute_partial_task(self, task, upload_time, compute_fraction):
+        """
+        Finish a task the edge has partially executed.
+        
+        Args:
+            task: The task to execute
+            upload_time (float): Seconds to upload the intermediate activation
+            compute_fraction (float): Share of the model's compute left to the cloud
+            
+        Returns:
+            dict: Results and performance metrics or None if connection fails
+        """
+        if not self.check_availability():
+            return None
+            
+        start_time = get_current_time()
+        
+        network_latency = random.uniform(*self.latency_range)
+        sleep(network_latency + upload_time)
+        sleep(self.processing_time * compute_fraction)
+        sleep(network_latency)
+        
+        if tracing.enabled:
+            self._trace_phases(start_time, network_latency, self.processing_time * compute_fraction,
+                               upload_time)
+        
+        return self._partial_result(start_time, network_latency, upload_time)
+    
+    async def execute_partial_task_async(self, task, upload_time, compute_fraction):
+        """Non-blocking variant of execute_partial_task."""
+        if not self.check_availability():
+            return None
+            
+        start_time = get_current_time()
+        
+        network_latency = random.uniform(*self.latency_range)
+        try:
+            await asyncio.sleep(network_latency + upload_time)
+            await asyncio.sleep(self.processing_time * compute_fraction)
+            await asyncio.sleep(network_latency)
+        finally:
+            if tracing.enabled:
+                self._trace_phases(start_time, network_latency, self.processing_time * compute_fraction,
+                                   upload_time)
+        
+        return self._partial_result(start_time, network_latency, upload_time)
+    
+    def _partial_result(self, start_time, network_latency, upload_time):
+        return {
+            "result": {"status": "completed", "source": "split"},
+            "execution_time": get_current_time() - start_time,
+            "network_latency": network_latency * 2,
+            "upload_time": upload_time
+        }
+    
+    async def execute_batch_async(self, tasks, upload_time=0.0):
+        """
+        Execute several tasks in a single network round trip.
+        
+        Args:
+            tasks (list): Tasks to execute together
+            upload_time (float): Seconds to upload every task's input
+            
+        Returns:
+            list: Per-task results in input order, or None if connection fails
+        """
+        if not self.check_availability():
+            return None
+            
+        start_time = get_current_time()
+        
+        network_latency = random.uniform(*self.latency_range)
+        processing_time = self.processing_time + self.batch_item_time * (len(tasks) - 1)
+        try:
+            await asyncio.sleep(network_latency + upload_time)
+            await asyncio.sleep(processing_time)
+            await asyncio.sleep(network_latency)
+        finally:
+            if tracing.enabled:
+                self._trace_phases(start_time, network_latency, processing_time, upload_time,
+                                   batch_size=len(tasks))
+        
+        execution_time = get_current_time() - start_time
+        
+        return [
+            {
+                "result": {"status": "completed", "source": "cloud", "batch_size": len(tasks)},
+                "execution_time": execution_time,
+                "network_latency": network_latency * 2
+            }
+            for _ in tasks
+        ]
+    
+    @staticmethod
+    def _trace_phases(start_time, network_latency, processing_time, upload_time=0.0, **args):
+        """
+        Record a request's simulated uplink, compute and downlink as spans,
+        cut off at the current time if the request ended early.
+        """
+        now = get_current_time()
+        phases = (
+            ("uplink", "network", network_latency + upload_time),
+            ("cloud_compute", "cloud", processing_time),
+            ("downlink", "network", network_latency)
+        )
+        for name, category, seconds in phases:
+            if start_time >= now:
+                break
+            end = min(start_time + seconds, now)
+            tracing.record_span(name, category, start_time, end, **args)
+            start_time = end
+    
     def check_availability(self):
         # Simulate occasional cloud unavailability
         self.available = random.random() < self.success_rate
@@ -1,11 +1,27 @@
 
-import time
-import psutil  # For CPU usage monitoring
+import asyncio
+from monitoring.cpu_sampler import get_shared_sampler
+from monitoring.load_model import DeviceLoadModel
+from monitoring import tracing
+from utils.helpers import get_current_time, get_clock, sleep
 
 class EdgeDevice:
     
-    def __init__(self, device_id, cpu_speed, num_cores, is_root=False):
-       
+    def __init__(self, device_id, cpu_speed, num_cores, is_root=False, cpu_sampler=None,
+                 cpu_source="sampler", load_half_life=0.25):
+        """
+        Args:
+            device_id (str): Unique device identifier
+            cpu_speed (float): Clock speed in GHz
+            num_cores (int): Number of cores
+            is_root (bool): Whether this is the root device
+            cpu_sampler (CpuSampler): Host sampler for the "sampler" source
+            cpu_source (str): "model" derives utilization from the work assigned
+                to this device; "sampler" reads the host CPU
+            load_half_life (float): Decay half-life of the load model in seconds
+        """
+        if cpu_source not in ("model", "sampler"):
+            raise ValueError(f"Unknown CPU source: {cpu_source}")
         self.device_id = device_id
         self.cpu_speed = cpu_speed
         self.num_cores = num_cores
@@ -13,17 +29,44 @@ class EdgeDevice:
         self.current_cpu_usage = 0
         self.available_memory = 0
         self.connected_devices = []
+        self.topology_version = 0  # Bumped whenever connected_devices changes
         self.model = None
+        self.cpu_sampler = cpu_sampler  # Defaults to the shared host sampler
+        self.cpu_source = cpu_source
+        self.load = DeviceLoadModel(num_cores, load_half_life)
+        # Fault injection for simulated runs: an offline device neither
+        # answers heartbeats nor executes, a slowed one takes longer
+        self.online = True
+        self.slowdown = 1.0
     
     def get_computational_power(self):
         return self.cpu_speed * self.num_cores * (1 - self.current_cpu_usage/100)
     
     def update_cpu_usage(self):
-        self.current_cpu_usage = psutil.cpu_percent(interval=0.1)
+        started = get_current_time() if tracing.enabled else None
+        if self.cpu_source == "model":
+            self.current_cpu_usage = self.load.utilization()
+        else:
+            clock = get_clock()
+            if clock is not None and hasattr(clock, "sample_cpu_usage"):
+                # Simulated runs must not block on a real host sample
+                self.current_cpu_usage = clock.sample_cpu_usage(self)
+            else:
+                sampler = self.cpu_sampler or get_shared_sampler()
+                self.current_cpu_usage = sampler.current_cpu_usage
+        if started is not None:
+            tracing.record_span("cpu_sample", "device", started, get_current_time(),
+                                device=self.device_id, source=self.cpu_source)
         return self.current_cpu_usage
     
-    def execute_task(self, task, layer_indices=None):
-        start_time = time.time()
+    def heartbeat(self):
+        """Return True if the device answers a liveness probe."""
+        return self.online
+    
+    def execute_task(self, task, layer_indices=None, processing_time=0.1):
+        if not self.online:
+            raise ConnectionError(f"Edge device {self.device_id} is offline")
+        start_time = get_current_time()
         
         # Record CPU before execution
         cpu_before = self.update_cpu_usage()
@@ -32,12 +75,13 @@ class EdgeDevice:
         result = {"status": "completed", "device": self.device_id}
         
         # Simulate processing time
-        time.sleep(0.1)
+        with self.load.busy(), tracing.span("edge_compute", "device", device=self.device_id, task=task.task_id):
+            sleep(processing_time * self.slowdown)
         
         # Record CPU after execution
         cpu_after = self.update_cpu_usage()
         
-        end_time = time.time()
+        end_time = get_current_time()
         execution_time = end_time - start_time
         
         return {
@@ -47,10 +91,33 @@ class EdgeDevice:
             "cpu_after": cpu_after
         }
     
+    async def execute_task_async(self, task, layer_indices=None, processing_time=0.1):
+        if not self.online:
+            raise ConnectionError(f"Edge device {self.device_id} is offline")
+        start_time = get_current_time()
+        cpu_before = self.update_cpu_usage()
+        
+        result = {"status": "completed", "device": self.device_id}
+        
+        # Simulate processing time without blocking the event loop
+        with self.load.busy(), tracing.span("edge_compute", "device", device=self.device_id, task=task.task_id):
+            await asyncio.sleep(processing_time * self.slowdown)
+        
+        cpu_after = self.update_cpu_usage()
+        execution_time = get_current_time() - start_time
+        
+        return {
+            "result": result,
+            "execution_time": execution_time,
+            "cpu_before": cpu_before,
+            "cpu_after": cpu_after
+        }
+    
     def connect_to_device(self, device):
 
         if device not in self.connected_devices:
             self.connected_devices.append(device)
+            self.topology_version += 1
             return True
         return False
     
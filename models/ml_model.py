@@ -1,11 +1,25 @@
 
+import itertools
+
+# Source of MLModel.model_id; never reused within a process
+_model_ids = itertools.count()
+
+
 class Layer:
     
-    def __init__(self, layer_type, parameters, is_divisible=False):
+    def __init__(self, layer_type, parameters, is_divisible=False, in_features=None, out_features=None,
+                 macs=None, output_size=None):
     
         self.layer_type = layer_type
         self.parameters = parameters
         self.is_divisible = is_divisible
+        # Linear layer shape; each output row holds in_features weights + 1 bias
+        self.in_features = in_features
+        self.out_features = out_features
+        # Multiply-accumulates per sample (a linear layer does one per weight)
+        self.macs = macs if macs is not None else parameters
+        # Activation elements handed to the next layer
+        self.output_size = output_size if output_size is not None else out_features
         
     def is_computationally_intensive(self):
        
@@ -31,10 +45,12 @@ class Layer:
 
 class MLModel:
     
-    def __init__(self, name, layers=None):
+    def __init__(self, name, layers=None, input_size=None):
        
         self.name = name
+        self.model_id = next(_model_ids)  # Stable identity, unlike id() after the model is freed
         self.layers = layers or []
+        self.input_size = input_size  # Input activation elements per sample
         self.total_parameters = sum(layer.parameters for layer in self.layers) if layers else 0
         
     def add_layer(self, layer):
@@ -0,0 +1,73 @@
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from utils.helpers import get_current_time
+
+
+class ResultCache:
+    """Content-addressed cache of inference results with LRU eviction and a TTL.
+
+    Entries are keyed by a digest of the task's input data and the model
+    that produced the result, so repeated inputs are answered without
+    touching edge CPU or the cloud link. Results are copied on the way in
+    and out, so a caller mutating its result cannot change later hits.
+    """
+
+    def __init__(self, max_entries=1024, ttl=60.0):
+        """
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted
+            ttl (float): Seconds an entry stays valid after it is stored (None = forever)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, result)
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(input_data, model_name):
+        """
+        Args:
+            input_data: JSON-serializable task input
+            model_name (str): Name of the model the result belongs to
+
+        Returns:
+            bytes: Digest identifying the (input, model) pair, or None if the
+            input cannot be identified
+        """
+        if input_data is None:
+            return None
+        payload = json.dumps([model_name, input_data], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).digest()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl is not None and get_current_time() - stored_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def put(self, key, result):
+        if key is None:
+            return
+        self._entries[key] = (get_current_time(), copy.deepcopy(result))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"ResultCache(entries={len(self._entries)}, max_entries={self.max_entries}, ttl={self.ttl})"
@@ -1,14 +1,18 @@
 
-import time
+from utils.rate_limiter import TokenBucket
 
 class ServerGateway:
     """Handles communication between edge devices and cloud."""
     
-    def __init__(self, cloud_service):
+    def __init__(self, cloud_service, rate_limit=10.0, rate_burst=5, uplink_bandwidth=2.5e6,
+                 bytes_per_element=4):
         
         self.cloud_service = cloud_service
+        self.uplink_bandwidth = uplink_bandwidth  # Bytes per second from edge to cloud
+        self.bytes_per_element = bytes_per_element  # Bytes per input element (4 = float32)
         self.connected_edge_devices = []
-        self.last_cloud_request = 0
+        # Rate limiting to prevent overwhelming the cloud
+        self.rate_limiter = TokenBucket(rate_limit, rate_burst)
         self.request_timeout = 10  # seconds
     
     def register_edge_device(self, device):
@@ -18,20 +22,86 @@ class ServerGateway:
             return True
         return False
     
+    def would_exceed_rate_limit(self):
+        """Return True if a cloud request sent now would be rate limited."""
+        return self.rate_limiter.would_exceed()
+    
+    def input_upload_time(self, source_device):
+        """Seconds to upload the raw input of the source device's model."""
+        model = source_device.model if source_device is not None else None
+        if model is None or not model.input_size:
+            return 0.0
+        return model.input_size * self.bytes_per_element / self.uplink_bandwidth
+    
     def send_to_cloud(self, task, source_device):
         
-        current_time = time.time()
+        # Refuse immediately rather than stalling the caller
+        if not self.rate_limiter.try_acquire():
+            return {"error": "Rate limit exceeded"}
         
-        # Rate limiting to prevent overwhelming the cloud
-        if current_time - self.last_cloud_request < 0.1:
-            time.sleep(0.1)
+        if not self.cloud_service.check_availability():
+            return {"error": "Cloud service unavailable"}
+        
+        result = self.cloud_service.execute_task(task, self.input_upload_time(source_device))
+        
+        if result is None:
+            return {"error": "Failed to execute task in cloud"}
+        
+        return result
+    
+    async def send_to_cloud_async(self, task, source_device):
+        
+        if not self.rate_limiter.try_acquire():
+            return {"error": "Rate limit exceeded"}
+        
+        if not self.cloud_service.check_availability():
+            return {"error": "Cloud service unavailable"}
+        
+        result = await self.cloud_service.execute_task_async(task, self.input_upload_time(source_device))
+        
+        if result is None:
+            return {"error": "Failed to execute task in cloud"}
+        
+        return result
+    
+    def send_split_to_cloud(self, task, source_device, plan):
+        """
+        Upload a partially executed task's activation and let the cloud finish it.
+        
+        Args:
+            task: The task to execute
+            source_device: Device that ran the leading layers
+            plan (dict): SplitPointPlanner entry with activation_bytes and cloud_fraction
+            
+        Returns:
+            dict: Cloud result, or an error
+        """
+        if not self.rate_limiter.try_acquire():
+            return {"error": "Rate limit exceeded"}
+        
+        if not self.cloud_service.check_availability():
+            return {"error": "Cloud service unavailable"}
+        
+        result = self.cloud_service.execute_partial_task(
+            task, plan["activation_bytes"] / self.uplink_bandwidth, plan["cloud_fraction"]
+        )
+        
+        if result is None:
+            return {"error": "Failed to execute task in cloud"}
+        
+        return result
+    
+    async def send_split_to_cloud_async(self, task, source_device, plan):
         
-        self.last_cloud_request = time.time()
+        if not self.rate_limiter.try_acquire():
+            return {"error": "Rate limit exceeded"}
         
         if not self.cloud_service.check_availability():
             return {"error": "Cloud service unavailable"}
         
-        result = self.cloud_service.execute_task(task)
+        result = await self.cloud_service.execute_partial_task_async(
+            task, plan["activation_bytes"] / self.uplink_bandwidth, plan["cloud_fraction"]
+        )
         
         if result is None:
             return {"error": "Failed to execute task in cloud"}
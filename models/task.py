@@ -1,30 +1,36 @@
-import time
+from utils.helpers import get_current_time
 
 class Task:
     
-    def __init__(self, task_id, input_data, deadline=None, is_sensitive=False):
+    def __init__(self, task_id, input_data, deadline=None, is_sensitive=False, model_name=None,
+                 creation_time=None):
       
         self.task_id = task_id
         self.input_data = input_data
-        self.creation_time = time.time()
+        # Replayed requests are created at their recorded arrival
+        self.creation_time = get_current_time() if creation_time is None else creation_time
         self.deadline = deadline  # Seconds from creation
         self.is_sensitive = is_sensitive
+        self.model_name = model_name  # None means the root device's loaded model
         self.execution_time = None
         self.result = None
         self.source = None  # 'edge' or 'cloud'
+        self.split_plan = None  # SplitPointPlanner cut for a "split" decision
         
     def has_missed_deadline(self, current_time=None):
         if self.deadline is None:
             return False
             
-        current_time = current_time or time.time()
+        if current_time is None:
+            current_time = get_current_time()
         return current_time > (self.creation_time + self.deadline)
     
     def get_remaining_time(self, current_time=None):
         if self.deadline is None:
             return None
             
-        current_time = current_time or time.time()
+        if current_time is None:
+            current_time = get_current_time()
         return (self.creation_time + self.deadline) - current_time
     
     def update_execution_results(self, result, execution_time, source):
@@ -0,0 +1,125 @@
+import heapq
+import itertools
+from utils.helpers import get_current_time
+
+POLICIES = ("fifo", "edf", "least_slack")
+
+
+class TaskQueue:
+    """Heap-backed task queue with FIFO, EDF and least-slack ordering."""
+
+    def __init__(self, policy="fifo", execution_estimate=None):
+        """
+        Args:
+            policy (str): Ordering policy ("fifo", "edf" or "least_slack")
+            execution_estimate (callable): task -> expected execution seconds,
+                used by the least-slack policy
+        """
+        self.policy = self._validate_policy(policy)
+        self.execution_estimate = execution_estimate or (lambda task: 0.0)
+        self._heap = []
+        self._sequence = itertools.count()
+        self.expired_count = 0
+
+    @staticmethod
+    def _validate_policy(policy):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown queue policy: {policy}")
+        return policy
+
+    @staticmethod
+    def _absolute_deadline(task):
+        if task.deadline is None:
+            return float("inf")
+        return task.creation_time + task.deadline
+
+    def _key(self, task, sequence):
+        if self.policy == "edf":
+            return self._absolute_deadline(task)
+        if self.policy == "least_slack":
+            # Slack is deadline - now - estimate; "now" is shared by every
+            # queued task, so ordering by deadline - estimate is equivalent.
+            return self._absolute_deadline(task) - self.execution_estimate(task)
+        return sequence
+
+    def push(self, task):
+        sequence = next(self._sequence)
+        heapq.heappush(self._heap, (self._key(task, sequence), sequence, task))
+
+    # List-compatible alias used by LoadBalancingSystem.create_task
+    append = push
+
+    def pop(self, current_time=None, expired=None):
+        """
+        Remove and return the next task, dropping tasks that already missed
+        their deadline.
+
+        Args:
+            current_time (float): Timestamp used for expiry checks
+            expired (list): If given, dropped tasks are appended to it
+
+        Returns:
+            Task or None if the queue is empty
+        """
+        if current_time is None:
+            current_time = get_current_time()
+        while self._heap:
+            _, _, task = heapq.heappop(self._heap)
+            if not task.has_missed_deadline(current_time):
+                return task
+            self.expired_count += 1
+            if expired is not None:
+                expired.append(task)
+        return None
+
+    def expire(self, current_time=None):
+        """
+        Remove every task whose deadline has already passed.
+
+        Under EDF the expired tasks sit at the top of the heap, so this costs
+        O(k log n) for k expired tasks; other policies need a full rebuild.
+
+        Returns:
+            list: The expired tasks
+        """
+        if current_time is None:
+            current_time = get_current_time()
+        if self.policy == "edf":
+            expired = []
+            while self._heap and self._heap[0][2].has_missed_deadline(current_time):
+                expired.append(heapq.heappop(self._heap)[2])
+        else:
+            expired = [entry[2] for entry in self._heap if entry[2].has_missed_deadline(current_time)]
+            if expired:
+                self._heap = [entry for entry in self._heap
+                              if not entry[2].has_missed_deadline(current_time)]
+                heapq.heapify(self._heap)
+        self.expired_count += len(expired)
+        return expired
+
+    def peek(self):
+        return self._heap[0][2] if self._heap else None
+
+    def set_policy(self, policy):
+        """Switch ordering policy, re-keying queued tasks in O(n)."""
+        policy = self._validate_policy(policy)
+        if policy == self.policy:
+            return
+        self.policy = policy
+        self._heap = [(self._key(task, sequence), sequence, task) for _, sequence, task in self._heap]
+        heapq.heapify(self._heap)
+
+    def clear(self):
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in sorted(self._heap))
+
+    def __repr__(self):
+        return f"TaskQueue(policy={self.policy}, size={len(self._heap)})"
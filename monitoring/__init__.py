@@ -1,3 +1,9 @@
 from .system_monitor import SystemMonitor
+from .cpu_sampler import CpuSampler, get_shared_sampler
+from .histogram import LatencyHistogram
+from .load_model import DeviceLoadModel
+from .health_tracker import DeviceHealthTracker
+from .tracing import Tracer, enable_tracing, disable_tracing, get_tracer
 
-__all__ = ['SystemMonitor']
\ No newline at end of file
+__all__ = ['SystemMonitor', 'CpuSampler', 'get_shared_sampler', 'LatencyHistogram', 'DeviceLoadModel',
+           'DeviceHealthTracker', 'Tracer', 'enable_tracing', 'disable_tracing', 'get_tracer']
\ No newline at end of file
@@ -0,0 +1,100 @@
+import threading
+import psutil
+
+
+class CpuSampler:
+    """Samples host CPU utilization on a background thread.
+
+    The sampler thread is the only writer of a fixed-size ring buffer; readers
+    never take a lock and never block, so ``current_cpu_usage`` is O(1).
+    """
+
+    def __init__(self, period=0.1, window=10, smoothing="ewma", alpha=0.3):
+        """
+        Args:
+            period (float): Seconds between samples
+            window (int): Number of samples kept in the ring buffer
+            smoothing (str): "ewma", "mean" (windowed) or "none"
+            alpha (float): EWMA smoothing factor in (0, 1]
+        """
+        if smoothing not in ("ewma", "mean", "none"):
+            raise ValueError(f"Unknown smoothing method: {smoothing}")
+        self.period = period
+        self.window = window
+        self.smoothing = smoothing
+        self.alpha = alpha
+        self._samples = [0.0] * window
+        self._index = 0
+        self._count = 0
+        self._ewma = 0.0
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        # Prime psutil so the first non-blocking reading is meaningful
+        psutil.cpu_percent(interval=None)
+        self._thread = threading.Thread(target=self._run, name="cpu-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.period * 2)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        while not self._stop_event.wait(self.period):
+            self.record(psutil.cpu_percent(interval=None))
+
+    def record(self, value):
+        """Store one sample; called from the sampler thread."""
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % self.window
+        if self._count == 0:
+            self._ewma = value
+        else:
+            self._ewma = self.alpha * value + (1 - self.alpha) * self._ewma
+        if self._count < self.window:
+            self._count += 1
+
+    @property
+    def current_cpu_usage(self):
+        if not self.is_running():
+            self.start()
+        count = self._count
+        if count == 0:
+            return 0.0
+        if self.smoothing == "ewma":
+            return self._ewma
+        if self.smoothing == "mean":
+            return sum(self._samples[:count]) / count
+        return self._samples[(self._index - 1) % self.window]
+
+    def __repr__(self):
+        status = "running" if self.is_running() else "stopped"
+        return f"CpuSampler(period={self.period}s, smoothing={self.smoothing}, {status})"
+
+
+_shared_sampler = None
+
+
+def get_shared_sampler():
+    """Return the process-wide sampler, created from config on first use."""
+    global _shared_sampler
+    if _shared_sampler is None:
+        import config
+        settings = config.MONITORING
+        _shared_sampler = CpuSampler(
+            period=settings.get("cpu_sampling_period", settings.get("log_cpu_interval", 0.1)),
+            window=settings.get("cpu_sampling_window", 10),
+            smoothing=settings.get("cpu_smoothing", "ewma"),
+            alpha=settings.get("cpu_ewma_alpha", 0.3)
+        )
+    return _shared_sampler
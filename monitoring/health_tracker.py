@@ -0,0 +1,148 @@
+from utils.helpers import get_current_time
+
+
+class _DeviceHealth:
+
+    def __init__(self, now):
+        self.latency_ratio = 1.0     # EWMA of observed / expected time
+        self.samples = 0
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.last_heartbeat = now
+        self.last_poll = None
+        self.last_failure = None
+
+
+class DeviceHealthTracker:
+    """Tracks how fast and how alive each edge device is.
+
+    Every completed piece of work reports its observed time next to the time
+    it was expected to take; the running ratio shows how far a device lags
+    behind what its load and speed predict. A device is considered failed
+    when its heartbeat has been silent for heartbeat_timeout or when
+    failure_threshold consecutive executions failed. A failed device
+    recovers once it answers heartbeats again for a full timeout after its
+    last failure.
+    """
+
+    def __init__(self, alpha=0.2, heartbeat_interval=0.5, heartbeat_timeout=2.0,
+                 failure_threshold=3, min_health=0.1):
+        """
+        Args:
+            alpha (float): EWMA weight of each latency observation
+            heartbeat_interval (float): Seconds between heartbeat polls of a device
+            heartbeat_timeout (float): Silence after which a device counts as failed
+            failure_threshold (int): Consecutive failed executions that mark a device failed
+            min_health (float): Lower bound of health_factor for a live device
+        """
+        self.alpha = alpha
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.failure_threshold = failure_threshold
+        self.min_health = min_health
+        self.devices = {}
+
+    def _state(self, device_id, now=None):
+        state = self.devices.get(device_id)
+        if state is None:
+            state = self.devices[device_id] = _DeviceHealth(get_current_time() if now is None else now)
+        return state
+
+    def poll(self, devices, now=None):
+        """Heartbeat every device whose last poll is older than heartbeat_interval."""
+        if now is None:
+            now = get_current_time()
+        for device in devices:
+            state = self._state(device.device_id, now)
+            if state.last_poll is not None and now - state.last_poll < self.heartbeat_interval:
+                continue
+            state.last_poll = now
+            if device.heartbeat():
+                self.heartbeat(device.device_id, now)
+
+    def heartbeat(self, device_id, now=None):
+        if now is None:
+            now = get_current_time()
+        state = self._state(device_id, now)
+        state.last_heartbeat = now
+        # Answering for a full timeout after the last failure clears the record
+        if state.last_failure is not None and now - state.last_failure >= self.heartbeat_timeout:
+            state.consecutive_failures = 0
+            state.last_failure = None
+
+    def record(self, device_id, observed, expected, now=None):
+        """
+        Record a completed execution.
+
+        Args:
+            device_id (str): Device that ran the work
+            observed (float): Seconds it took
+            expected (float): Seconds it should have taken at nominal speed
+        """
+        if now is None:
+            now = get_current_time()
+        state = self._state(device_id, now)
+        if expected > 0:
+            ratio = observed / expected
+            if state.samples == 0:
+                state.latency_ratio = ratio
+            else:
+                state.latency_ratio += self.alpha * (ratio - state.latency_ratio)
+            state.samples += 1
+        state.consecutive_failures = 0
+        state.last_failure = None
+        # A result is as good as a heartbeat
+        state.last_heartbeat = now
+
+    def record_failure(self, device_id, now=None):
+        if now is None:
+            now = get_current_time()
+        state = self._state(device_id, now)
+        state.consecutive_failures += 1
+        state.total_failures += 1
+        state.last_failure = now
+
+    def is_failed(self, device_id, now=None):
+        state = self.devices.get(device_id)
+        if state is None:
+            return False
+        if now is None:
+            now = get_current_time()
+        return (state.consecutive_failures >= self.failure_threshold
+                or now - state.last_heartbeat > self.heartbeat_timeout)
+
+    def latency_ratio(self, device_id):
+        """Observed over expected execution time (1.0 before any observation)."""
+        state = self.devices.get(device_id)
+        return state.latency_ratio if state is not None else 1.0
+
+    def health_factor(self, device_id):
+        """
+        Share of a device's nominal power worth planning with.
+
+        Returns:
+            float: 1.0 for a device no slower than the median device, down
+            to min_health for one lagging far behind its peers
+        """
+        ratios = sorted(state.latency_ratio for state in self.devices.values() if state.samples)
+        if not ratios:
+            return 1.0
+        median = ratios[len(ratios) // 2]
+        return max(self.min_health, min(1.0, median / max(self.latency_ratio(device_id), 1e-9)))
+
+    def get_statistics(self, now=None):
+        if now is None:
+            now = get_current_time()
+        return {
+            device_id: {
+                "latency_ratio": state.latency_ratio,
+                "health": self.health_factor(device_id),
+                "failures": state.total_failures,
+                "failed": self.is_failed(device_id, now)
+            }
+            for device_id, state in self.devices.items()
+        }
+
+    def __repr__(self):
+        failed = sum(1 for device_id in self.devices if self.is_failed(device_id))
+        return f"DeviceHealthTracker(devices={len(self.devices)}, failed={failed})"
@@ -0,0 +1,112 @@
+from array import array
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram with bounded memory.
+
+    Values are counted in units of ``resolution`` seconds. Each power-of-two
+    range is split into 2**(precision_bits - 1) equal sub-buckets, so every
+    recorded value is known to within 1 / 2**(precision_bits - 1) of itself.
+    The bucket array has a fixed size, which makes percentile queries cost
+    the same regardless of how many values were recorded, and two histograms
+    with the same settings merge by adding counts.
+    """
+
+    def __init__(self, resolution=1e-6, max_value=3600.0, precision_bits=7):
+        """
+        Args:
+            resolution (float): Smallest distinguishable value in seconds
+            max_value (float): Largest trackable value; larger values are clamped
+            precision_bits (int): Sub-bucket bits (7 gives ~1.6% relative error)
+        """
+        self.resolution = resolution
+        self.max_value = max_value
+        self.precision_bits = precision_bits
+        self._sub_count = 1 << precision_bits
+        self._half_count = self._sub_count >> 1
+        self._max_units = int(max_value / resolution)
+        self._counts = array('Q', [0]) * (self._index(self._max_units) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, units):
+        if units < self._sub_count:
+            return units
+        shift = units.bit_length() - self.precision_bits
+        return self._sub_count + (shift - 1) * self._half_count + ((units >> shift) - self._half_count)
+
+    def _bucket_bounds(self, index):
+        """Return the [low, high) range of a bucket in resolution units."""
+        if index < self._sub_count:
+            return index, index + 1
+        shift, offset = divmod(index - self._sub_count, self._half_count)
+        shift += 1
+        top = offset + self._half_count
+        return top << shift, (top + 1) << shift
+
+    def record(self, value, count=1):
+        units = min(self._max_units, max(0, int(value / self.resolution)))
+        self._counts[self._index(units)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percentile):
+        """
+        Args:
+            percentile (float): Percentile in [0, 100]
+
+        Returns:
+            float: Midpoint of the bucket holding the percentile (0 if empty)
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, bucket_count in enumerate(self._counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= target:
+                low, high = self._bucket_bounds(index)
+                value = (low + high) / 2 * self.resolution
+                # Buckets are wider than the data at the extremes
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def merge(self, other):
+        if (other.resolution, other.max_value, other.precision_bits) != \
+                (self.resolution, self.max_value, self.precision_bits):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        counts = self._counts
+        for index, bucket_count in enumerate(other._counts):
+            if bucket_count:
+                counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def summary(self, percentiles=(50, 95, 99)):
+        result = {f"p{p:g}": self.percentile(p) for p in percentiles}
+        result.update({
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.min or 0,
+            "max": self.max or 0
+        })
+        return result
+
+    def __repr__(self):
+        return f"LatencyHistogram(count={self.count}, p99={self.percentile(99):.4f}s)"
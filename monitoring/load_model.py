@@ -0,0 +1,83 @@
+import math
+from contextlib import contextmanager
+from utils.helpers import get_current_time
+
+
+class DeviceLoadModel:
+    """Utilization of one device derived from the work assigned to it.
+
+    Every running task or shard occupies one core and every queued task adds
+    one core of demand, so instantaneous demand is (running + queued) over
+    the core count, capped at 100%. The reported utilization follows demand
+    with exponential decay, the way a smoothed CPU reading trails load: a
+    device that just finished a burst still reads busy for a few half-lives.
+    """
+
+    def __init__(self, num_cores, half_life=0.25, background=0.0):
+        """
+        Args:
+            num_cores (int): Cores the work is spread over
+            half_life (float): Seconds for utilization to close half the gap to demand
+            background (float): Utilization percentage present without any assigned work
+        """
+        self.num_cores = num_cores
+        self.half_life = half_life
+        self.background = background
+        self.running = 0
+        self.queued = 0
+        self._utilization = background
+        self._updated = None
+
+    def demand(self):
+        """Instantaneous utilization percentage implied by current work."""
+        work = (self.running + self.queued) / max(1, self.num_cores)
+        return min(100.0, self.background + 100.0 * work)
+
+    def _advance(self, now):
+        if self._updated is not None and now > self._updated and self.half_life > 0:
+            retained = math.exp(-math.log(2) * (now - self._updated) / self.half_life)
+            target = self.demand()
+            self._utilization = target + (self._utilization - target) * retained
+        elif self.half_life <= 0:
+            self._utilization = self.demand()
+        self._updated = now
+
+    def utilization(self, now=None):
+        """Smoothed utilization percentage at ``now``."""
+        self._advance(get_current_time() if now is None else now)
+        return self._utilization
+
+    def start(self, cores=1):
+        self._advance(get_current_time())
+        self.running += cores
+
+    def finish(self, cores=1):
+        self._advance(get_current_time())
+        self.running = max(0, self.running - cores)
+
+    def enqueue(self, count=1):
+        self._advance(get_current_time())
+        self.queued += count
+
+    def dequeue(self, count=1):
+        self._advance(get_current_time())
+        self.queued = max(0, self.queued - count)
+
+    @contextmanager
+    def busy(self, cores=1):
+        """Count the enclosed block as running work."""
+        self.start(cores)
+        try:
+            yield self
+        finally:
+            self.finish(cores)
+
+    def reset(self):
+        self.running = 0
+        self.queued = 0
+        self._utilization = self.background
+        self._updated = None
+
+    def __repr__(self):
+        return (f"DeviceLoadModel(running={self.running}, queued={self.queued}, "
+                f"utilization={self._utilization:.1f}%)")
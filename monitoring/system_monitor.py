@@ -1,66 +1,274 @@
+import sys
+from array import array
+from monitoring.histogram import LatencyHistogram
+
 
 class SystemMonitor:
-    
+    """Records CPU and execution samples in compact typed columns.
+
+    Device, state and source names are interned to integer codes, and
+    running sums/counts are kept per (device, state) and per source, so the
+    averages and get_statistics cost O(1) regardless of history length.
+    Task IDs of the form "task_<n>" are stored as n; any other ID is kept
+    once in a side table and stored as a negative index into it.
+    """
+
     def __init__(self):
-        self.cpu_history = []
-        self.execution_times = []
+        # CPU sample columns
+        self._cpu_device = array('I')
+        self._cpu_state = array('I')
+        self._cpu_value = array('d')
+        self._cpu_timestamp = array('d')
+
+        # Execution sample columns
+        self._exec_task_id = array('q')
+        self._exec_time = array('d')
+        self._exec_source = array('I')
+
+        self._codes = {}   # name -> code
+        self._names = []   # code -> name
+        self._task_codes = {}  # task ID not of the form "task_<n>" -> code
+        self._task_names = []  # code -> task ID
+
+        # Running [sum, count]; None is the "any" wildcard in each key slot
+        self._cpu_totals = {}
+        self._exec_totals = {}
+
+        # Latency distributions; None keys hold the overall histogram
+        self.latency_by_source = {None: LatencyHistogram()}
+        self.latency_by_mode = {}
+        self.slack_histogram = LatencyHistogram()
+
         self.missed_deadlines = 0
         self.total_tasks = 0
         
-    def record_cpu_usage(self, device_id, cpu_usage, timestamp, state):
-        self.cpu_history.append({
-            'device_id': device_id,
-            'cpu_usage': cpu_usage,
-            'timestamp': timestamp,
-            'state': state
-        })
+        # Result cache lookups
+        self.cache_hits = 0
+        self.cache_misses = 0
         
-    def record_execution(self, task_id, execution_time, source, deadline_missed):
-    
-        self.execution_times.append({
-            'task_id': task_id,
-            'execution_time': execution_time,
-            'source': source
-        })
+        # Admission control outcomes: (outcome, reason) -> count
+        self.admission_counts = {}
         
+        # Failed executions per source, and hedging outcomes -> count
+        self.failures = {}
+        self.hedge_counts = {}
+
+    def _intern(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self._names)
+            self._codes[name] = code
+            self._names.append(name)
+        return code
+
+    def _task_index(self, task_id):
+        if isinstance(task_id, str):
+            prefix, _, number = task_id.partition("_")
+            # Only the canonical spelling round-trips ("task_07" does not)
+            if prefix == "task" and number.isdigit() and str(int(number)) == number:
+                return int(number)
+        code = self._task_codes.get(task_id)
+        if code is None:
+            code = len(self._task_names)
+            self._task_codes[task_id] = code
+            self._task_names.append(task_id)
+        return -1 - code
+
+    def _task_id(self, index):
+        return f"task_{index}" if index >= 0 else self._task_names[-1 - index]
+
+    @staticmethod
+    def _accumulate(totals, key, value):
+        entry = totals.get(key)
+        if entry is None:
+            totals[key] = [value, 1]
+        else:
+            entry[0] += value
+            entry[1] += 1
+
+    def record_cpu_usage(self, device_id, cpu_usage, timestamp, state):
+        device = self._intern(device_id)
+        state_code = self._intern(state)
+        self._cpu_device.append(device)
+        self._cpu_state.append(state_code)
+        self._cpu_value.append(cpu_usage)
+        self._cpu_timestamp.append(timestamp)
+
+        totals = self._cpu_totals
+        self._accumulate(totals, (device, state_code), cpu_usage)
+        self._accumulate(totals, (device, None), cpu_usage)
+        self._accumulate(totals, (None, state_code), cpu_usage)
+        self._accumulate(totals, (None, None), cpu_usage)
+
+    def record_execution(self, task_id, execution_time, source, deadline_missed,
+                         decision_mode=None, slack=None, failed=False):
+
+        if failed:
+            # A failed task produced no result: it counts as missed and stays
+            # out of the latency figures, which describe delivered results
+            self.failures[source] = self.failures.get(source, 0) + 1
+            self.total_tasks += 1
+            self.missed_deadlines += 1
+            return
+
+        source_code = self._intern(source)
+        self._exec_task_id.append(self._task_index(task_id))
+        self._exec_time.append(execution_time)
+        self._exec_source.append(source_code)
+
+        self._accumulate(self._exec_totals, source_code, execution_time)
+        self._accumulate(self._exec_totals, None, execution_time)
+
+        self.latency_by_source[None].record(execution_time)
+        self._histogram(self.latency_by_source, source).record(execution_time)
+        if decision_mode is not None:
+            self._histogram(self.latency_by_mode, decision_mode).record(execution_time)
+        if slack is not None:
+            # Late tasks have no slack left; they count toward the zero bucket
+            self.slack_histogram.record(max(0, slack))
+
         self.total_tasks += 1
         if deadline_missed:
             self.missed_deadlines += 1
-            
+
+    def record_cache_lookup(self, hit):
+        if hit:
+            self.cache_hits += 1
+        else:
+            self.cache_misses += 1
+    
+    def record_admission(self, outcome, reason):
+        """Count a task shed or downgraded by admission control, with the reason."""
+        key = (outcome, reason)
+        self.admission_counts[key] = self.admission_counts.get(key, 0) + 1
+    
+    def record_hedge(self, event):
+        """Count a hedging event: hedged, cloud_won, edge_won, retried or fallback."""
+        self.hedge_counts[event] = self.hedge_counts.get(event, 0) + 1
+    
+    def get_admission_statistics(self):
+        stats = {"shed": 0, "downgraded": 0, "reasons": {}}
+        for (outcome, reason), count in self.admission_counts.items():
+            stats[outcome] = stats.get(outcome, 0) + count
+            stats["reasons"][reason] = stats["reasons"].get(reason, 0) + count
+        return stats
+    
+    def get_cache_hit_rate(self):
+        lookups = self.cache_hits + self.cache_misses
+        if lookups == 0:
+            return 0
+        return (self.cache_hits / lookups) * 100
+
+    @staticmethod
+    def _histogram(histograms, key):
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        return histogram
+
+    def get_latency_percentile(self, percentile, source=None, decision_mode=None):
+        if decision_mode is not None:
+            histogram = self.latency_by_mode.get(decision_mode)
+        else:
+            histogram = self.latency_by_source.get(source)
+        return histogram.percentile(percentile) if histogram else 0
+
+    def merge(self, other):
+        """Fold another monitor's samples and aggregates into this one."""
+        remap = [self._intern(name) for name in other._names]
+        self._cpu_device.extend(array('I', (remap[code] for code in other._cpu_device)))
+        self._cpu_state.extend(array('I', (remap[code] for code in other._cpu_state)))
+        self._cpu_value.extend(other._cpu_value)
+        self._cpu_timestamp.extend(other._cpu_timestamp)
+        task_remap = [self._task_index(task_id) for task_id in other._task_names]
+        self._exec_task_id.extend(array('q', (index if index >= 0 else task_remap[-1 - index]
+                                              for index in other._exec_task_id)))
+        self._exec_time.extend(other._exec_time)
+        self._exec_source.extend(array('I', (remap[code] for code in other._exec_source)))
+
+        def translate(code):
+            return None if code is None else remap[code]
+
+        for (device, state), (total, count) in other._cpu_totals.items():
+            key = (translate(device), translate(state))
+            entry = self._cpu_totals.setdefault(key, [0.0, 0])
+            entry[0] += total
+            entry[1] += count
+        for source, (total, count) in other._exec_totals.items():
+            entry = self._exec_totals.setdefault(translate(source), [0.0, 0])
+            entry[0] += total
+            entry[1] += count
+
+        for mine, theirs in ((self.latency_by_source, other.latency_by_source),
+                             (self.latency_by_mode, other.latency_by_mode)):
+            for key, histogram in theirs.items():
+                self._histogram(mine, key).merge(histogram)
+        self.slack_histogram.merge(other.slack_histogram)
+
+        self.total_tasks += other.total_tasks
+        self.missed_deadlines += other.missed_deadlines
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        for mine, theirs in ((self.admission_counts, other.admission_counts),
+                             (self.failures, other.failures),
+                             (self.hedge_counts, other.hedge_counts)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        return self
+
+    @property
+    def cpu_history(self):
+        """CPU samples as dicts; O(n), intended for inspection and export."""
+        names = self._names
+        return [
+            {
+                'device_id': names[device],
+                'cpu_usage': cpu_usage,
+                'timestamp': timestamp,
+                'state': names[state]
+            }
+            for device, state, cpu_usage, timestamp in zip(
+                self._cpu_device, self._cpu_state, self._cpu_value, self._cpu_timestamp)
+        ]
+
+    @property
+    def execution_times(self):
+        """Execution samples as dicts; O(n), intended for inspection and export."""
+        names = self._names
+        return [
+            {'task_id': self._task_id(index), 'execution_time': execution_time, 'source': names[source]}
+            for index, execution_time, source in zip(self._exec_task_id, self._exec_time, self._exec_source)
+        ]
+
+    def _code(self, name):
+        # None stays the wildcard; unknown names match nothing
+        if name is None:
+            return None
+        return self._codes.get(name, -1)
+
     def get_average_cpu_usage(self, device_id=None, state=None):
-        filtered = self.cpu_history
-        
-        if device_id is not None:
-            filtered = [entry for entry in filtered if entry['device_id'] == device_id]
-            
-        if state is not None:
-            filtered = [entry for entry in filtered if entry['state'] == state]
-            
-        if not filtered:
+        entry = self._cpu_totals.get((self._code(device_id), self._code(state)))
+        if entry is None:
             return 0
-            
-        return sum(entry['cpu_usage'] for entry in filtered) / len(filtered)
-        
+
+        return entry[0] / entry[1]
+
     def get_average_execution_time(self, source=None):
-       
-        filtered = self.execution_times
-        
-        if source is not None:
-            filtered = [entry for entry in filtered if entry['source'] == source]
-            
-        if not filtered:
+
+        entry = self._exec_totals.get(self._code(source))
+        if entry is None:
             return 0
-            
-        return sum(entry['execution_time'] for entry in filtered) / len(filtered)
-    
+
+        return entry[0] / entry[1]
+
     def get_deadline_miss_rate(self):
-       
+
         if self.total_tasks == 0:
             return 0
         return (self.missed_deadlines / self.total_tasks) * 100
-    
+
     def get_statistics(self):
-       
+
         return {
             'cpu_usage': {
                 'overall': self.get_average_cpu_usage(),
@@ -70,14 +278,45 @@ class SystemMonitor:
             'execution_time': {
                 'overall': self.get_average_execution_time(),
                 'edge': self.get_average_execution_time(source='edge'),
-                'cloud': self.get_average_execution_time(source='cloud')
+                'cloud': self.get_average_execution_time(source='cloud'),
+                'cache': self.get_average_execution_time(source='cache'),
+                'split': self.get_average_execution_time(source='split')
             },
             'deadline_performance': {
                 'total_tasks': self.total_tasks,
                 'missed_deadlines': self.missed_deadlines,
                 'miss_rate': self.get_deadline_miss_rate()
+            },
+            'latency_percentiles': {
+                'overall' if source is None else source: histogram.summary()
+                for source, histogram in self.latency_by_source.items()
+            },
+            'latency_by_mode': {
+                mode: histogram.summary() for mode, histogram in self.latency_by_mode.items()
+            },
+            'slack_at_completion': self.slack_histogram.summary(),
+            'admission': self.get_admission_statistics(),
+            'failures': {
+                'total': sum(self.failures.values()),
+                'by_source': dict(self.failures)
+            },
+            'hedging': dict(self.hedge_counts),
+            'result_cache': {
+                'hits': self.cache_hits,
+                'misses': self.cache_misses,
+                'hit_rate': self.get_cache_hit_rate()
             }
         }
-    
+
+    def memory_usage(self):
+        """Approximate bytes held by the sample columns and the task ID side table."""
+        columns = (self._cpu_device, self._cpu_state, self._cpu_value, self._cpu_timestamp,
+                   self._exec_task_id, self._exec_time, self._exec_source)
+        total = sum(column.itemsize * len(column) for column in columns)
+        if self._task_names:
+            total += sys.getsizeof(self._task_names) + sys.getsizeof(self._task_codes)
+            total += sum(sys.getsizeof(task_id) for task_id in self._task_names)
+        return total
+
     def __repr__(self):
-        return f"SystemMonitor(tasks={self.total_tasks}, missed_deadlines={self.missed_deadlines})"
\ No newline at end of file
+        return f"SystemMonitor(tasks={self.total_tasks}, missed_deadlines={self.missed_deadlines})"
@@ -0,0 +1,239 @@
+import json
+import os
+import threading
+from contextvars import ContextVar
+from utils.helpers import get_current_time
+
+# Active tracer; None means tracing is off. See enable_tracing.
+_tracer = None
+
+# Whether a tracer is installed. Sites that read the clock only to record
+# a span check this first; span() and track() are no-ops while it is off.
+enabled = False
+
+# Track (timeline row) that spans recorded in this context belong to. Each
+# asyncio task copies the context, so concurrent tasks keep their own track.
+_track = ContextVar("trace_track", default=None)
+
+
+class _NullSpan:
+    """Stand-in returned while tracing is off; entering and leaving it does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = get_current_time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.category, self.start, get_current_time(), self.args)
+        return False
+
+    def set(self, **args):
+        """Attach arguments known only once the span is running."""
+        self.args.update(args)
+
+
+class _TrackScope:
+
+    __slots__ = ("track", "token")
+
+    def __init__(self, track):
+        self.track = track
+
+    def __enter__(self):
+        self.token = _track.set(self.track)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _track.reset(self.token)
+        return False
+
+
+class Tracer:
+    """Collects timed spans and exports them as Chrome trace-event JSON.
+
+    Each thread appends to its own buffer, so recording never takes a lock;
+    the lock only guards registering a thread's buffer the first time it
+    records. Spans land on the current track: the task set with track(),
+    or the recording thread when no task is active. Timestamps come from
+    get_current_time, so a simulated run is traced on its virtual clock.
+    The export opens in chrome://tracing and the Perfetto UI.
+    """
+
+    def __init__(self, max_events_per_thread=None):
+        """
+        Args:
+            max_events_per_thread (int): Spans kept per thread; later ones are
+                counted as dropped (None keeps everything)
+        """
+        self.max_events_per_thread = max_events_per_thread
+        self.dropped = 0
+        self._local = threading.local()
+        self._buffers = []
+        self._lock = threading.Lock()
+
+    def _buffer(self):
+        buffer = getattr(self._local, "events", None)
+        if buffer is None:
+            buffer = self._local.events = []
+            with self._lock:
+                self._buffers.append((threading.current_thread().name, buffer))
+        return buffer
+
+    def record(self, name, category, start, end, args=None, track=None):
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Span name
+            category (str): Span category, used for filtering in the viewer
+            start (float): Start timestamp in seconds
+            end (float): End timestamp in seconds
+            args (dict): Extra arguments shown with the span
+            track (str): Track to put the span on (defaults to the current one)
+        """
+        buffer = self._buffer()
+        if self.max_events_per_thread is not None and len(buffer) >= self.max_events_per_thread:
+            self.dropped += 1
+            return
+        buffer.append((name, category, start, end, track or _track.get(), args))
+
+    def __len__(self):
+        return sum(len(buffer) for _, buffer in self._buffers)
+
+    def clear(self):
+        with self._lock:
+            for _, buffer in self._buffers:
+                buffer.clear()
+        self.dropped = 0
+
+    def to_chrome_trace(self):
+        """
+        Build the trace as a Chrome trace-event document.
+
+        Returns:
+            dict: {"traceEvents": [...], ...} with one complete ("X") event
+            per span and a named thread per track
+        """
+        with self._lock:
+            buffers = [(thread, list(buffer)) for thread, buffer in self._buffers]
+        starts = [event[2] for _, buffer in buffers for event in buffer]
+        origin = min(starts) if starts else 0.0
+        pid = os.getpid()
+
+        tids = {}
+        events = []
+        for thread, buffer in buffers:
+            for name, category, start, end, track, args in buffer:
+                track = track or thread
+                tid = tids.get(track)
+                if tid is None:
+                    tid = tids[track] = len(tids) + 1
+                event = {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - origin) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": tid
+                }
+                if args:
+                    event["args"] = args
+                events.append(event)
+        events.sort(key=lambda event: event["ts"])
+
+        metadata = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "LoadBalancingSystem"}}]
+        for track, tid in tids.items():
+            metadata.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": str(track)}})
+            metadata.append({"name": "thread_sort_index", "ph": "M", "pid": pid, "tid": tid,
+                             "args": {"sort_index": tid}})
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_spans": self.dropped}
+        }
+
+    def export(self, path):
+        """Write the trace to ``path``; returns the number of spans written."""
+        trace = self.to_chrome_trace()
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+    def __repr__(self):
+        return f"Tracer(spans={len(self)}, dropped={self.dropped})"
+
+
+def enable_tracing(tracer=None):
+    """Install a tracer (a new one by default) and return it."""
+    global _tracer, enabled
+    _tracer = tracer if tracer is not None else Tracer()
+    enabled = True
+    return _tracer
+
+
+def disable_tracing():
+    """Stop tracing; returns the tracer that was active, if any."""
+    global _tracer, enabled
+    tracer, _tracer = _tracer, None
+    enabled = False
+    return tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def span(name, category="task", **args):
+    """
+    Time the enclosed block as a span on the current track.
+
+    Returns a shared no-op object while tracing is off, so call sites keep
+    a single body either way. Sites that would read the clock only for a
+    span, such as record_span callers, check ``enabled`` first.
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def record_span(name, category, start, end, track=None, **args):
+    """Record an interval measured elsewhere, such as time spent waiting in a queue."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.record(name, category, start, end, args, track)
+
+
+def track(name):
+    """Put spans recorded inside the block on the track ``name`` (e.g. a task ID)."""
+    if _tracer is None:
+        return _NULL_SPAN
+    return _TrackScope(name)
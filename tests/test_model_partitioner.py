@@ -0,0 +1,24 @@
+import pytest
+
+from main import create_model, setup_system
+from load_balancers.model_partitioner import proportional_assignment
+from utils.simulation import Simulation
+
+
+@pytest.mark.parametrize("model_name", ["alexnet", "vgg11"])
+def test_optimal_partition_beats_proportional_split(model_name):
+    with Simulation(seed=0, cpu_range=(30, 30)):
+        system = setup_system()
+        balancer = system.horizontal_balancer
+        devices = balancer.get_connected_devices()
+        for device in devices:
+            device.update_cpu_usage()
+        model = create_model(model_name)
+        system.load_model(model)
+
+        plan = balancer.optimal_partition(model)
+        proportional = balancer.partitioner.evaluate(model, devices, proportional_assignment(balancer, model))
+
+    assert plan["makespan"] < proportional
+    # The reported makespan is what evaluate predicts for the chosen assignment
+    assert balancer.partitioner.evaluate(model, devices, plan["assignment"]) == pytest.approx(plan["makespan"])
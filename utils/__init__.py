@@ -1,5 +1,9 @@
 from .helpers import (
     get_current_time, 
+    set_clock,
+    get_clock,
+    sleep,
+    run_coroutine,
     format_time, 
     generate_random_image_data,
     load_config,
@@ -7,13 +11,23 @@ from .helpers import (
     create_alexnet_model,
     create_vgg11_model
 )
+from .simulation import Simulation
+from .trace import read_trace
+from .rate_limiter import TokenBucket
 
 __all__ = [
     'get_current_time',
+    'set_clock',
+    'get_clock',
+    'sleep',
+    'run_coroutine',
     'format_time',
     'generate_random_image_data',
     'load_config',
     'save_results',
     'create_alexnet_model',
-    'create_vgg11_model'
+    'create_vgg11_model',
+    'Simulation',
+    'read_trace',
+    'TokenBucket'
 ]
\ No newline at end of file
@@ -1,13 +1,46 @@
 
+import asyncio
 import time
 import random
 import json
 import os
 
+# Active clock; None means wall-clock time. See utils.simulation.Simulation.
+_clock = None
+
+def set_clock(clock):
+    """Install a clock object exposing time() and sleep(); returns the previous one."""
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+def get_clock():
+    return _clock
+
 def get_current_time():
     
+    if _clock is not None:
+        return _clock.time()
     return time.time()
 
+def sleep(seconds):
+    
+    if _clock is not None:
+        _clock.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+def run_coroutine(coroutine):
+    """Run a coroutine to completion on the active clock's event loop."""
+    if _clock is not None and hasattr(_clock, "new_event_loop"):
+        loop = _clock.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+    return asyncio.run(coroutine)
+
 def format_time(timestamp):
    
     import datetime
@@ -46,19 +79,20 @@ def create_alexnet_model():
     
     from models.ml_model import MLModel, Layer
     
-    model = MLModel("AlexNet")
+    model = MLModel("AlexNet", input_size=3 * 224 * 224)
     
-    # Convolutional layers
-    model.add_layer(Layer("conv2d", 23296, is_divisible=False))
-    model.add_layer(Layer("conv2d", 307456, is_divisible=False))
-    model.add_layer(Layer("conv2d", 663936, is_divisible=False))
-    model.add_layer(Layer("conv2d", 885120, is_divisible=False))
-    model.add_layer(Layer("conv2d", 590080, is_divisible=False))
+    # Convolutional layers; MACs are weights x output positions, output
+    # sizes are after pooling where AlexNet pools
+    model.add_layer(Layer("conv2d", 23296, is_divisible=False, macs=23232 * 55 * 55, output_size=64 * 27 * 27))
+    model.add_layer(Layer("conv2d", 307456, is_divisible=False, macs=307200 * 27 * 27, output_size=192 * 13 * 13))
+    model.add_layer(Layer("conv2d", 663936, is_divisible=False, macs=663552 * 13 * 13, output_size=384 * 13 * 13))
+    model.add_layer(Layer("conv2d", 885120, is_divisible=False, macs=884736 * 13 * 13, output_size=256 * 13 * 13))
+    model.add_layer(Layer("conv2d", 590080, is_divisible=False, macs=589824 * 13 * 13, output_size=256 * 6 * 6))
     
     # Fully connected layers (divisible)
-    model.add_layer(Layer("linear", 37752832, is_divisible=True))
-    model.add_layer(Layer("linear", 16781312, is_divisible=True))
-    model.add_layer(Layer("linear", 4097000, is_divisible=True))
+    model.add_layer(Layer("linear", 37752832, is_divisible=True, in_features=9216, out_features=4096))
+    model.add_layer(Layer("linear", 16781312, is_divisible=True, in_features=4096, out_features=4096))
+    model.add_layer(Layer("linear", 4097000, is_divisible=True, in_features=4096, out_features=1000))
     
     return model
 
@@ -66,21 +100,23 @@ def create_vgg11_model():
     
     from models.ml_model import MLModel, Layer
     
-    model = MLModel("VGG11")
+    model = MLModel("VGG11", input_size=3 * 224 * 224)
     
-    # Convolutional layers
-    model.add_layer(Layer("conv2d", 1792, is_divisible=False))
-    model.add_layer(Layer("conv2d", 36928, is_divisible=False))
-    model.add_layer(Layer("conv2d", 73856, is_divisible=False))
-    model.add_layer(Layer("conv2d", 147584, is_divisible=False))
-    model.add_layer(Layer("conv2d", 295168, is_divisible=False))
-    model.add_layer(Layer("conv2d", 590080, is_divisible=False))
-    model.add_layer(Layer("conv2d", 590080, is_divisible=False))
-    model.add_layer(Layer("conv2d", 590080, is_divisible=False))
+    # Convolutional layers; MACs are weights x output positions, output
+    # sizes are after pooling where the network pools
+    model.add_layer(Layer("conv2d", 1792, is_divisible=False, macs=1728 * 224 * 224, output_size=64 * 224 * 224))
+    model.add_layer(Layer("conv2d", 36928, is_divisible=False, macs=36864 * 224 * 224, output_size=64 * 112 * 112))
+    model.add_layer(Layer("conv2d", 73856, is_divisible=False, macs=73728 * 112 * 112, output_size=128 * 112 * 112))
+    model.add_layer(Layer("conv2d", 147584, is_divisible=False, macs=147456 * 112 * 112, output_size=128 * 56 * 56))
+    model.add_layer(Layer("conv2d", 295168, is_divisible=False, macs=294912 * 56 * 56, output_size=256 * 56 * 56))
+    model.add_layer(Layer("conv2d", 590080, is_divisible=False, macs=589824 * 56 * 56, output_size=256 * 56 * 56))
+    model.add_layer(Layer("conv2d", 590080, is_divisible=False, macs=589824 * 56 * 56, output_size=256 * 28 * 28))
+    # Adaptive pooling feeds the 25088-wide classifier
+    model.add_layer(Layer("conv2d", 590080, is_divisible=False, macs=589824 * 28 * 28, output_size=25088))
     
     # Fully connected layers (divisible)
-    model.add_layer(Layer("linear", 102764544, is_divisible=True))
-    model.add_layer(Layer("linear", 16781312, is_divisible=True))
-    model.add_layer(Layer("linear", 4097000, is_divisible=True))
+    model.add_layer(Layer("linear", 102764544, is_divisible=True, in_features=25088, out_features=4096))
+    model.add_layer(Layer("linear", 16781312, is_divisible=True, in_features=4096, out_features=4096))
+    model.add_layer(Layer("linear", 4097000, is_divisible=True, in_features=4096, out_features=1000))
     
     return model
\ No newline at end of file
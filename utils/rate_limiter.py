@@ -0,0 +1,58 @@
+from utils.helpers import get_current_time
+
+
+class TokenBucket:
+    """Token-bucket rate limiter that never blocks.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. Callers
+    either take tokens with try_acquire or ask would_exceed without taking
+    any, and decide for themselves what to do when the bucket is empty.
+    """
+
+    def __init__(self, rate=10.0, burst=5):
+        """
+        Args:
+            rate (float): Tokens added per second (sustained requests/sec)
+            burst (float): Bucket capacity (requests allowed back to back)
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = None
+        self.acquired = 0
+        self.rejected = 0
+
+    def _refill(self):
+        now = get_current_time()
+        if self.last_refill is not None and now > self.last_refill:
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def available(self):
+        self._refill()
+        return self.tokens
+
+    def would_exceed(self, count=1):
+        """Return True if taking ``count`` tokens now would be refused."""
+        return self.available() < count
+
+    def try_acquire(self, count=1):
+        """Take ``count`` tokens if available; never waits."""
+        if self.would_exceed(count):
+            self.rejected += 1
+            return False
+        self.tokens -= count
+        self.acquired += 1
+        return True
+
+    def time_until_available(self, count=1):
+        """Seconds until ``count`` tokens will be available (0 if they are now)."""
+        missing = count - self.available()
+        if missing <= 0:
+            return 0.0
+        if self.rate <= 0:
+            return float("inf")
+        return missing / self.rate
+
+    def __repr__(self):
+        return f"TokenBucket(rate={self.rate}/s, burst={self.burst}, tokens={self.tokens:.2f})"
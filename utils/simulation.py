@@ -0,0 +1,142 @@
+import asyncio
+import heapq
+import itertools
+import random
+import selectors
+
+from utils import helpers
+
+
+class Simulation:
+    """Discrete-event simulation driven by a virtual clock.
+
+    While a simulation is active, ``get_current_time`` and ``sleep`` from
+    ``utils.helpers`` read and advance the virtual clock instead of the wall
+    clock, so simulated work completes instantly and deterministically.
+    """
+
+    def __init__(self, seed=None, start_time=0.0, cpu_range=(5, 60)):
+        """
+        Args:
+            seed (int): Seed for the global random module and CPU readings
+            start_time (float): Initial value of the virtual clock in seconds
+            cpu_range (tuple): Min and max simulated CPU utilization percentage
+        """
+        self.seed = seed
+        self.now = start_time
+        self.cpu_range = cpu_range
+        self.random = random.Random(seed)
+        self.events_processed = 0
+        self._events = []
+        self._sequence = itertools.count()
+        self._previous_clock = None
+
+    def time(self):
+        return self.now
+
+    def schedule(self, delay, callback, *args):
+        """Schedule callback(*args) to run after delay virtual seconds."""
+        return self.schedule_at(self.now + max(0, delay), callback, *args)
+
+    def schedule_at(self, timestamp, callback, *args):
+        event = (max(timestamp, self.now), next(self._sequence), callback, args)
+        heapq.heappush(self._events, event)
+        return event
+
+    def advance(self, seconds):
+        """Advance the clock, firing every event that falls due on the way."""
+        self.run(until=self.now + max(0, seconds))
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def run(self, until=None):
+        """
+        Process events in timestamp order.
+
+        Args:
+            until (float): Stop before events later than this time; the clock
+                is left at ``until``. Runs until the queue is empty if None.
+
+        Returns:
+            int: Number of events processed
+        """
+        processed = 0
+        while self._events and (until is None or self._events[0][0] <= until):
+            timestamp, _, callback, args = heapq.heappop(self._events)
+            self.now = timestamp
+            callback(*args)
+            processed += 1
+        if until is not None and until > self.now:
+            self.now = until
+        self.events_processed += processed
+        return processed
+
+    def pending_events(self):
+        return len(self._events)
+
+    def new_event_loop(self):
+        """Create an asyncio event loop whose timers run on the virtual clock."""
+        return _VirtualEventLoop(self)
+
+    def sample_cpu_usage(self, device):
+        """Deterministic stand-in for a host CPU reading."""
+        return self.random.uniform(*self.cpu_range)
+
+    def start(self):
+        if self.seed is not None:
+            random.seed(self.seed)
+        self._previous_clock = helpers.set_clock(self)
+        return self
+
+    def stop(self):
+        helpers.set_clock(self._previous_clock)
+        self._previous_clock = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def __repr__(self):
+        return f"Simulation(now={self.now:.3f}, pending_events={len(self._events)})"
+
+
+class _VirtualSelector:
+    """Selector that advances virtual time instead of blocking on a timeout."""
+
+    def __init__(self, simulation):
+        self._simulation = simulation
+        self._selector = selectors.DefaultSelector()
+
+    def select(self, timeout=None):
+        ready = self._selector.select(0)
+        if ready:
+            return ready
+        simulation = self._simulation
+        if timeout is None:
+            if not simulation.pending_events():
+                # Nothing scheduled in virtual time: wait for real I/O
+                return self._selector.select(None)
+            simulation.run(until=simulation._events[0][0])
+        elif timeout > 0:
+            target = simulation.now + timeout
+            if simulation.pending_events():
+                target = min(target, simulation._events[0][0])
+            simulation.run(until=target)
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class _VirtualEventLoop(asyncio.SelectorEventLoop):
+
+    def __init__(self, simulation):
+        self._simulation = simulation
+        super().__init__(selector=_VirtualSelector(simulation))
+
+    def time(self):
+        return self._simulation.now
@@ -0,0 +1,33 @@
+import json
+
+
+def read_trace(path):
+    """
+    Stream request records from a JSONL trace, one line at a time.
+    
+    Each line may carry ``arrival`` (seconds from trace start), ``deadline``
+    (seconds), ``sensitive``, ``model`` and ``input_size``; missing fields
+    fall back to an immediate arrival, no deadline, non-sensitive, the
+    currently loaded model and the default input size.
+    
+    Yields:
+        dict: Normalized request record
+    """
+    with open(path, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"Skipping malformed trace line {line_number}: {e}")
+                continue
+            input_size = record.get("input_size")
+            yield {
+                "arrival": float(record.get("arrival", 0)),
+                "deadline": record.get("deadline"),
+                "is_sensitive": bool(record.get("sensitive", False)),
+                "model": record.get("model"),
+                "input_size": tuple(input_size) if input_size else None
+            }